@@ -1,4 +1,10 @@
+import sys
+
 from CodeHunter.main_cli import main
+from CodeHunter.ui.batch_cli import main as batch_main
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # con argumentos: CLI no interactivo (scan, search, tree, report)
+    if len(sys.argv) > 1:
+        sys.exit(batch_main())
+    main()
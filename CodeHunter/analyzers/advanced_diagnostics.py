@@ -3,10 +3,14 @@ Advanced Diagnostics - Orquestador de análisis avanzado
 Integra todos los detectores: Bugs, Vulnerabilidades, Code Smells y Security Hotspots
 """
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ..core.models import AdvancedFinding, Severity, Category
+from ..core.findings_store import FindingsStore, as_findings_store
 from ..core.config_loader import load_config
-from .analysis_engine import run_project_analysis
+from ..infrastructure.result_cache import ResultCache
+from ..infrastructure.symbol_index import get_symbol_index
+from .analysis_engine import run_project_analysis, GLOBAL_FILE_FACTS, GLOBAL_BUDGET_SKIPS
+from .analysis_budget import FILE_SCOPE
 from collections import defaultdict
 from ..utils.finding_utils import group_findings_by_category
 
@@ -24,7 +28,6 @@ SCORE_WARNING_THRESHOLD = 50
 SCORE_ATTENTION_THRESHOLD = 80
 
 # Otros valores
-DEFAULT_SORT_WEIGHT = 99
 TOP_FILES_LIMIT = 10
 
 SEVERITY_ORDER_BLOCKER = 0
@@ -43,53 +46,99 @@ def group_findings_by_category(findings):
     return grouped
 
 
-def run_advanced_analysis(project_path: str) -> Dict:
+def run_advanced_analysis(
+    project_path: str,
+    jobs: Optional[int] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[str] = None,
+    incremental: bool = False,
+    base_revision: Optional[str] = None,
+    parsed=None,
+    sinks=(),
+    profiler=None
+) -> Dict:
     """
     Ejecuta análisis avanzado completo del proyecto
+
+    jobs: procesos worker para el análisis (None = número de CPUs, 1 = secuencial)
+    use_cache: reutilizar resultados de archivos sin cambios (.codehunter_cache/)
+    y guardar ahí la tabla de símbolos para las búsquedas
+    cache_dir: carpeta alternativa para la caché
+    incremental / base_revision: no releer los archivos sin cambios según el
+    manifiesto de la caché o según git (ver run_project_analysis)
+    parsed: ParsedProject compartido con los demás analizadores
+    sinks: exportadores que reciben los hallazgos de cada archivo durante
+    el análisis (ver infrastructure/findings_exporter)
+    profiler: AnalysisProfiler opcional (tiempo y memoria por detector y
+    por archivo; ver detector_profiler)
     """
 
     config = load_config(project_path)
+    cache = ResultCache(project_path, config, cache_dir) if use_cache else None
+    # la tabla de símbolos se persiste junto a la caché (ver search_definitions)
+    symbol_index = get_symbol_index(project_path, cache_dir) if use_cache else None
 
     print("🔍 Iniciando análisis avanzado...")
 
     start = time.time()
 
     # 🚀 nuevo motor de análisis (1 solo recorrido del AST)
-    all_findings = run_project_analysis(project_path, config)
+    all_findings = run_project_analysis(
+        project_path, config, jobs=jobs, cache=cache,
+        incremental=incremental, base_revision=base_revision, parsed=parsed,
+        symbol_index=symbol_index, sinks=sinks, profiler=profiler
+    )
 
     elapsed = time.time() - start
 
-    # separar por categoría
-    grouped = group_findings_by_category(all_findings)
+    # columnas de severidad/categoría/archivo para métricas y filtros
+    store = FindingsStore(all_findings)
 
-    bugs = grouped[Category.BUG]
-    vulnerabilities = grouped[Category.VULNERABILITY]
-    smells = grouped[Category.CODE_SMELL]
-    hotspots = grouped[Category.SECURITY_HOTSPOT]
+    # separar por categoría
+    bugs = store.where(category=Category.BUG)
+    vulnerabilities = store.where(category=Category.VULNERABILITY)
+    smells = store.where(category=Category.CODE_SMELL)
+    hotspots = store.where(category=Category.SECURITY_HOTSPOT)
 
     print(f"  🐛 Bugs: {len(bugs)}")
     print(f"  🔒 Vulnerabilidades: {len(vulnerabilities)}")
     print(f"  👃 Code Smells: {len(smells)}")
     print(f"  🔥 Hotspots: {len(hotspots)}")
 
+    if GLOBAL_BUDGET_SKIPS:
+        print(f"  ⏱️ Omitidos por presupuesto de CPU: {len(GLOBAL_BUDGET_SKIPS)}")
+        for skip in GLOBAL_BUDGET_SKIPS:
+            what = "archivo" if skip["scope"] == FILE_SCOPE else f"detector {skip['stage']}"
+            print(f"     - {skip['file']} ({what}, {skip['cpu']:.1f}s)")
+
     print(f"✅ Análisis completado en {elapsed:.2f}s - {len(all_findings)} hallazgos\n")
 
-    metrics = calculate_advanced_metrics(all_findings)
+    metrics = calculate_advanced_metrics(store)
 
     return {
         "findings": all_findings,
+        "store": store,
         "metrics": metrics,
         "by_category": {
             "bugs": bugs,
             "vulnerabilities": vulnerabilities,
             "code_smells": smells,
             "security_hotspots": hotspots
-        }
+        },
+        # hechos por archivo para los detectores de proyecto (system_doctor)
+        "file_facts": dict(GLOBAL_FILE_FACTS),
+        # archivos y detectores omitidos por su presupuesto de CPU, con su coste
+        "budget_skips": list(GLOBAL_BUDGET_SKIPS)
     }
 
 
 def calculate_advanced_metrics(findings: List[AdvancedFinding]) -> Dict:
-    """Calcula métricas detalladas del análisis"""
+    """
+    Calcula métricas detalladas del análisis
+    findings: lista o FindingsStore (con el store no se recorre cada hallazgo)
+    """
+
+    store = as_findings_store(findings)
     
     metrics = {
         # Por severidad
@@ -107,7 +156,7 @@ def calculate_advanced_metrics(findings: List[AdvancedFinding]) -> Dict:
         "maintainability": 0,
         
         # Total
-        "total": len(findings),
+        "total": len(store),
         
         # Score de calidad (0-100)
         "quality_score": 100,
@@ -117,16 +166,7 @@ def calculate_advanced_metrics(findings: List[AdvancedFinding]) -> Dict:
     }
     
     # Contar por severidad y categoría
-    for finding in findings:
-        # Severidad
-        severity = finding.severity.value.lower()
-        if severity in metrics:
-            metrics[severity] += 1
-        
-        # Categoría
-        category = finding.category.value.lower()
-        if category in metrics:
-            metrics[category] += 1
+    count_into_metrics(metrics, store)
     
     # Calcular score de calidad
     metrics["quality_score"] = calculate_quality_score(metrics)
@@ -137,6 +177,19 @@ def calculate_advanced_metrics(findings: List[AdvancedFinding]) -> Dict:
     return metrics
 
 
+def count_into_metrics(metrics: Dict, store: FindingsStore) -> None:
+    """Suma los conteos del store a las claves de metrics que coinciden con el valor del enum."""
+    for severity, count in store.count_by_severity().items():
+        key = severity.value.lower()
+        if key in metrics:
+            metrics[key] += count
+
+    for category, count in store.count_by_category().items():
+        key = category.value.lower()
+        if key in metrics:
+            metrics[key] += count
+
+
 def calculate_quality_score(metrics: Dict) -> int:
     """
     Calcula score de calidad (0-100)
@@ -188,18 +241,19 @@ def determine_status(metrics: Dict) -> str:
 
 
 def get_findings_by_severity(findings: List[AdvancedFinding], severity: Severity) -> List[AdvancedFinding]:
-    """Filtra findings por severidad"""
-    return [f for f in findings if f.severity == severity]
+    """Filtra findings por severidad (lista o FindingsStore)"""
+    return as_findings_store(findings).where(severity=severity)
 
 
 def get_findings_by_category(findings: List[AdvancedFinding], category: Category) -> List[AdvancedFinding]:
-    """Filtra findings por categoría"""
-    return [f for f in findings if f.category == category]
+    """Filtra findings por categoría (lista o FindingsStore)"""
+    return as_findings_store(findings).where(category=category)
 
 
 def get_top_issues(findings: List[AdvancedFinding], limit: int = TOP_FILES_LIMIT) -> List[AdvancedFinding]:
     """
     Obtiene los issues más importantes (ordenados por severidad)
+    Se filtra severidad por severidad hasta llenar limit, sin ordenar todo.
     """
 
     severity_order = {
@@ -210,28 +264,19 @@ def get_top_issues(findings: List[AdvancedFinding], limit: int = TOP_FILES_LIMIT
         Severity.INFO: SEVERITY_ORDER_INFO
     }
 
-    sorted_findings = sorted(
-        findings,
-        key=lambda f: severity_order.get(f.severity, DEFAULT_SORT_WEIGHT)
-    )
+    store = as_findings_store(findings)
+    top = []
 
-    return sorted_findings[:limit]
+    for severity in sorted(severity_order, key=severity_order.get):
+        if len(top) >= limit:
+            break
+        top.extend(store.where(severity=severity)[:limit - len(top)])
+
+    return top
 
 
 def get_files_with_most_issues(findings: List[AdvancedFinding]) -> Dict[str, int]:
-    """Identifica archivos con más problemas"""
-    
-    file_counts = {}
-    
-    for finding in findings:
-        file_path = finding.file
-        file_counts[file_path] = file_counts.get(file_path, 0) + 1
-    
-    # Ordenar por cantidad de issues
-    sorted_files = sorted(
-        file_counts.items(),
-        key=lambda x: x[1],
-        reverse=True
-    )
-    
-    return dict(sorted_files[:TOP_FILES_LIMIT])  # Top 10
+    """Identifica archivos con más problemas (lista o FindingsStore)"""
+
+    # Ordenado por cantidad de issues; Top 10
+    return as_findings_store(findings).top_files(TOP_FILES_LIMIT)
@@ -0,0 +1,150 @@
+"""
+Analysis Budget - Presupuestos de tiempo de CPU por archivo y por detector
+Un archivo patológico (un literal generado enorme, una expresión anidada
+miles de niveles) no debe bloquear el análisis de todo el proyecto:
+
+- presupuesto por archivo: se consulta tras el parseo y dentro de
+  dispatch() cada pocos cientos de nodos; en los procesos que lo
+  permiten, un temporizador ITIMER_PROF corta además las llamadas que no
+  retornan. El archivo se omite y se informa con su coste.
+- presupuesto por detector: el detector que lo supera se desactiva para
+  ese archivo (como cuando lanza una excepción) y se informa. No se aplica
+  a los recolectores de hashes, hechos y símbolos, cuya salida se guarda
+  en la caché y en el índice de símbolos: solo los limita el del archivo.
+
+Configuración (.codehunter.yml, en segundos de CPU; 0 = sin límite):
+
+    analysis:
+      file_cpu_budget: 60
+      detector_cpu_budget: 10
+"""
+
+import os
+import signal
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_CPU_BUDGET = 60
+DEFAULT_DETECTOR_CPU_BUDGET = 0
+
+FILE_SCOPE = "file"
+DETECTOR_SCOPE = "detector"
+
+
+class BudgetExceeded(BaseException):
+    """
+    El archivo superó su presupuesto. Hereda de BaseException (como
+    KeyboardInterrupt) para que los except Exception de los detectores
+    no la absorban.
+    """
+
+    def __init__(self, cpu, stage):
+        super().__init__(f"{cpu:.2f}s de CPU en {stage}")
+        self.cpu = cpu
+        self.stage = stage
+
+
+class FileBudget:
+    """Presupuesto de un archivo dentro de analyze_file()."""
+
+    def __init__(self, file_path, file_seconds=0, detector_seconds=0):
+        self.file_path = file_path
+        self.file_seconds = file_seconds
+        self.detector_seconds = detector_seconds
+        self.skipped_detectors = {}   # nombre -> CPU consumida al desactivarlo
+        self.stage = "parseo"         # etapa en curso, para el temporizador
+        self._start = time.thread_time()
+
+    @classmethod
+    def from_config(cls, file_path, config):
+        """FileBudget según config["analysis"], o None si no hay límites."""
+        analysis = config.get("analysis", {})
+        file_seconds = analysis.get("file_cpu_budget", DEFAULT_FILE_CPU_BUDGET) or 0
+        detector_seconds = analysis.get("detector_cpu_budget", DEFAULT_DETECTOR_CPU_BUDGET) or 0
+
+        if not file_seconds and not detector_seconds:
+            return None
+        return cls(file_path, file_seconds, detector_seconds)
+
+    def elapsed(self):
+        return time.thread_time() - self._start
+
+    def check(self, stage):
+        """Lanza BudgetExceeded si el archivo superó su presupuesto."""
+        if self.file_seconds:
+            cpu = self.elapsed()
+            if cpu > self.file_seconds:
+                raise BudgetExceeded(cpu, stage)
+
+    def instrument(self, plugins):
+        """Mide enter/leave/finish de cada plugin contra el presupuesto por detector."""
+        if not self.detector_seconds:
+            return
+        for plugin in plugins:
+            spent = [0.0]
+            plugin.enter = self._metered(plugin, plugin.enter, spent)
+            plugin.leave = self._metered(plugin, plugin.leave, spent)
+            plugin.finish = self._metered(plugin, plugin.finish, spent)
+
+    def _metered(self, plugin, method, spent):
+        thread_time = time.thread_time
+
+        def metered(*args):
+            start = thread_time()
+            try:
+                return method(*args)
+            finally:
+                spent[0] += thread_time() - start
+                if spent[0] > self.detector_seconds and not plugin.failed:
+                    plugin.failed = True
+                    self.skipped_detectors[plugin.name] = spent[0]
+                    logger.warning(
+                        f"[AnalysisBudget] Detector '{plugin.name}' desactivado en "
+                        f"{os.path.basename(self.file_path)}: {spent[0]:.2f}s de CPU"
+                    )
+        return metered
+
+    def skips(self, exceeded=None):
+        """Entradas para el informe de omitidos (archivo y/o detectores)."""
+        entries = [
+            {"file": self.file_path, "scope": DETECTOR_SCOPE, "stage": name, "cpu": cpu}
+            for name, cpu in self.skipped_detectors.items()
+        ]
+        if exceeded is not None:
+            entries.append({
+                "file": self.file_path, "scope": FILE_SCOPE,
+                "stage": exceeded.stage, "cpu": exceeded.cpu,
+            })
+        return entries
+
+
+@contextmanager
+def hard_cpu_limit(budget):
+    """
+    Temporizador ITIMER_PROF que lanza BudgetExceeded al agotar el
+    presupuesto del archivo aunque la llamada en curso no retorne. Solo en
+    el hilo principal de sistemas con setitimer (no en Windows ni en el
+    hilo de análisis de la GUI); allí queda el control cooperativo.
+    """
+    seconds = budget.file_seconds if budget is not None else 0
+
+    if (not seconds or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def on_timer(signum, frame):
+        raise BudgetExceeded(budget.elapsed(), budget.stage)
+
+    previous = signal.signal(signal.SIGPROF, on_timer)
+    signal.setitimer(signal.ITIMER_PROF, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, previous)
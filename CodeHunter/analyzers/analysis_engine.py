@@ -1,47 +1,378 @@
-import ast
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
 from ..utils.project_walker import walk_python_files
+from ..utils.git_changes import changed_files_since, normalize_path
+from ..core.parsed_project import load_parsed_file
 
-from .bug_detector import run_bug_detectors
-from .vulnerability_scanner import run_vulnerability_detectors
-from .code_smell_detector import run_smell_detectors
-from .security_hotspots import run_hotspot_detectors
-from .duplicate_block_detector import detect_duplicate_blocks
-from .duplicate_code_detector import detect_duplicate_functions
+from .ast_dispatch import dispatch
+from .ast_fingerprint import Fingerprinter
+from .bug_detector import build_bug_plugins
+from .vulnerability_scanner import build_vulnerability_plugins
+from .code_smell_detector import build_smell_plugins, smell_function_hashes
+from .code_smell_detector import resolve_duplicate_smell_functions
+from .security_hotspots import build_hotspot_plugins
+from .duplicate_block_detector import BlockHashCollector, resolve_duplicate_blocks
+from .duplicate_code_detector import FunctionHashCollector, resolve_duplicate_functions
 from .duplicate_code_detector import GLOBAL_FUNCTION_HASHES
 from .duplicate_block_detector import GLOBAL_BLOCK_HASHES
+from .code_smell_detector import GLOBAL_FUNCTION_HASHES as SMELL_FUNCTION_HASHES
+from .near_duplicate_detector import NearCloneCollector, resolve_near_duplicates
+from .near_duplicate_detector import DEFAULT_SIMILARITY_THRESHOLD
+from .circular_imports import ImportFactCollector
+from .file_analyzer import is_empty_python_source
+from .symbol_collector import SymbolCollector, symbols_of
+from .detector_profiler import FileProfile
+from .analysis_budget import FileBudget, BudgetExceeded, hard_cpu_limit
+
 
+logger = logging.getLogger(__name__)
 
 MAX_FILE_LINES = 100000
 
+# Por debajo de este número de archivos no compensa levantar procesos
+MIN_FILES_FOR_PARALLEL = 8
+
+# Hechos por archivo de la última ejecución ({ruta: hechos}), usados por los
+# detectores que trabajan sobre todo el proyecto (imports circulares, vacíos)
+GLOBAL_FILE_FACTS = {}
+
+# Archivos y detectores omitidos en la última ejecución por superar su
+# presupuesto de CPU (ver analysis_budget), con su coste
+GLOBAL_BUDGET_SKIPS = []
+
+
+def default_jobs():
+    """Número de workers por defecto (uno por CPU)."""
+    return os.cpu_count() or 1
+
+
+def run_project_analysis(project_path, config, jobs=None, cache=None,
+                         incremental=False, base_revision=None, parsed=None,
+                         symbol_index=None, sinks=(), keep_findings=True,
+                         profiler=None):
+    """
+    Ejecuta todos los detectores sobre los .py del proyecto.
 
-def run_project_analysis(project_path, config):
+    jobs: número de procesos worker (None = número de CPUs, 1 = secuencial).
+    cache: ResultCache opcional; los archivos sin cambios no se re-analizan.
+    incremental: con caché, no leer los archivos cuyo mtime y tamaño
+    coinciden con el manifiesto de la ejecución anterior.
+    base_revision: con caché, releer siempre los archivos que git reporta
+    como modificados desde esa revisión; el resto se trata como con
+    incremental (git solo elige qué archivos comprobar: la clave guardada
+    se reutiliza únicamente si mtime y tamaño coinciden).
+    parsed: ParsedProject compartido; en modo secuencial los archivos quedan
+    parseados para los demás analizadores de la misma ejecución.
+    symbol_index: SymbolIndex que se actualiza con los símbolos recolectados
+    (los archivos servidos desde la caché ya están en el índice).
+    sinks: exportadores con write_findings(findings) (ver findings_exporter);
+    reciben los hallazgos de cada archivo en cuanto se combinan.
+    keep_findings: con False no se acumulan los hallazgos (se retorna una
+    lista vacía) y la memoria no crece con el número de hallazgos.
+    profiler: AnalysisProfiler opcional que recibe el tiempo (y la memoria)
+    de cada detector y de cada archivo analizado.
+    Los resultados se combinan siempre en orden de ruta, por lo que la salida
+    es la misma con cualquier número de workers y con o sin caché.
+    """
 
     GLOBAL_BLOCK_HASHES.clear()
     GLOBAL_FUNCTION_HASHES.clear()
+    SMELL_FUNCTION_HASHES.clear()
+    GLOBAL_FILE_FACTS.clear()
+    GLOBAL_BUDGET_SKIPS.clear()
+
+    if jobs is None:
+        jobs = default_jobs()
+
+    if profiler is not None:
+        profiler.start()
+
+    file_paths = sorted(walk_python_files(project_path))
+
+    changed = frozenset()
+    if cache is not None and base_revision:
+        git_changed = changed_files_since(project_path, base_revision)
+        if git_changed is not None:
+            incremental = True
+            changed = {path for path in file_paths if normalize_path(path) in git_changed}
+
+    results = _iter_ordered_results(
+        file_paths, config, jobs, cache,
+        trust_manifest=incremental, changed=changed, parsed=parsed,
+        profiler=profiler
+    )
 
     findings = []
+    clone_signatures = []
+    symbols = {}
+
+    for file_path, result in results:
+        if result is not None:
+            if profiler is not None:
+                profiler.add_file(result.pop("profile", None))
+            GLOBAL_BUDGET_SKIPS.extend(result.get("budget_skips", ()))
+            file_findings = merge_file_result(result)
+            _emit(file_findings, findings, sinks, keep_findings)
+            clone_signatures.extend(result["clone_signatures"])
+            GLOBAL_FILE_FACTS[file_path] = result["facts"]
+            if symbol_index is not None and "symbols" in result:
+                symbols[file_path] = result["symbols"]
+
+    if symbol_index is not None:
+        symbol_index.store_results(symbols)
+
+    # los clones casi idénticos necesitan las firmas de todo el proyecto
+    threshold = config.get("analysis", {}).get(
+        "near_duplicate_threshold", DEFAULT_SIMILARITY_THRESHOLD
+    )
+    if threshold:
+        with profiler.phase("near_duplicates") if profiler is not None else nullcontext():
+            near_duplicates = resolve_near_duplicates(clone_signatures, threshold)
+        _emit(near_duplicates, findings, sinks, keep_findings)
 
-    for file_path in walk_python_files(project_path):
+    if profiler is not None:
+        profiler.stop()
 
-        try:
-            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                source = f.read()
+    return findings
 
-            if source.count("\n") > MAX_FILE_LINES:
-                continue
 
-            tree = ast.parse(source)
-            lines = source.split("\n")
+def _emit(file_findings, findings, sinks, keep_findings):
+    for sink in sinks:
+        sink.write_findings(file_findings)
+    if keep_findings:
+        findings.extend(file_findings)
 
-        except Exception:
+
+def _iter_ordered_results(file_paths, config, jobs, cache,
+                          trust_manifest=False, changed=frozenset(), parsed=None,
+                          profiler=None):
+    """
+    Hace yield de (ruta, resultado) en el orden de file_paths, analizando
+    solo los archivos que no están en caché. Cada resultado se entrega en
+    cuanto está listo, sin esperar al resto del proyecto.
+
+    changed: archivos que se releen aunque trust_manifest sea True.
+    """
+
+    cached = set()
+    pending = file_paths
+    keys = {}
+
+    if cache is not None:
+        pending = []
+        for file_path in file_paths:
+            keys[file_path] = cache.key_for_file(
+                file_path,
+                trust_manifest=trust_manifest and file_path not in changed
+            )
+            if cache.has(keys[file_path]):
+                cached.add(file_path)
+            else:
+                pending.append(file_path)
+
+    # los pendientes llegan en orden de ruta: se intercalan con los de la caché
+    analyzed = _iter_file_results(pending, config, jobs, parsed, profiler)
+
+    for file_path in file_paths:
+        if file_path in cached:
+            # se decodifica al entregarlo: no todos los resultados a la vez en memoria
+            yield file_path, cache.lookup(keys[file_path], file_path)[1]
             continue
 
-        # ejecutar detectores
-        findings.extend(run_bug_detectors(tree, file_path, lines, config))
-        findings.extend(run_vulnerability_detectors(tree, file_path, lines, config))
-        findings.extend(run_smell_detectors(tree, file_path, lines, config))
-        findings.extend(run_hotspot_detectors(tree, file_path, lines, config))
-        findings.extend(detect_duplicate_functions(tree, file_path, lines))
-        findings.extend(detect_duplicate_blocks(tree, file_path, lines))
+        result = next(analyzed)
+        # un resultado recortado por el presupuesto no se guarda: se reintenta
+        if cache is not None and not (result and "budget_skips" in result):
+            cache.store(keys[file_path], result)
+        yield file_path, result
+
+    if cache is not None:
+        cache.save()
+
+
+def _iter_file_results(file_paths, config, jobs, parsed=None, profiler=None):
+    """Hace yield del resultado de cada archivo, en el mismo orden que file_paths."""
+
+    if not file_paths:
+        return
+
+    profile = {}
+    if profiler is not None:
+        profile = {"profile": True, "trace_memory": profiler.trace_memory}
+
+    if jobs <= 1 or len(file_paths) < MIN_FILES_FOR_PARALLEL:
+        yield from map(partial(analyze_file, config=config, parsed=parsed, **profile), file_paths)
+        return
+
+    # los workers leen y parsean por su cuenta (el almacén no cruza procesos)
+    worker = partial(analyze_file, config=config, **profile)
+
+    chunksize = max(1, len(file_paths) // (jobs * 4))
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, file_paths, chunksize=chunksize)
+
+
+def analyze_file(file_path, config, parsed=None, profile=False, trace_memory=False):
+    """
+    Analiza un archivo sin tocar estado global.
+    parsed: ParsedProject opcional del que tomar el archivo ya leído y parseado.
+    profile / trace_memory: medir cada detector (ver FileProfile); las
+    mediciones se retornan en result["profile"].
+
+    Retorna None si el archivo se omite, o un dict con los findings locales y
+    los hashes de duplicados pendientes de resolver con merge_file_result().
+    Si el archivo o algún detector agota su presupuesto de CPU (ver
+    analysis_budget), result["budget_skips"] indica qué se omitió y su coste.
+    """
+
+    file_profile = FileProfile(file_path, trace_memory) if profile else None
+    budget = FileBudget.from_config(file_path, config)
+
+    try:
+        with hard_cpu_limit(budget):
+            result = _analyze_file(file_path, config, parsed, file_profile, budget)
+
+    except BudgetExceeded as exceeded:
+        logger.warning(
+            f"[AnalysisEngine] Archivo omitido, superó el presupuesto de CPU: "
+            f"{file_path} ({exceeded})"
+        )
+        result = _skipped_result(file_path, budget.skips(exceeded))
+        if file_profile is not None:
+            result["profile"] = file_profile.finish()
+
+    return result
+
+
+def _analyze_file(file_path, config, parsed, file_profile, budget):
+    try:
+        parsed_file = load_parsed_file(file_path, parsed)
+
+        if len(parsed_file.lines) - 1 > MAX_FILE_LINES:
+            return None
+
+        tree = parsed_file.parse()
+
+    except Exception:
+        return None
+
+    if file_profile is not None:
+        file_profile.parsed()
+    if budget is not None:
+        budget.check("parseo")
+
+    source = parsed_file.source
+    lines = parsed_file.lines
+    is_utf8 = parsed_file.is_utf8
+
+    # ejecutar todos los detectores con un solo recorrido del AST;
+    # los hashes estructurales de los subárboles se comparten entre detectores
+    fingerprinter = Fingerprinter()
+
+    bug_plugins = build_bug_plugins(file_path, lines, config)
+    vulnerability_plugins = build_vulnerability_plugins(file_path, lines, config)
+    smell_plugins = build_smell_plugins(file_path, lines, config, fingerprinter)
+    hotspot_plugins = build_hotspot_plugins(file_path, lines, config)
+    function_collector = FunctionHashCollector(file_path, lines, fingerprinter)
+    block_collector = BlockHashCollector(file_path, lines, fingerprinter)
+    clone_collector = NearCloneCollector(file_path, lines, fingerprinter)
+    import_collector = ImportFactCollector(file_path, lines)
+    symbol_collector = SymbolCollector(file_path, lines)
+
+    detectors = [
+        *bug_plugins,
+        *vulnerability_plugins,
+        *smell_plugins,
+        *hotspot_plugins,
+    ]
+    # los recolectores alimentan la caché, el índice de símbolos y los
+    # detectores de proyecto: una salida parcial quedaría guardada como
+    # válida, así que solo los limita el presupuesto del archivo
+    collectors = [
+        function_collector,
+        block_collector,
+        clone_collector,
+        import_collector,
+        symbol_collector,
+    ]
+    plugins = detectors + collectors
+
+    if file_profile is not None:
+        file_profile.instrument(plugins)
+    if budget is not None:
+        budget.instrument(detectors)
+        budget.stage = "detectores"
+
+    dispatch(tree, plugins, budget)
+
+    findings = []
+    for plugin in bug_plugins + vulnerability_plugins + smell_plugins:
+        findings.extend(plugin.findings)
+
+    hotspot_findings = []
+    for plugin in hotspot_plugins:
+        hotspot_findings.extend(plugin.findings)
+
+    result = {
+        "file": file_path,
+        "findings": findings,
+        "smell_function_hashes": smell_function_hashes(smell_plugins),
+        "hotspot_findings": hotspot_findings,
+        "function_hashes": function_collector.hashes(),
+        "block_hashes": block_collector.hashes(),
+        "clone_signatures": clone_collector.hashes(),
+        # hechos para los detectores de proyecto; None si el archivo no es
+        # UTF-8 válido (esos detectores lo leen en modo estricto y lo omiten)
+        "facts": {
+            "imports": import_collector.facts,
+            "empty": is_empty_python_source(source),
+        } if is_utf8 else None,
+        # tabla de símbolos para SymbolIndex; no se guarda en la caché
+        "symbols": symbols_of(symbol_collector) if is_utf8 else None,
+    }
+
+    if budget is not None and budget.skipped_detectors:
+        result["budget_skips"] = budget.skips()
+
+    # mediciones del perfilado; tampoco se guardan en la caché
+    if file_profile is not None:
+        result["profile"] = file_profile.finish(tree)
+
+    return result
+
+
+def _skipped_result(file_path, skips):
+    """
+    Resultado vacío de un archivo omitido por superar su presupuesto. Sin
+    "symbols": el índice de símbolos no lo registra como un archivo vacío.
+    """
+    return {
+        "file": file_path,
+        "findings": [],
+        "smell_function_hashes": [],
+        "hotspot_findings": [],
+        "function_hashes": [],
+        "block_hashes": [],
+        "clone_signatures": [],
+        "facts": None,
+        "budget_skips": skips,
+    }
+
+
+def merge_file_result(result):
+    """
+    Resuelve los duplicados de un archivo contra los registros globales
+    y retorna sus findings. Debe llamarse en orden de archivo.
+    """
+
+    findings = list(result["findings"])
+    findings.extend(resolve_duplicate_smell_functions(result["smell_function_hashes"]))
+    findings.extend(result["hotspot_findings"])
+    findings.extend(resolve_duplicate_functions(result["function_hashes"]))
+    findings.extend(resolve_duplicate_blocks(result["block_hashes"]))
 
-    return findings
\ No newline at end of file
+    return findings
@@ -0,0 +1,160 @@
+"""
+AST Dispatch - Recorrido único del AST compartido por todos los detectores
+Cada detector declara los tipos de nodo que le interesan y dispatch() los
+alimenta a todos con una sola pasada en profundidad (pre-orden, mismo orden
+que ast.NodeVisitor), sin recursión.
+"""
+
+import ast
+import logging
+import os
+from collections import defaultdict
+
+
+logger = logging.getLogger(__name__)
+
+# Valor de retorno de enter() para no recibir los nodos hijos
+SKIP_CHILDREN = True
+
+# Nodos entre dos consultas del presupuesto de CPU (ver analysis_budget)
+BUDGET_CHECK_NODES = 256
+
+
+class DetectorPlugin:
+    """
+    Base de los detectores que se ejecutan dentro de dispatch().
+
+    node_types:  tipos de nodo que se entregan a enter()
+    leave_types: tipos de nodo que se entregan a leave() (post-orden)
+    max_depth:   profundidad máxima entregada (None = sin límite). Equivale
+                 al límite de recursión de los antiguos NodeVisitor.
+    """
+
+    node_types = ()
+    leave_types = ()
+    max_depth = None
+
+    def __init__(self, file_path, lines):
+        self.file_path = file_path
+        self.lines = lines
+        self.findings = []
+        self.failed = False
+
+    @property
+    def name(self):
+        return type(self).__name__
+
+    def get_snippet(self, line):
+        if line <= len(self.lines):
+            return self.lines[line - 1].strip()
+        return ""
+
+    def enter(self, node, depth):
+        """Llamado al entrar en un nodo. Retornar SKIP_CHILDREN para podar."""
+
+    def leave(self, node, depth):
+        """Llamado al salir de un nodo de leave_types."""
+
+    def finish(self):
+        """Llamado una vez terminado el recorrido."""
+
+
+def dispatch(tree, plugins, budget=None):
+    """
+    Recorre el árbol una sola vez entregando cada nodo a los plugins
+    interesados. Retorna la lista de findings de todos los plugins, en
+    el orden en que se registraron.
+
+    Si un plugin lanza una excepción se descartan sus findings para este
+    archivo (igual que cuando cada detector se ejecutaba por separado).
+
+    budget: FileBudget opcional; se consulta cada BUDGET_CHECK_NODES nodos
+    y tras cada finish(), y lanza BudgetExceeded al agotarse.
+    """
+
+    enter_table = defaultdict(list)
+    leave_table = defaultdict(list)
+
+    for plugin in plugins:
+        for node_type in plugin.node_types:
+            enter_table[node_type].append(plugin)
+        for node_type in plugin.leave_types:
+            leave_table[node_type].append(plugin)
+
+    muted = {}  # plugin -> nodo cuyo subárbol no debe recibir
+
+    # Pila de (nodo, profundidad, saliendo)
+    stack = [(tree, 1, False)]
+    until_check = BUDGET_CHECK_NODES
+
+    while stack:
+        node, depth, leaving = stack.pop()
+
+        if budget is not None:
+            until_check -= 1
+            if not until_check:
+                until_check = BUDGET_CHECK_NODES
+                budget.check("recorrido del AST")
+
+        if leaving:
+            if muted:
+                for plugin in [p for p, owner in muted.items() if owner is node]:
+                    del muted[plugin]
+
+            for plugin in leave_table.get(type(node), ()):
+                if _accepts(plugin, depth, muted):
+                    _call(plugin, plugin.leave, node, depth)
+            continue
+
+        muted_here = False
+
+        for plugin in enter_table.get(type(node), ()):
+            if not _accepts(plugin, depth, muted):
+                continue
+            if _call(plugin, plugin.enter, node, depth) is SKIP_CHILDREN:
+                muted[plugin] = node
+                muted_here = True
+
+        if muted_here or type(node) in leave_table:
+            stack.append((node, depth, True))
+
+        children = list(ast.iter_child_nodes(node))
+        children.reverse()
+        child_depth = depth + 1
+        stack.extend((child, child_depth, False) for child in children)
+
+    findings = []
+
+    for plugin in plugins:
+        if not plugin.failed:
+            _call(plugin, plugin.finish)
+            if budget is not None:
+                budget.check(plugin.name)
+        if plugin.failed:
+            plugin.findings = []
+        findings.extend(plugin.findings)
+
+    return findings
+
+
+def run_plugin(tree, plugin):
+    """Ejecuta un único detector (un recorrido) y retorna sus findings."""
+    return dispatch(tree, [plugin])
+
+
+def _accepts(plugin, depth, muted):
+    if plugin.failed or plugin in muted:
+        return False
+    return plugin.max_depth is None or depth <= plugin.max_depth
+
+
+def _call(plugin, method, *args):
+    try:
+        return method(*args)
+    except Exception as e:
+        plugin.failed = True
+        logger.warning(
+            f"[ASTDispatch] Detector '{plugin.name}' falló en "
+            f"{os.path.basename(plugin.file_path)}: {e}"
+        )
+        return None
@@ -0,0 +1,117 @@
+"""
+AST Fingerprint - Hash estructural de subárboles sin unparse/reparse
+Calcula el hash de cada nodo de abajo hacia arriba (post-orden) a partir
+de los hashes de sus hijos, que quedan memorizados: fingerprintear una
+función y luego todos sus bloques internos cuesta un solo recorrido.
+
+La normalización es la del antiguo ASTNormalizer:
+  - Name.id         -> "var"
+  - arg.arg         -> "param"   (sin normalizar dentro de la anotación)
+  - FunctionDef.name -> "func"
+"""
+
+import ast
+import hashlib
+
+
+DIGEST_SIZE = 16
+
+# Campos renombrados por la normalización: tipo de nodo -> (campo, valor)
+NORMALIZED_FIELDS = {
+    ast.Name: ("id", "var"),
+    ast.arg: ("arg", "param"),
+    ast.FunctionDef: ("name", "func"),
+}
+
+
+class Fingerprinter:
+    """
+    Hash estructural normalizado con memoización por nodo.
+
+    Una instancia se asocia a un árbol (un archivo); los detectores que la
+    comparten reutilizan los hashes de los subárboles ya calculados.
+    """
+
+    def __init__(self):
+        # (id(nodo), normalizado) -> digest. Los nodos siguen vivos mientras
+        # viva el árbol, así que id() es estable durante el análisis.
+        self._memo = {}
+
+    def fingerprint(self, node):
+        """Hash hexadecimal del subárbol de node (normalizado)."""
+        return self._digest(node, True).hex()
+
+    def _digest(self, root, normalize):
+        memo = self._memo
+        root_key = (id(root), normalize)
+
+        if root_key in memo:
+            return memo[root_key]
+
+        # Post-orden iterativo: (nodo, normalizar, hijos_listos)
+        stack = [(root, normalize, False)]
+
+        while stack:
+            node, norm, ready = stack.pop()
+            key = (id(node), norm)
+
+            if key in memo:
+                continue
+
+            if not ready:
+                stack.append((node, norm, True))
+                child_norm = _child_normalize(node, norm)
+                for child in ast.iter_child_nodes(node):
+                    if (id(child), child_norm) not in memo:
+                        stack.append((child, child_norm, False))
+                continue
+
+            memo[key] = self._hash_node(node, norm)
+
+        return memo[root_key]
+
+    def _hash_node(self, node, norm):
+        memo = self._memo
+        child_norm = _child_normalize(node, norm)
+        renamed = NORMALIZED_FIELDS.get(type(node)) if norm else None
+
+        parts = [type(node).__name__.encode()]
+
+        for name in node._fields:
+            value = getattr(node, name, None)
+
+            if renamed is not None and name == renamed[0]:
+                value = renamed[1]
+
+            if isinstance(value, ast.AST):
+                parts.append(b"n" + memo[(id(value), child_norm)])
+
+            elif isinstance(value, list):
+                parts.append(b"[%d" % len(value))
+                for item in value:
+                    if isinstance(item, ast.AST):
+                        parts.append(b"n" + memo[(id(item), child_norm)])
+                    else:
+                        parts.append(_encode_value(item))
+
+            else:
+                parts.append(_encode_value(value))
+
+        return hashlib.blake2b(b"\x00".join(parts), digest_size=DIGEST_SIZE).digest()
+
+
+def _child_normalize(node, norm):
+    # ASTNormalizer.visit_arg no visitaba la anotación del parámetro
+    return norm and not isinstance(node, ast.arg)
+
+
+def _encode_value(value):
+    if value is None:
+        return b"-"
+    data = repr(value).encode("utf-8", "surrogatepass")
+    return b"p%d:" % len(data) + data
+
+
+def structural_hash(node):
+    """Hash estructural de un único nodo (sin reutilizar resultados)."""
+    return Fingerprinter().fingerprint(node)
@@ -7,6 +7,7 @@ import logging
 import os
 from typing import List
 from ..core.models import AdvancedFinding, Severity, Category
+from .ast_dispatch import DetectorPlugin, SKIP_CHILDREN, dispatch, run_plugin
 
 
 MAX_FILE_LINES = 100000
@@ -15,16 +16,13 @@ MAX_AST_DEPTH = 200
 
 def run_bug_detectors(tree, file_path, lines, config):
 
-    findings = []
+    return dispatch(tree, build_bug_plugins(file_path, lines, config))
+
 
-    findings.extend(detect_except_pass(tree, file_path, lines))
-    findings.extend(detect_unused_variables(tree, file_path, lines))
-    findings.extend(detect_constant_conditions(tree, file_path, lines))
-    findings.extend(detect_unreachable_code(tree, file_path, lines))
-    findings.extend(detect_missing_return(tree, file_path, lines))
-    findings.extend(detect_mutable_default_args(tree, file_path, lines))
+def build_bug_plugins(file_path, lines, config):
+    """Instancia los detectores de bugs para un recorrido compartido del AST."""
+    return [detector(file_path, lines) for detector in BUG_DETECTORS]
 
-    return findings
 
 def analyze_file_for_bugs(file_path: str) -> List[AdvancedFinding]:
     """Analiza un archivo en busca de bugs"""
@@ -47,267 +45,230 @@ def analyze_file_for_bugs(file_path: str) -> List[AdvancedFinding]:
         logging.warning(f"Error analizando {os.path.basename(file_path)}: {e}")
         return findings
 
+    return run_bug_detectors(tree, file_path, lines, None)
 
-    detectors = [
-        detect_except_pass,
-        detect_unused_variables,
-        detect_constant_conditions,
-        detect_unreachable_code,
-        detect_missing_return,
-        detect_mutable_default_args,
-    ]
-
-    for detector in detectors:
-        try:
-            findings.extend(detector(tree, file_path, lines))
-        except Exception as e:
-            logging.warning(f"Error en detector {detector.__name__} en {os.path.basename(file_path)}: {e}")
 
-    return findings
-
-
-def detect_except_pass(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class ExceptPassDetector(DetectorPlugin):
     """Detecta except: pass (silenciar errores sin manejo)"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ExceptHandler):
-            if len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
-                line_num = node.lineno
-                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+    node_types = (ast.ExceptHandler,)
 
-                findings.append(AdvancedFinding(
-                    severity=Severity.MAJOR,
-                    category=Category.BUG,
-                    message="Excepción capturada pero ignorada con 'pass'",
-                    file=file_path,
-                    line=line_num,
-                    suggestion="Registra el error con logging o maneja apropiadamente la excepción.",
-                    code_snippet=snippet
-                ))
+    def enter(self, node, depth):
+        if len(node.body) == 1 and isinstance(node.body[0], ast.Pass):
+            line_num = node.lineno
 
-    return findings
+            self.findings.append(AdvancedFinding(
+                severity=Severity.MAJOR,
+                category=Category.BUG,
+                message="Excepción capturada pero ignorada con 'pass'",
+                file=self.file_path,
+                line=line_num,
+                suggestion="Registra el error con logging o maneja apropiadamente la excepción.",
+                code_snippet=self.get_snippet(line_num)
+            ))
 
 
-def detect_unused_variables(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class VariableAnalyzer(DetectorPlugin):
     """Detecta variables asignadas pero nunca usadas"""
-    findings = []
 
-    class VariableAnalyzer(ast.NodeVisitor):
-        def __init__(self):
-            self.assigned = {}
-            self.used = set()
-            self.depth = 0
-            self.max_depth = MAX_AST_DEPTH # 🛡️ Límite de recursión
-
-        def visit(self, node):
-            self.depth += 1
-            if self.depth > self.max_depth:
-                return
-            try:
-                super().visit(node)
-            finally:
-                self.depth -= 1
-
-        def visit_Assign(self, node):
+    node_types = (ast.Assign, ast.Name)
+    max_depth = MAX_AST_DEPTH # 🛡️ Límite de recursión
+
+    def __init__(self, file_path, lines):
+        super().__init__(file_path, lines)
+        self.assigned = {}
+        self.used = set()
+
+    def enter(self, node, depth):
+        if isinstance(node, ast.Assign):
             for target in node.targets:
                 if isinstance(target, ast.Name):
                     self.assigned[target.id] = node.lineno
-            self.generic_visit(node)
 
-        def visit_Name(self, node):
-            if isinstance(node.ctx, ast.Load):
-                self.used.add(node.id)
-            self.generic_visit(node)
+        elif isinstance(node.ctx, ast.Load):
+            self.used.add(node.id)
 
-    analyzer = VariableAnalyzer()
+    def finish(self):
+        for var_name, line_num in self.assigned.items():
 
-    try:
-        analyzer.visit(tree)
-    except RecursionError:
-        return findings
+            if var_name not in self.used and not var_name.startswith('_'):
+                if var_name.isupper():
+                    continue
+
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.MINOR,
+                    category=Category.CODE_SMELL,
+                    message=f"Variable '{var_name}' asignada pero nunca usada",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion=f"Eliminar la variable '{var_name}' si no es necesaria, o usar _ para indicar que es intencional.",
+                    code_snippet=self.get_snippet(line_num)
+                ))
 
-    for var_name, line_num in analyzer.assigned.items():
 
-        if var_name not in analyzer.used and not var_name.startswith('_'):
-            if var_name.isupper():
-                continue
-                    
-            snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+class ConstantConditionDetector(DetectorPlugin):
+    """Detecta condiciones que siempre son True o False"""
 
-            findings.append(AdvancedFinding(
-                severity=Severity.MINOR,
-                category=Category.CODE_SMELL,
-                message=f"Variable '{var_name}' asignada pero nunca usada",
-                file=file_path,
-                line=line_num,
-                suggestion=f"Eliminar la variable '{var_name}' si no es necesaria, o usar _ para indicar que es intencional.",
-                code_snippet=snippet
-            ))
+    node_types = (ast.If,)
 
-    return findings
+    def enter(self, node, depth):
+        if isinstance(node.test, ast.Constant):
+            if node.test.value is True or node.test.value is False:
+                line_num = node.lineno
 
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.BUG,
+                    message=f"Condición siempre es {node.test.value}",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion="Revisar la lógica. Esta condición nunca cambia.",
+                    code_snippet=self.get_snippet(line_num)
+                ))
 
-def detect_constant_conditions(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta condiciones que siempre son True o False"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.If):
-            if isinstance(node.test, ast.Constant):
-                if node.test.value is True or node.test.value is False:
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+class UnreachableDetector(DetectorPlugin):
+    """Detecta código inalcanzable después de return/raise"""
+
+    node_types = (ast.FunctionDef,)
+    max_depth = MAX_AST_DEPTH
+
+    def enter(self, node, depth):
+        self.check_body(node.body)
+        # NO entrar en el cuerpo para evitar recursión profunda
+        return SKIP_CHILDREN
+
+    def check_body(self, body):
+        for i, stmt in enumerate(body):
+            if isinstance(stmt, (ast.Return, ast.Raise)):
+                if i + 1 < len(body):
+                    next_stmt = body[i + 1]
+                    line_num = next_stmt.lineno
 
-                    findings.append(AdvancedFinding(
+                    self.findings.append(AdvancedFinding(
                         severity=Severity.MAJOR,
                         category=Category.BUG,
-                        message=f"Condición siempre es {node.test.value}",
-                        file=file_path,
+                        message="Código inalcanzable después de return/raise",
+                        file=self.file_path,
                         line=line_num,
-                        suggestion="Revisar la lógica. Esta condición nunca cambia.",
-                        code_snippet=snippet
+                        suggestion="Eliminar el código inalcanzable o revisar la lógica.",
+                        code_snippet=self.get_snippet(line_num)
                     ))
+                    break
+
+
+class ReturnAnalyzer(DetectorPlugin):
+    """
+    Detecta funciones que a veces retornan valor y a veces no.
+    Solo se evalúan las funciones más externas; los return de funciones
+    anidadas cuentan para la función que las contiene.
+    """
+
+    node_types = (ast.FunctionDef, ast.Return)
+    leave_types = (ast.FunctionDef,)
+
+    def __init__(self, file_path, lines):
+        super().__init__(file_path, lines)
+        self.current = None
+        self.has_return_with_value = False
+        self.has_return_without_value = False
+
+    def enter(self, node, depth):
+        if isinstance(node, ast.Return):
+            if self.current is not None:
+                if node.value is not None:
+                    self.has_return_with_value = True
+                else:
+                    self.has_return_without_value = True
+            return None
+
+        if self.current is None and depth <= MAX_AST_DEPTH:
+            self.current = node
+            self.has_return_with_value = False
+            self.has_return_without_value = False
+
+    def leave(self, node, depth):
+        if node is not self.current:
+            return
+
+        self.current = None
+
+        # Ignorar __init__
+        if node.name == "__init__":
+            return
+
+        # Si tiene ambos tipos de return, es inconsistente
+        if self.has_return_with_value and self.has_return_without_value:
+            line_num = node.lineno
+
+            self.findings.append(AdvancedFinding(
+                severity=Severity.MAJOR,
+                category=Category.BUG,
+                message=f"Función '{node.name}' retorna valor en algunos casos pero no en otros",
+                file=self.file_path,
+                line=line_num,
+                suggestion="Asegurar que todos los caminos de ejecución retornen un valor o ninguno.",
+                code_snippet=self.get_snippet(line_num)
+            ))
 
-    return findings
-
-
-def detect_unreachable_code(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta código inalcanzable después de return/raise"""
-    findings = []
-
-    class UnreachableDetector(ast.NodeVisitor):
-        def __init__(self):
-            self.findings = []
-            self.depth = 0
-            self.max_depth = 200
-
-        def visit(self, node):
-            self.depth += 1
-            if self.depth > self.max_depth:
-                return
-            try:
-                super().visit(node)
-            finally:
-                self.depth -= 1
-
-        def visit_FunctionDef(self, node):
-            self.check_body(node.body)
-            # NO llamar generic_visit para evitar recursión profunda
-
-        def check_body(self, body):
-            for i, stmt in enumerate(body):
-                if isinstance(stmt, (ast.Return, ast.Raise)):
-                    if i + 1 < len(body):
-                        next_stmt = body[i + 1]
-                        line_num = next_stmt.lineno
-                        snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                        self.findings.append(AdvancedFinding(
-                            severity=Severity.MAJOR,
-                            category=Category.BUG,
-                            message="Código inalcanzable después de return/raise",
-                            file=file_path,
-                            line=line_num,
-                            suggestion="Eliminar el código inalcanzable o revisar la lógica.",
-                            code_snippet=snippet
-                        ))
-                        break
-
-    detector = UnreachableDetector()
-    detector.visit(tree)
-    findings.extend(detector.findings)
-
-    return findings
 
+class MutableDefaultArgsDetector(DetectorPlugin):
+    """Detecta argumentos mutables por defecto ([], {})"""
 
-def detect_missing_return(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta funciones que a veces retornan valor y a veces no"""
-    findings = []
+    node_types = (ast.FunctionDef,)
 
-    class ReturnAnalyzer(ast.NodeVisitor):
-        def __init__(self):
-            self.findings = []
-            self.depth = 0
-            self.max_depth = MAX_AST_DEPTH
-
-        def visit(self, node):
-            self.depth += 1
-            if self.depth > self.max_depth:
-                return
-            try:
-                super().visit(node)
-            finally:
-                self.depth -= 1
-
-        def visit_FunctionDef(self, node):
-            # Ignorar __init__
-            if node.name == "__init__":
-                return  # 🛡️ NO continuar visitando
-
-            has_return_with_value = False
-            has_return_without_value = False
-
-            for child in ast.walk(node):
-                if isinstance(child, ast.Return):
-                    if child.value is not None:
-                        has_return_with_value = True
-                    else:
-                        has_return_without_value = True
-
-            # Si tiene ambos tipos de return, es inconsistente
-            if has_return_with_value and has_return_without_value:
+    def enter(self, node, depth):
+        for default in node.args.defaults:
+            if isinstance(default, (ast.List, ast.Dict, ast.Set)):
                 line_num = node.lineno
-                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
 
                 self.findings.append(AdvancedFinding(
-                    severity=Severity.MAJOR,
+                    severity=Severity.CRITICAL,
                     category=Category.BUG,
-                    message=f"Función '{node.name}' retorna valor en algunos casos pero no en otros",
-                    file=file_path,
+                    message=f"Argumento mutable como valor por defecto en función '{node.name}'",
+                    file=self.file_path,
                     line=line_num,
-                    suggestion="Asegurar que todos los caminos de ejecución retornen un valor o ninguno.",
-                    code_snippet=snippet
+                    suggestion="Usar None como default y crear el objeto dentro de la función.",
+                    code_snippet=self.get_snippet(line_num),
+                    cwe_id="CWE-1188"
                 ))
-            
-            # 🛡️ NO llamar generic_visit()
 
-    try:
-        analyzer = ReturnAnalyzer()
-        analyzer.visit(tree)
-        findings.extend(analyzer.findings)
-    except RecursionError:
-        # Silenciar errores de recursión explícitamente si es necesario
-        return findings
-    except Exception as e:
-        logging.warning(
-            f"Error en detect_missing_return para {os.path.basename(file_path)}: {e}"
-        )
 
-    return findings
-    
-    
+BUG_DETECTORS = [
+    ExceptPassDetector,
+    VariableAnalyzer,
+    ConstantConditionDetector,
+    UnreachableDetector,
+    ReturnAnalyzer,
+    MutableDefaultArgsDetector,
+]
 
-def detect_mutable_default_args(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta argumentos mutables por defecto ([], {})"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            for i, default in enumerate(node.args.defaults):
-                if isinstance(default, (ast.List, ast.Dict, ast.Set)):
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+def detect_except_pass(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta except: pass (silenciar errores sin manejo)"""
+    return run_plugin(tree, ExceptPassDetector(file_path, lines))
+
+
+def detect_unused_variables(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta variables asignadas pero nunca usadas"""
+    return run_plugin(tree, VariableAnalyzer(file_path, lines))
+
+
+def detect_constant_conditions(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta condiciones que siempre son True o False"""
+    return run_plugin(tree, ConstantConditionDetector(file_path, lines))
 
-                    findings.append(AdvancedFinding(
-                        severity=Severity.CRITICAL,
-                        category=Category.BUG,
-                        message=f"Argumento mutable como valor por defecto en función '{node.name}'",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar None como default y crear el objeto dentro de la función.",
-                        code_snippet=snippet,
-                        cwe_id="CWE-1188"
-                    ))
 
-    return findings
\ No newline at end of file
+def detect_unreachable_code(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta código inalcanzable después de return/raise"""
+    return run_plugin(tree, UnreachableDetector(file_path, lines))
+
+
+def detect_missing_return(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta funciones que a veces retornan valor y a veces no"""
+    return run_plugin(tree, ReturnAnalyzer(file_path, lines))
+
+
+def detect_mutable_default_args(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta argumentos mutables por defecto ([], {})"""
+    return run_plugin(tree, MutableDefaultArgsDetector(file_path, lines))
@@ -1,13 +1,22 @@
 """
 CodeHunter - Circular Imports Detector
-Detecta ciclos de importación dentro del proyecto usando DFS iterativo.
-Soporta imports absolutos y relativos.
+Detecta ciclos de importación dentro del proyecto: un ciclo real por cada
+componente fuertemente conexa del grafo (Tarjan + BFS) o, opcionalmente,
+los ciclos elementales (Johnson, acotado). Soporta imports absolutos y relativos.
 """
 
 import os
 import ast
 from pathlib import Path
 from ..utils.project_walker import walk_project
+from ..utils.module_index import ModuleIndex, get_module_index
+from ..utils.graph_cycles import component_cycles, elementary_cycles
+from ..core.parsed_project import load_parsed_file
+from .ast_dispatch import DetectorPlugin
+
+
+# Límite de ciclos elementales a enumerar (puede haber una cantidad exponencial)
+MAX_ENUMERATED_CYCLES = 1000
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -52,39 +61,49 @@ def is_internal_module(module_path: Path, project_root: Path) -> bool:
         return str(project_root.resolve()) in str(module_path.resolve())
 
 
-def _resolve_import_node(node, file_path: Path, project_root: Path):
+def import_facts(node):
+    """
+    Convierte un nodo Import o ImportFrom en hechos [módulo, nivel].
+    Son serializables, así que pueden guardarse por archivo en la caché.
+    """
+    if isinstance(node, ast.Import):
+        return [[alias.name, 0] for alias in node.names]
+
+    if isinstance(node, ast.ImportFrom) and node.module:
+        return [[node.module, node.level or 0]]
+
+    return []
+
+
+class ImportFactCollector(DetectorPlugin):
+    """Recolecta los imports de un archivo durante el recorrido compartido."""
+
+    node_types = (ast.Import, ast.ImportFrom)
+
+    def __init__(self, file_path, lines):
+        super().__init__(file_path, lines)
+        self.facts = []
+
+    def enter(self, node, depth):
+        self.facts.extend(import_facts(node))
+
+
+def _resolve_import_node(node, rel_path: Path, module_index: ModuleIndex):
     """
-    Resuelve un nodo Import o ImportFrom a una ruta .py interna.
+    Resuelve un nodo Import o ImportFrom a las rutas .py internas que importa.
     Soporta imports absolutos y relativos (level > 0).
-    Retorna Path relativo al project_root, o None si es externo/no resuelto.
+    Retorna Paths relativos al project_root (los externos se omiten).
     """
-    candidates = []
+    return _resolve_import_facts(import_facts(node), rel_path, module_index)
 
-    if isinstance(node, ast.Import):
-        for alias in node.names:
-            candidates.append(
-                project_root / (alias.name.replace(".", os.sep) + ".py")
-            )
-
-    elif isinstance(node, ast.ImportFrom) and node.module:
-        if node.level and node.level > 0:
-            # Import relativo: subir `level` directorios desde el archivo actual
-            base = file_path.parent
-            for _ in range(node.level - 1):
-                base = base.parent
-            candidates.append(
-                base / (node.module.replace(".", os.sep) + ".py")
-            )
-        else:
-            # Import absoluto
-            candidates.append(
-                project_root / (node.module.replace(".", os.sep) + ".py")
-            )
 
+def _resolve_import_facts(facts, rel_path: Path, module_index: ModuleIndex):
+    """Igual que _resolve_import_node() pero a partir de hechos [módulo, nivel]."""
     results = []
-    for candidate in candidates:
-        if candidate.exists() and is_internal_module(candidate, project_root):
-            results.append(candidate.resolve().relative_to(project_root.resolve()))
+    for module, level in facts:
+        resolved = module_index.resolve_import(module, level, rel_path)
+        if resolved is not None:
+            results.append(resolved)
     return results
 
 
@@ -92,81 +111,67 @@ def _resolve_import_node(node, file_path: Path, project_root: Path):
 # Detección de ciclos
 # ──────────────────────────────────────────────────────────────────────────────
 
-def detect_circular_imports(project_path):
+def detect_circular_imports(project_path, file_facts=None,
+                            enumerate_cycles=False, max_cycles=MAX_ENUMERATED_CYCLES,
+                            parsed=None):
     """
     Construye el grafo de imports internos y detecta ciclos.
     Retorna lista de ciclos, donde cada ciclo es una lista de strings de rutas.
+
+    Por defecto se reporta un ciclo por componente fuertemente conexa: el
+    más corto que pasa por su primer módulo, así que cada módulo importa
+    al siguiente (y el último al primero). Los demás ciclos de la misma
+    componente aparecen al romper ese. Con enumerate_cycles=True se
+    retornan los ciclos elementales, como máximo max_cycles.
+
+    file_facts: hechos por archivo de un análisis previo ({ruta: hechos},
+    ver analysis_engine). Los archivos incluidos no se vuelven a parsear;
+    un valor None indica que el archivo no se pudo leer como UTF-8.
+    parsed: ParsedProject compartido para los archivos sin hechos.
     """
-    project_root = Path(project_path)
+    file_facts = file_facts or {}
     import_graph: dict[Path, set[Path]] = {}
 
-    # 1. Construir grafo de imports internos
-    for root, files in walk_project(project_root):
-        for file in files:
-            if not file.endswith(".py"):
-                continue
+    # 1. Índice de módulos del proyecto (compartido; sin stat por import)
+    files = []
+    for root, names in walk_project(project_path):
+        for file in names:
+            if file.endswith(".py"):
+                file_path = os.path.join(root, file)
+                files.append((file_path, Path(os.path.relpath(file_path, project_path))))
 
-            file_path = Path(root) / file
+    module_index = get_module_index(project_path)
 
-            try:
-                rel = file_path.resolve().relative_to(project_root.resolve())
-            except ValueError:
-                continue
+    # 2. Construir grafo de imports internos
+    for file_path, rel in files:
+        import_graph[rel] = set()
 
-            import_graph[rel] = set()
+        if file_path in file_facts:
+            facts = file_facts[file_path]
+            if facts is None:
+                continue
+            imports = facts["imports"]
 
+        else:
             try:
-                tree = ast.parse(file_path.read_text(encoding="utf-8"))
+                tree = load_parsed_file(file_path, parsed).parse(strict=True)
             except Exception:
                 continue
 
+            imports = []
             for node in ast.walk(tree):
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    for resolved in _resolve_import_node(node, file_path, project_root):
-                        if resolved != rel:  # evitar auto-referencias
-                            import_graph[rel].add(resolved)
-
-    # 2. Detectar ciclos con DFS iterativo (sin riesgo de recursión infinita)
-    return _find_cycles_iterative(import_graph)
-
-
-def _find_cycles_iterative(graph: dict) -> list[list[str]]:
-    """
-    DFS iterativo para detección de ciclos.
-    Evita RecursionError en proyectos grandes y no produce duplicados.
-    """
-    visited:  set = set()
-    cycles:   list = []
-    reported: set = set()  # evita reportar el mismo ciclo en distintas entradas
-
-    for start_node in graph:
-        if start_node in visited:
-            continue
-
-        # Pila DFS: (nodo_actual, path_hasta_aqui)
-        stack = [(start_node, [start_node])]
-
-        while stack:
-            node, path = stack.pop()
-
-            if node in visited and node not in path:
-                continue
-
-            for neighbor in graph.get(node, []):
-                if neighbor in path:
-                    # Ciclo encontrado
-                    idx = path.index(neighbor)
-                    cycle = [str(n) for n in path[idx:]]
+                imports.extend(import_facts(node))
 
-                    # Normalizar para evitar duplicados (ciclo rotado)
-                    key = tuple(sorted(cycle))
-                    if key not in reported:
-                        reported.add(key)
-                        cycles.append(cycle)
+        for resolved in _resolve_import_facts(imports, rel, module_index):
+            if resolved != rel:  # evitar auto-referencias
+                import_graph[rel].add(resolved)
 
-                elif neighbor not in visited:
-                    stack.append((neighbor, path + [neighbor]))
+    # 3. Detectar ciclos (vecinos ordenados para que el resultado sea estable)
+    graph = {node: sorted(neighbors) for node, neighbors in import_graph.items()}
 
-        visited.add(start_node)
+    if enumerate_cycles:
+        cycles = elementary_cycles(graph, max_cycles)
+    else:
+        cycles = component_cycles(graph)
 
-    return cycles
+    return [[str(node) for node in cycle] for cycle in cycles]
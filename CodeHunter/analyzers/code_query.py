@@ -0,0 +1,244 @@
+"""
+CodeHunter - Consultas de código (expresiones regulares y patrones del AST)
+Los resultados se generan archivo por archivo (generadores), así que la
+interfaz puede mostrar las primeras coincidencias y cortar cuando quiera.
+
+Sintaxis aceptada por parse_query() / search_code():
+    re:<regex>                   líneas que coinciden con la expresión
+    call:<nombre> [kw:<arg> ...]  llamadas a nombre (o a.b.nombre) con esos keywords
+    def:params>N                 funciones con más de N parámetros (>, >=, <, <=, =)
+"""
+
+import os
+import re
+import ast
+import operator
+from abc import ABC, abstractmethod
+
+from ..utils.project_walker import walk_project
+from ..core.parsed_project import load_parsed_file
+from ..infrastructure.trigram_index import get_trigram_index, TRIGRAM_SIZE
+from .ast_dispatch import DetectorPlugin, dispatch
+
+
+REGEX_PREFIX = "re:"
+CALL_PREFIX = "call:"
+DEF_PREFIX = "def:"
+KEYWORD_PREFIX = "kw:"
+
+_PARAMS_PATTERN = re.compile(r"params\s*(>=|<=|>|<|=)\s*(\d+)$")
+
+_COMPARISONS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+}
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Consultas
+# ──────────────────────────────────────────────────────────────────────────────
+
+class RegexQuery:
+    """Líneas que contienen una coincidencia de la expresión regular."""
+
+    result_type = "regex"
+    literals = ()
+
+    def __init__(self, pattern):
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+
+    def matches(self, parsed_file):
+        lines = parsed_file.lines
+        if not lines[-1]:
+            lines = lines[:-1]  # el salto de línea final no abre otra línea
+
+        for number, line in enumerate(lines, 1):
+            if self.pattern.search(line):
+                yield number, line.strip()
+
+
+class NodeQuery(ABC):
+    """
+    Base de las consultas estructurales: node_types + match(nodo).
+    literals: textos que todo archivo con coincidencias contiene; se usan
+    para descartar archivos con el índice de trigramas sin parsearlos.
+    """
+
+    result_type = "node"
+    node_types = ()
+    literals = ()
+
+    @abstractmethod
+    def match(self, node):
+        """True si el nodo (de node_types) coincide con la consulta."""
+
+    def matches(self, parsed_file):
+        plugin = _QueryPlugin(parsed_file.path, parsed_file.lines, self)
+        dispatch(parsed_file.parse(strict=True), [plugin])
+        return plugin.matches
+
+
+class CallQuery(NodeQuery):
+    """
+    Llamadas a name con todos los keywords indicados. name puede ser un
+    nombre simple (coincide con f() y con obj.f()) o con puntos (a.b.f).
+    """
+
+    result_type = "call"
+    node_types = (ast.Call,)
+
+    def __init__(self, name, keywords=()):
+        self.name = name
+        self.keywords = set(keywords)
+        self.literals = (name.split(".")[-1], *self.keywords)
+
+    def match(self, node):
+        called = dotted_name(node.func)
+        if called is None:
+            return False
+
+        if called != self.name and not called.endswith("." + self.name):
+            return False
+
+        passed = {keyword.arg for keyword in node.keywords if keyword.arg}
+        return self.keywords <= passed
+
+
+class ParameterCountQuery(NodeQuery):
+    """
+    Funciones cuyo número de parámetros cumple la comparación. Se cuentan
+    todos los declarados: posicionales, keyword-only, *args y **kwargs.
+    """
+
+    result_type = "function"
+    node_types = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+    def __init__(self, comparison, count):
+        self.comparison = comparison
+        self.count = count
+
+    def match(self, node):
+        args = node.args
+        total = len(args.posonlyargs) + len(args.args) + len(args.kwonlyargs)
+        total += (args.vararg is not None) + (args.kwarg is not None)
+        return _COMPARISONS[self.comparison](total, self.count)
+
+
+class _QueryPlugin(DetectorPlugin):
+    """Ejecuta una NodeQuery dentro de dispatch()."""
+
+    def __init__(self, file_path, lines, query):
+        super().__init__(file_path, lines)
+        self.node_types = query.node_types
+        self.query = query
+        self.matches = []
+
+    def enter(self, node, depth):
+        if self.query.match(node):
+            self.matches.append((node.lineno, self.get_snippet(node.lineno)))
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Ejecución
+# ──────────────────────────────────────────────────────────────────────────────
+
+def parse_query(text):
+    """
+    Convierte el texto de búsqueda en una consulta, o None si no usa
+    ninguno de los prefijos. Lanza ValueError si la consulta está mal formada.
+    """
+    text = text.strip()
+
+    if text.startswith(REGEX_PREFIX):
+        try:
+            return RegexQuery(text[len(REGEX_PREFIX):])
+        except re.error as e:
+            raise ValueError(f"Expresión regular inválida: {e}") from e
+
+    if text.startswith(CALL_PREFIX):
+        parts = text[len(CALL_PREFIX):].split()
+        if not parts:
+            raise ValueError("Falta el nombre de la función en call:")
+        name, *options = parts
+
+        keywords = []
+        for option in options:
+            if not option.startswith(KEYWORD_PREFIX) or len(option) == len(KEYWORD_PREFIX):
+                raise ValueError(f"Opción no reconocida en call: {option}")
+            keywords.append(option[len(KEYWORD_PREFIX):])
+
+        return CallQuery(name, keywords)
+
+    if text.startswith(DEF_PREFIX):
+        match = _PARAMS_PATTERN.match(text[len(DEF_PREFIX):].strip())
+        if not match:
+            raise ValueError("Formato esperado: def:params>N")
+        return ParameterCountQuery(match.group(1), int(match.group(2)))
+
+    return None
+
+
+def iter_query(project_path, query, parsed=None, index=None):
+    """
+    Hace yield de cada coincidencia ({file, line, content, type}) a medida
+    que se analiza cada archivo. Los archivos que no son UTF-8 válido o no
+    parsean se omiten, igual que en el resto de búsquedas.
+    index: TrigramIndex para descartar archivos según query.literals.
+    """
+    for path in _candidate_files(project_path, query, parsed, index):
+        try:
+            parsed_file = load_parsed_file(path, parsed)
+            if not parsed_file.is_utf8:
+                continue
+            matches = query.matches(parsed_file)
+        except Exception:
+            continue
+
+        for line, content in matches:
+            yield {
+                "file": path,
+                "line": line,
+                "content": content,
+                "type": query.result_type
+            }
+
+
+def _candidate_files(project_path, query, parsed, index):
+    literals = [literal for literal in query.literals if len(literal) >= TRIGRAM_SIZE]
+
+    if not literals:
+        return [
+            os.path.join(root, file)
+            for root, files in walk_project(project_path)
+            for file in files
+            if file.endswith(".py")
+        ]
+
+    if index is None:
+        index = get_trigram_index(project_path)
+    index.refresh(parsed)
+
+    candidates = index.candidates(literals[0])
+    for literal in literals[1:]:
+        allowed = set(index.candidates(literal))
+        candidates = [path for path in candidates if path in allowed]
+
+    return candidates
+
+
+def dotted_name(node):
+    """Nombre con puntos de una expresión Name / Attribute (None si no lo es)."""
+    parts = []
+
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    parts.append(node.id)
+    return ".".join(reversed(parts))
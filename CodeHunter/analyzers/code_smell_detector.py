@@ -2,11 +2,12 @@
 Code Smell Detector - Detecta problemas de diseño y mantenibilidad
 """
 import os
-import hashlib
 import logging
 import ast
 from typing import List
 from ..core.models import AdvancedFinding, Severity, Category
+from .ast_dispatch import DetectorPlugin, SKIP_CHILDREN, dispatch, run_plugin
+from .ast_fingerprint import Fingerprinter
 
 
 logger = logging.getLogger(__name__)
@@ -15,41 +16,25 @@ logger = logging.getLogger(__name__)
 GLOBAL_FUNCTION_HASHES = {}
 
 
-class ASTNormalizer(ast.NodeTransformer):
+class GlobalAnalyzer(DetectorPlugin):
 
-    def visit_Name(self, node):
-        return ast.copy_location(ast.Name(id="var", ctx=node.ctx), node)
+    node_types = (ast.FunctionDef, ast.ClassDef, ast.Constant)
 
-    def visit_arg(self, node):
-        node.arg = "param"
-        return node
-
-    def visit_FunctionDef(self, node):
-        node.name = "func"
-        self.generic_visit(node)
-        return node
-
-
-def structural_hash(node):
-
-    normalizer = ASTNormalizer()
-
-    node_copy = ast.fix_missing_locations(
-        normalizer.visit(ast.parse(ast.unparse(node)))
-    )
-
-    return hashlib.blake2b(
-        ast.dump(node_copy, annotate_fields=False).encode(),
-        digest_size=16
-    ).hexdigest()
-
-class GlobalAnalyzer(ast.NodeVisitor):
-
-    def __init__(self, file_path, lines, findings, config):
-        self.file_path = file_path
-        self.lines = lines
-        self.findings = findings
+    def __init__(self, file_path, lines, config, fingerprinter=None):
+        super().__init__(file_path, lines)
         self.config = config
+        self.fingerprinter = fingerprinter or Fingerprinter()
+        self.ignored_numbers = set(
+            config.get("analysis", {}).get("ignored_numbers", [])
+        )
+        self.function_hashes = []
+
+    def enter(self, node, depth):
+        if isinstance(node, ast.FunctionDef):
+            return self.visit_FunctionDef(node)
+        if isinstance(node, ast.ClassDef):
+            return self.visit_ClassDef(node)
+        return self.visit_Constant(node)
 
     def visit_FunctionDef(self, node):
 
@@ -93,43 +78,19 @@ class GlobalAnalyzer(ast.NodeVisitor):
                 )
             )
 
-        # AST HASHING (duplicados)
+        # AST HASHING (duplicados): se resuelven después contra el registro global
         if len(node.body) > 200:
-            return
-        func_hash = structural_hash(node)
-
-
-        if func_hash in GLOBAL_FUNCTION_HASHES:
-
-            original = GLOBAL_FUNCTION_HASHES[func_hash]
-
-            snippet = self.lines[node.lineno-1].strip()
-
-            self.findings.append(
-                AdvancedFinding(
-                    severity=Severity.MAJOR,
-                    category=Category.CODE_SMELL,
-                    message=(
-                        f"Función duplicada '{node.name}' y '{original['name']}' "
-                        f"(archivo: {os.path.basename(original['file'])})"
-                    ),
-                    file=self.file_path,
-                    line=node.lineno,
-                    suggestion="Extraer lógica común en una función reutilizable.",
-                    code_snippet=snippet
-                )
-            )
+            return SKIP_CHILDREN
 
-        else:
-
-            GLOBAL_FUNCTION_HASHES[func_hash] = {
-                "name": node.name,
-                "line": node.lineno,
-                "file": self.file_path
-            }
-
-        self.generic_visit(node)
+        self.function_hashes.append({
+            "hash": self.fingerprinter.fingerprint(node),
+            "name": node.name,
+            "file": self.file_path,
+            "line": node.lineno,
+            "snippet": self.lines[node.lineno-1].strip()
+        })
 
+        return None
 
     def visit_ClassDef(self, node):
 
@@ -151,17 +112,11 @@ class GlobalAnalyzer(ast.NodeVisitor):
                 )
             )
 
-        self.generic_visit(node)
-
     def visit_Constant(self, node):
 
-        ignored_numbers = set(
-            self.config.get("analysis", {}).get("ignored_numbers", [])
-        )
-
         if isinstance(node.value, (int, float)):
 
-            if node.value not in ignored_numbers:
+            if node.value not in self.ignored_numbers:
 
                 snippet = self.lines[node.lineno-1].strip()
 
@@ -177,18 +132,189 @@ class GlobalAnalyzer(ast.NodeVisitor):
                     )
                 )
 
-        self.generic_visit(node)
+
+class NestingAnalyzer(DetectorPlugin):
+    """Detecta anidamiento profundo (más de 4 niveles)"""
+
+    node_types = (ast.If, ast.For, ast.While, ast.With, ast.Try)
+    leave_types = node_types
+    max_depth = 200
+
+    def __init__(self, file_path, lines):
+        super().__init__(file_path, lines)
+        self.current_depth = 0
+
+    def enter(self, node, depth):
+        self.check_depth(node)
+        self.current_depth += 1
+
+    def leave(self, node, depth):
+        self.current_depth -= 1
+
+    def check_depth(self, node):
+        if self.current_depth > 4:
+            line_num = node.lineno
+
+            self.findings.append(AdvancedFinding(
+                severity=Severity.MAJOR,
+                category=Category.CODE_SMELL,
+                message=f"Anidamiento muy profundo (nivel {self.current_depth})",
+                file=self.file_path,
+                line=line_num,
+                suggestion="Extraer lógica a funciones auxiliares o usar early returns.",
+                code_snippet=self.get_snippet(line_num)
+            ))
+
+
+class NamingAnalyzer(DetectorPlugin):
+    """Detecta nombres de variables poco descriptivos"""
+
+    node_types = (ast.FunctionDef, ast.Assign)
+    max_depth = 200
+
+    poor_names = {'a', 'b', 'c', 'd', 'x', 'y', 'z', 'temp', 'tmp', 'foo', 'bar', 'baz', 'data', 'obj', 'var'}
+
+    def enter(self, node, depth):
+        if isinstance(node, ast.FunctionDef):
+            self.visit_FunctionDef(node)
+            # 🛡️ No entrar en el cuerpo de las funciones
+            return SKIP_CHILDREN
+
+        self.visit_Assign(node)
+        return None
+
+    def visit_FunctionDef(self, node):
+        if len(node.body) <= 2:
+            return  # 🛡️ No continuar con funciones cortas
+
+        for arg in node.args.args:
+            if arg.arg in self.poor_names and arg.arg not in ['i', 'j', 'k']:
+                line_num = node.lineno
+
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.MINOR,
+                    category=Category.CODE_SMELL,
+                    message=f"Nombre poco descriptivo para parámetro: '{arg.arg}' en función '{node.name}'",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion="Usar nombres descriptivos que indiquen el propósito de la variable.",
+                    code_snippet=self.get_snippet(line_num)
+                ))
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                if target.id in self.poor_names and len(target.id) == 1:
+                    line_num = node.lineno
+
+                    self.findings.append(AdvancedFinding(
+                        severity=Severity.MINOR,
+                        category=Category.CODE_SMELL,
+                        message=f"Nombre poco descriptivo para variable: '{target.id}'",
+                        file=self.file_path,
+                        line=line_num,
+                        suggestion="Usar nombres que describan el contenido o propósito de la variable.",
+                        code_snippet=self.get_snippet(line_num)
+                    ))
+
+
+class LongParameterListDetector(DetectorPlugin):
+    """Detecta llamadas a funciones con muchos argumentos posicionales"""
+
+    node_types = (ast.Call,)
+
+    def enter(self, node, depth):
+        num_args = len(node.args)
+
+        if num_args > 5:
+            line_num = node.lineno
+
+            self.findings.append(AdvancedFinding(
+                severity=Severity.MINOR,
+                category=Category.CODE_SMELL,
+                message=f"Llamada a función con muchos argumentos ({num_args})",
+                file=self.file_path,
+                line=line_num,
+                suggestion="Considerar usar argumentos con nombre (kwargs) para mayor claridad.",
+                code_snippet=self.get_snippet(line_num)
+            ))
+
 
 def run_smell_detectors(tree, file_path, lines, config):
 
+    findings, function_hashes = collect_smell_findings(tree, file_path, lines, config)
+
+    findings.extend(resolve_duplicate_smell_functions(function_hashes))
+
+    return findings
+
+
+def build_smell_plugins(file_path, lines, config, fingerprinter=None):
+    """
+    Instancia los detectores de smells para un recorrido compartido del AST.
+    El primero siempre es GlobalAnalyzer (ver smell_function_hashes()).
+    """
+    return [
+        GlobalAnalyzer(file_path, lines, config, fingerprinter),
+        NestingAnalyzer(file_path, lines),
+        NamingAnalyzer(file_path, lines),
+        LongParameterListDetector(file_path, lines),
+    ]
+
+
+def smell_function_hashes(plugins):
+    """Hashes de funciones pendientes de resolver recolectados por build_smell_plugins()."""
+    global_analyzer = plugins[0]
+    return [] if global_analyzer.failed else global_analyzer.function_hashes
+
+
+def collect_smell_findings(tree, file_path, lines, config):
+    """
+    Ejecuta los detectores de smells sin tocar GLOBAL_FUNCTION_HASHES.
+    Retorna (findings, hashes de funciones pendientes de resolver).
+    """
+
+    plugins = build_smell_plugins(file_path, lines, config)
+    findings = dispatch(tree, plugins)
+
+    return findings, smell_function_hashes(plugins)
+
+
+def resolve_duplicate_smell_functions(entries):
+    """Compara los hashes recolectados contra GLOBAL_FUNCTION_HASHES (en orden)."""
+
     findings = []
 
-    analyzer = GlobalAnalyzer(file_path, lines, findings, config)
-    analyzer.visit(tree)
+    for entry in entries:
+
+        func_hash = entry["hash"]
+
+        if func_hash in GLOBAL_FUNCTION_HASHES:
+
+            original = GLOBAL_FUNCTION_HASHES[func_hash]
+
+            findings.append(
+                AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.CODE_SMELL,
+                    message=(
+                        f"Función duplicada '{entry['name']}' y '{original['name']}' "
+                        f"(archivo: {os.path.basename(original['file'])})"
+                    ),
+                    file=entry["file"],
+                    line=entry["line"],
+                    suggestion="Extraer lógica común en una función reutilizable.",
+                    code_snippet=entry["snippet"]
+                )
+            )
+
+        else:
 
-    findings.extend(detect_deep_nesting(tree, file_path, lines))
-    findings.extend(detect_poor_naming(tree, file_path, lines))
-    findings.extend(detect_long_parameter_list(tree, file_path, lines))
+            GLOBAL_FUNCTION_HASHES[func_hash] = {
+                "name": entry["name"],
+                "line": entry["line"],
+                "file": entry["file"]
+            }
 
     return findings
 
@@ -214,187 +340,19 @@ def analyze_file_for_smells(file_path: str, config: dict):
         return findings
     
     # 🚀 Nuevo análisis optimizado (1 sola pasada del AST)
-
-    analyzer = GlobalAnalyzer(file_path, lines, findings, config)
-
-    try:
-        analyzer.visit(tree)
-
-        findings.extend(detect_deep_nesting(tree, file_path, lines))
-        findings.extend(detect_poor_naming(tree, file_path, lines))
-        findings.extend(detect_long_parameter_list(tree, file_path, lines))
-    except RecursionError:
-        print(f"⚠️ RecursionError analizando {os.path.basename(file_path)}")
-
-    return findings
+    return run_smell_detectors(tree, file_path, lines, config)
 
 
 def detect_deep_nesting(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
     """Detecta anidamiento profundo (más de 4 niveles)"""
-    findings = []
-
-    class NestingAnalyzer(ast.NodeVisitor):
-        def __init__(self):
-            self.findings = []
-            self.current_depth = 0
-            self.recursion_depth = 0
-            self.max_recursion = 200
-
-        def visit(self, node):
-            self.recursion_depth += 1
-            if self.recursion_depth > self.max_recursion:
-                return
-            try:
-                super().visit(node)
-            finally:
-                self.recursion_depth -= 1
-
-        def visit_If(self, node):
-            self.check_depth(node)
-            self.current_depth += 1
-            self.generic_visit(node)
-            self.current_depth -= 1
-
-        def visit_For(self, node):
-            self.check_depth(node)
-            self.current_depth += 1
-            self.generic_visit(node)
-            self.current_depth -= 1
-
-        def visit_While(self, node):
-            self.check_depth(node)
-            self.current_depth += 1
-            self.generic_visit(node)
-            self.current_depth -= 1
-
-        def visit_With(self, node):
-            self.check_depth(node)
-            self.current_depth += 1
-            self.generic_visit(node)
-            self.current_depth -= 1
-
-        def visit_Try(self, node):
-            self.check_depth(node)
-            self.current_depth += 1
-            self.generic_visit(node)
-            self.current_depth -= 1
-
-        def check_depth(self, node):
-            if self.current_depth > 4:
-                line_num = node.lineno
-                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                self.findings.append(AdvancedFinding(
-                    severity=Severity.MAJOR,
-                    category=Category.CODE_SMELL,
-                    message=f"Anidamiento muy profundo (nivel {self.current_depth})",
-                    file=file_path,
-                    line=line_num,
-                    suggestion="Extraer lógica a funciones auxiliares o usar early returns.",
-                    code_snippet=snippet
-                ))
-
-    try:
-        analyzer = NestingAnalyzer()
-        analyzer.visit(tree)
-        findings.extend(analyzer.findings)
-    except RecursionError:
-        logger.warning(f"RecursionError en detect_deep_nesting analizando {file_path}")
-
-    return findings
+    return run_plugin(tree, NestingAnalyzer(file_path, lines))
 
 
 def detect_poor_naming(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
     """Detecta nombres de variables poco descriptivos"""
-    findings = []
-    poor_names = {'a', 'b', 'c', 'd', 'x', 'y', 'z', 'temp', 'tmp', 'foo', 'bar', 'baz', 'data', 'obj', 'var'}
-
-    class NamingAnalyzer(ast.NodeVisitor):
-        def __init__(self):
-            self.findings = []
-            self.depth = 0
-            self.max_depth = 200
-
-        def visit(self, node):
-            self.depth += 1
-            if self.depth > self.max_depth:
-                return
-            try:
-                super().visit(node)
-            finally:
-                self.depth -= 1
-
-        def visit_FunctionDef(self, node):
-            if len(node.body) <= 2:
-                return  # 🛡️ No continuar con funciones cortas
-
-            for arg in node.args.args:
-                if arg.arg in poor_names and arg.arg not in ['i', 'j', 'k']:
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                    self.findings.append(AdvancedFinding(
-                        severity=Severity.MINOR,
-                        category=Category.CODE_SMELL,
-                        message=f"Nombre poco descriptivo para parámetro: '{arg.arg}' en función '{node.name}'",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar nombres descriptivos que indiquen el propósito de la variable.",
-                        code_snippet=snippet
-                    ))
-            
-            # 🛡️ NO llamar generic_visit
-
-        def visit_Assign(self, node):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    if target.id in poor_names and len(target.id) == 1:
-                        line_num = node.lineno
-                        snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                        self.findings.append(AdvancedFinding(
-                            severity=Severity.MINOR,
-                            category=Category.CODE_SMELL,
-                            message=f"Nombre poco descriptivo para variable: '{target.id}'",
-                            file=file_path,
-                            line=line_num,
-                            suggestion="Usar nombres que describan el contenido o propósito de la variable.",
-                            code_snippet=snippet
-                        ))
-            
-            self.generic_visit(node)
-
-    try:
-        analyzer = NamingAnalyzer()
-        analyzer.visit(tree)
-        findings.extend(analyzer.findings)
-    except RecursionError:
-        logger.warning(f"RecursionError en detect_poor_naming analizando {file_path}")
-
-    return findings
+    return run_plugin(tree, NamingAnalyzer(file_path, lines))
 
 
 def detect_long_parameter_list(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
     """Detecta llamadas a funciones con muchos argumentos posicionales"""
-    findings = []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            num_args = len(node.args)
-
-            if num_args > 5:
-                line_num = node.lineno
-                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                findings.append(AdvancedFinding(
-                    severity=Severity.MINOR,
-                    category=Category.CODE_SMELL,
-                    message=f"Llamada a función con muchos argumentos ({num_args})",
-                    file=file_path,
-                    line=line_num,
-                    suggestion="Considerar usar argumentos con nombre (kwargs) para mayor claridad.",
-                    code_snippet=snippet
-                ))
-
-    return findings
-
+    return run_plugin(tree, LongParameterListDetector(file_path, lines))
@@ -0,0 +1,268 @@
+"""
+Detector Profiler - Tiempo y memoria de cada detector y de cada archivo
+Con el perfilado activo, analyze_file() envuelve enter/leave/finish de
+cada plugin para medir tiempo real, llamadas y nodos recibidos (y, con
+trace_memory, el pico de memoria con tracemalloc). Los workers devuelven
+sus mediciones junto al resultado y AnalysisProfiler las agrega en un
+informe JSON y una tabla con los más costosos.
+
+Desactivado (profiler=None) no se envuelve nada: el único coste es una
+comprobación por archivo.
+"""
+
+import os
+import ast
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+# Filas de las tablas de format_table()
+DEFAULT_TOP = 10
+
+# Columnas de las estadísticas de un detector (FILES solo en el agregado)
+WALL, CALLS, NODES, PEAK, FILES = range(5)
+
+
+class FileProfile:
+    """Mediciones de un archivo dentro de analyze_file() (también en los workers)."""
+
+    def __init__(self, file_path, trace_memory=False):
+        self.file_path = file_path
+        self.trace_memory = trace_memory
+        self.detectors = {}   # nombre -> [tiempo, llamadas, nodos, pico]
+        self.parse_time = 0.0
+        self._peak = 0
+
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        self._baseline = tracemalloc.get_traced_memory()[0] if trace_memory else 0
+        self._start = time.perf_counter()
+
+    def parsed(self):
+        """Marca el fin de la lectura y el parseo."""
+        self.parse_time = time.perf_counter() - self._start
+        self._update_peak()
+
+    def instrument(self, plugins):
+        """Envuelve enter/leave/finish de cada plugin (atributos de instancia)."""
+        for plugin in plugins:
+            stats = self.detectors.setdefault(plugin.name, [0.0, 0, 0, 0])
+            plugin.enter = self._timed(plugin.enter, stats, counts_nodes=True)
+            plugin.leave = self._timed(plugin.leave, stats)
+            plugin.finish = self._timed(plugin.finish, stats)
+
+    def finish(self, tree=None):
+        """Diccionario serializable con las mediciones del archivo (tree=None si se omitió)."""
+        self._update_peak()
+        return {
+            "file": self.file_path,
+            "wall": time.perf_counter() - self._start,
+            "parse": self.parse_time,
+            "nodes": sum(1 for _ in ast.walk(tree)) if tree is not None else 0,
+            "peak": self._peak if self.trace_memory else None,
+            "detectors": self.detectors,
+        }
+
+    def _timed(self, method, stats, counts_nodes=False):
+        perf_counter = time.perf_counter
+
+        if not self.trace_memory:
+            def timed(*args):
+                start = perf_counter()
+                try:
+                    return method(*args)
+                finally:
+                    stats[WALL] += perf_counter() - start
+                    stats[CALLS] += 1
+                    stats[NODES] += counts_nodes
+            return timed
+
+        def traced(*args):
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            start = perf_counter()
+            try:
+                return method(*args)
+            finally:
+                stats[WALL] += perf_counter() - start
+                stats[CALLS] += 1
+                stats[NODES] += counts_nodes
+                peak = tracemalloc.get_traced_memory()[1]
+                stats[PEAK] = max(stats[PEAK], peak - before)
+                self._peak = max(self._peak, peak - self._baseline)
+        return traced
+
+    def _update_peak(self):
+        if self.trace_memory:
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1] - self._baseline)
+
+
+class AnalysisProfiler:
+    """
+    Agrega las mediciones de una ejecución de run_project_analysis().
+
+    trace_memory: medir también picos de memoria con tracemalloc (mucho más
+    lento; los tiempos con esta opción no son comparables con los normales).
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.detectors = {}   # nombre -> [tiempo, llamadas, nodos, pico, archivos]
+        self.files = []       # mediciones de FileProfile.finish()
+        self.phases = {}      # nombre -> segundos
+        self.cached_files = 0
+        self.wall = 0.0
+        self._start = None
+        self._started_tracing = False
+
+    def start(self):
+        self._start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        if self._start is not None:
+            self.wall += time.perf_counter() - self._start
+            self._start = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name):
+        """Mide una fase del análisis que no pertenece a un archivo."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def add_file(self, file_profile):
+        """Agrega las mediciones de un archivo (None = servido desde la caché)."""
+        if file_profile is None:
+            self.cached_files += 1
+            return
+
+        self.files.append(file_profile)
+
+        for name, stats in file_profile["detectors"].items():
+            total = self.detectors.setdefault(name, [0.0, 0, 0, 0, 0])
+            total[WALL] += stats[WALL]
+            total[CALLS] += stats[CALLS]
+            total[NODES] += stats[NODES]
+            total[PEAK] = max(total[PEAK], stats[PEAK])
+            total[FILES] += 1
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Informe
+    # ──────────────────────────────────────────────────────────────────────
+
+    def to_dict(self, limit=None):
+        """Informe completo (limit: archivos más lentos incluidos; None = todos)."""
+        detectors = sorted(self.detectors.items(), key=lambda item: item[1][WALL], reverse=True)
+        files = sorted(self.files, key=lambda entry: entry["wall"], reverse=True)
+
+        # si el análisis se interrumpió, el tiempo llega hasta ahora
+        wall = self.wall
+        if self._start is not None:
+            wall += time.perf_counter() - self._start
+
+        return {
+            "wall": wall,
+            "analyzed_files": len(self.files),
+            "cached_files": self.cached_files,
+            "trace_memory": self.trace_memory,
+            "phases": self.phases,
+            "detectors": [
+                {
+                    "name": name,
+                    "wall": stats[WALL],
+                    "calls": stats[CALLS],
+                    "nodes": stats[NODES],
+                    "peak": stats[PEAK] if self.trace_memory else None,
+                    "files": stats[FILES],
+                }
+                for name, stats in detectors
+            ],
+            "files": [
+                {
+                    "file": entry["file"],
+                    "wall": entry["wall"],
+                    "parse": entry["parse"],
+                    "nodes": entry["nodes"],
+                    "peak": entry["peak"],
+                    "slowest_detector": max(
+                        entry["detectors"].items(),
+                        key=lambda item: item[1][WALL], default=(None,)
+                    )[0],
+                }
+                for entry in files[:limit]
+            ],
+        }
+
+    def save(self, path):
+        """Escribe el informe completo en JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def format_table(self, limit=DEFAULT_TOP):
+        """Tabla de texto con los detectores y archivos más lentos."""
+        report = self.to_dict(limit)
+        detector_total = sum(entry["wall"] for entry in report["detectors"]) or 1.0
+
+        lines = [
+            f"⏱  PERFIL DEL ANÁLISIS ({report['wall']:.2f}s, "
+            f"{report['analyzed_files']} archivos analizados, {report['cached_files']} desde caché)",
+            "",
+            f"{'Detector':<32} {'Tiempo':>9} {'%':>6} {'Llamadas':>10} {'Nodos':>10} {'Pico':>9}",
+        ]
+        for entry in report["detectors"][:limit]:
+            lines.append(
+                f"{entry['name'][:32]:<32} {entry['wall']:>8.3f}s "
+                f"{100 * entry['wall'] / detector_total:>5.1f}% "
+                f"{entry['calls']:>10} {entry['nodes']:>10} {_format_bytes(entry['peak']):>9}"
+            )
+
+        root = _common_root([entry["file"] for entry in report["files"]])
+
+        lines += ["", f"{'Archivo':<40} {'Tiempo':>9} {'Parseo':>9} {'Nodos':>8} {'Pico':>9}  Detector más lento"]
+        for entry in report["files"]:
+            lines.append(
+                f"{_short_path(entry['file'], root, 40):<40} {entry['wall']:>8.3f}s {entry['parse']:>8.3f}s "
+                f"{entry['nodes']:>8} {_format_bytes(entry['peak']):>9}  {entry['slowest_detector'] or '-'}"
+            )
+
+        if report["phases"]:
+            lines.append("")
+            for name, seconds in report["phases"].items():
+                lines.append(f"Fase {name}: {seconds:.3f}s")
+
+        return "\n".join(lines)
+
+
+def _format_bytes(size):
+    if size is None:
+        return "-"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.0f} KB"
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def _common_root(paths):
+    """Carpeta común de las rutas, para mostrarlas relativas a ella."""
+    try:
+        root = os.path.commonpath(paths)
+    except ValueError:
+        return None
+    # con un solo archivo (o todos iguales) la ruta común es el propio archivo
+    return os.path.dirname(root) if root in paths else root
+
+
+def _short_path(path, root, width):
+    if root:
+        path = os.path.relpath(path, root)
+    return path if len(path) <= width else "…" + path[-(width - 1):]
@@ -1,88 +1,101 @@
 import ast
-import hashlib
 import os
 
 from ..core.models import AdvancedFinding, Severity, Category
+from .ast_dispatch import DetectorPlugin, dispatch
+from .ast_fingerprint import Fingerprinter
 
 
 GLOBAL_BLOCK_HASHES = {}
 
 
-class ASTNormalizer(ast.NodeTransformer):
+def detect_duplicate_blocks(tree, file_path, lines):
 
-    def visit_Name(self, node):
-        return ast.copy_location(ast.Name(id="var", ctx=node.ctx), node)
+    return resolve_duplicate_blocks(
+        collect_block_hashes(tree, file_path, lines)
+    )
 
-    def visit_arg(self, node):
-        node.arg = "param"
-        return node
 
-    def visit_FunctionDef(self, node):
-        node.name = "func"
-        self.generic_visit(node)
-        return node
+class BlockHashCollector(DetectorPlugin):
+    """
+    Calcula los hashes estructurales de los bloques de un archivo
+    sin tocar el registro global (seguro para procesos worker).
+    """
 
+    node_types = (ast.If, ast.For, ast.While, ast.With, ast.Try)
 
-def structural_hash(node):
+    def __init__(self, file_path, lines, fingerprinter=None):
+        super().__init__(file_path, lines)
+        self.fingerprinter = fingerprinter or Fingerprinter()
+        self.entries = []
 
-    normalizer = ASTNormalizer()
+    def enter(self, node, depth):
 
-    try:
-        normalized = normalizer.visit(ast.parse(ast.unparse(node)))
-        normalized = ast.fix_missing_locations(normalized)
+        # ignorar bloques muy pequeños
+        if len(node.body) < 2:
+            return
 
-        return hashlib.blake2b(
-            ast.dump(normalized, annotate_fields=False).encode(),
-            digest_size=16
-        ).hexdigest()
+        block_hash = self.fingerprinter.fingerprint(node)
 
-    except Exception:
-        return None
+        self.entries.append((depth, len(self.entries), {
+            "hash": block_hash,
+            "file": self.file_path,
+            "line": node.lineno,
+            "snippet": self.lines[node.lineno - 1].strip()
+        }))
 
+    def hashes(self):
+        """Entradas en el mismo orden que ast.walk() (por niveles)."""
+        if self.failed:
+            return []
+        return [entry for _, _, entry in sorted(self.entries, key=lambda e: e[:2])]
 
-def detect_duplicate_blocks(tree, file_path, lines):
 
-    findings = []
+def collect_block_hashes(tree, file_path, lines):
+    """Calcula los hashes de un archivo sin tocar el registro global."""
 
-    for node in ast.walk(tree):
+    collector = BlockHashCollector(file_path, lines)
+    dispatch(tree, [collector])
 
-        if isinstance(node, (ast.If, ast.For, ast.While, ast.With, ast.Try)):
+    return collector.hashes()
 
-            # ignorar bloques muy pequeños
-            if len(node.body) < 2:
-                continue
 
-            block_hash = structural_hash(node)
+def resolve_duplicate_blocks(entries):
+    """
+    Compara los hashes recolectados contra GLOBAL_BLOCK_HASHES.
+    Debe llamarse en orden de archivo para que el resultado sea determinista.
+    """
+
+    findings = []
 
-            if not block_hash:
-                continue
+    for entry in entries:
 
-            if block_hash in GLOBAL_BLOCK_HASHES:
+        block_hash = entry["hash"]
 
-                original = GLOBAL_BLOCK_HASHES[block_hash]
+        if block_hash in GLOBAL_BLOCK_HASHES:
 
-                snippet = lines[node.lineno - 1].strip()
+            original = GLOBAL_BLOCK_HASHES[block_hash]
 
-                findings.append(
-                    AdvancedFinding(
-                        severity=Severity.MAJOR,
-                        category=Category.CODE_SMELL,
-                        message=(
-                            f"Bloque de código duplicado similar a "
-                            f"{os.path.basename(original['file'])}:{original['line']}"
-                        ),
-                        file=file_path,
-                        line=node.lineno,
-                        suggestion="Extraer este bloque en una función reutilizable.",
-                        code_snippet=snippet
-                    )
+            findings.append(
+                AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.CODE_SMELL,
+                    message=(
+                        f"Bloque de código duplicado similar a "
+                        f"{os.path.basename(original['file'])}:{original['line']}"
+                    ),
+                    file=entry["file"],
+                    line=entry["line"],
+                    suggestion="Extraer este bloque en una función reutilizable.",
+                    code_snippet=entry["snippet"]
                 )
+            )
 
-            else:
+        else:
 
-                GLOBAL_BLOCK_HASHES[block_hash] = {
-                    "file": file_path,
-                    "line": node.lineno
-                }
+            GLOBAL_BLOCK_HASHES[block_hash] = {
+                "file": entry["file"],
+                "line": entry["line"]
+            }
 
-    return findings
\ No newline at end of file
+    return findings
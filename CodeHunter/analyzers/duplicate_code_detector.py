@@ -1,83 +1,103 @@
 import ast
 import os
-import hashlib
 
 from ..core.models import AdvancedFinding, Severity, Category
+from .ast_dispatch import DetectorPlugin, dispatch
+from .ast_fingerprint import Fingerprinter
 
 GLOBAL_FUNCTION_HASHES = {}
 
 
-class ASTNormalizer(ast.NodeTransformer):
+def detect_duplicate_functions(tree, file_path, lines):
 
-    def visit_Name(self, node):
-        return ast.copy_location(ast.Name(id="var", ctx=node.ctx), node)
+    return resolve_duplicate_functions(
+        collect_function_hashes(tree, file_path, lines)
+    )
 
-    def visit_arg(self, node):
-        node.arg = "param"
-        return node
 
-    def visit_FunctionDef(self, node):
-        node.name = "func"
-        self.generic_visit(node)
-        return node
+class FunctionHashCollector(DetectorPlugin):
+    """
+    Calcula los hashes estructurales de las funciones de un archivo
+    sin tocar el registro global (seguro para procesos worker).
+    """
 
+    node_types = (ast.FunctionDef,)
 
-def structural_hash(node):
+    def __init__(self, file_path, lines, fingerprinter=None):
+        super().__init__(file_path, lines)
+        self.fingerprinter = fingerprinter or Fingerprinter()
+        self.entries = []
 
-    normalizer = ASTNormalizer()
+    def enter(self, node, depth):
 
-    node_copy = ast.fix_missing_locations(
-        normalizer.visit(ast.parse(ast.unparse(node)))
-    )
+        # ignorar funciones muy pequeñas
+        if len(node.body) < 3:
+            return
 
-    return hashlib.blake2b(
-        ast.dump(node_copy, annotate_fields=False).encode(),
-        digest_size=16
-    ).hexdigest()
+        func_hash = self.fingerprinter.fingerprint(node)
 
+        self.entries.append((depth, len(self.entries), {
+            "hash": func_hash,
+            "name": node.name,
+            "file": self.file_path,
+            "line": node.lineno,
+            "snippet": self.lines[node.lineno - 1].strip()
+        }))
 
-def detect_duplicate_functions(tree, file_path, lines):
+    def hashes(self):
+        """Entradas en el mismo orden que ast.walk() (por niveles)."""
+        if self.failed:
+            return []
+        return [entry for _, _, entry in sorted(self.entries, key=lambda e: e[:2])]
 
-    findings = []
 
-    for node in ast.walk(tree):
+def collect_function_hashes(tree, file_path, lines):
+    """Calcula los hashes de un archivo sin tocar el registro global."""
 
-        if isinstance(node, ast.FunctionDef):
+    collector = FunctionHashCollector(file_path, lines)
+    dispatch(tree, [collector])
 
-            # ignorar funciones muy pequeñas
-            if len(node.body) < 3:
-                continue
+    return collector.hashes()
+
+
+def resolve_duplicate_functions(entries):
+    """
+    Compara los hashes recolectados contra GLOBAL_FUNCTION_HASHES.
+    Debe llamarse en orden de archivo para que el resultado sea determinista.
+    """
+
+    findings = []
 
-            func_hash = structural_hash(node)
+    for entry in entries:
 
-            if func_hash in GLOBAL_FUNCTION_HASHES:
+        func_hash = entry["hash"]
 
-                original = GLOBAL_FUNCTION_HASHES[func_hash]
+        if func_hash in GLOBAL_FUNCTION_HASHES:
 
-                snippet = lines[node.lineno - 1].strip()
+            original = GLOBAL_FUNCTION_HASHES[func_hash]
 
-                findings.append(
-                    AdvancedFinding(
-                        severity=Severity.MAJOR,
-                        category=Category.CODE_SMELL,
-                        message=(
-                            f"Función duplicada '{node.name}' "
-                            f"similar a '{original['name']}' "
-                            f"({os.path.basename(original['file'])})"
-                        ),
-                        file=file_path,
-                        line=node.lineno,
-                        suggestion="Extraer lógica común en función reutilizable.",
-                        code_snippet=snippet
-                    )
+            findings.append(
+                AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.CODE_SMELL,
+                    message=(
+                        f"Función duplicada '{entry['name']}' "
+                        f"similar a '{original['name']}' "
+                        f"({os.path.basename(original['file'])})"
+                    ),
+                    file=entry["file"],
+                    line=entry["line"],
+                    suggestion="Extraer lógica común en función reutilizable.",
+                    code_snippet=entry["snippet"]
                 )
+            )
 
-            else:
+        else:
 
-                GLOBAL_FUNCTION_HASHES[func_hash] = {
-                    "name": node.name,
-                    "file": file_path,
-                    "line": node.lineno
-                }
+            GLOBAL_FUNCTION_HASHES[func_hash] = {
+                "name": entry["name"],
+                "file": entry["file"],
+                "line": entry["line"]
+            }
 
-    return findings
\ No newline at end of file
+    return findings
@@ -5,12 +5,35 @@ Detecta archivos Python vacíos y carpetas realmente vacías.
 
 import os
 from .function_analyzer import Finding
-from ..utils.project_walker import walk_project, IGNORE_DIRS
+from ..utils.project_walker import walk_project, get_manifest
+from ..core.parsed_project import load_parsed_file
 
 
-def detect_empty_python_files(project_path):
-    """Detecta archivos .py sin código útil (vacíos o solo con imports)."""
+def is_empty_python_source(content):
+    """True si el código no tiene nada útil (vacío, solo comentarios o imports)."""
+    lines = [
+        line for line in content.strip().splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    ]
+
+    only_imports = bool(lines) and all(
+        line.startswith("import") or line.startswith("from")
+        for line in lines
+    )
+
+    return not lines or only_imports
+
+
+def detect_empty_python_files(project_path, file_facts=None, parsed=None):
+    """
+    Detecta archivos .py sin código útil (vacíos o solo con imports).
+
+    file_facts: hechos por archivo de un análisis previo (ver
+    detect_circular_imports); los archivos incluidos no se vuelven a leer.
+    parsed: ParsedProject compartido para el resto de archivos.
+    """
     findings = []
+    file_facts = file_facts or {}
 
     for root, files in walk_project(project_path):
         for file in files:
@@ -20,23 +43,23 @@ def detect_empty_python_files(project_path):
                 continue
 
             path = os.path.join(root, file)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    content = f.read().strip()
-            except Exception:
-                continue
 
-            lines = [
-                line for line in content.splitlines()
-                if line.strip() and not line.strip().startswith("#")
-            ]
+            if path in file_facts:
+                facts = file_facts[path]
+                if facts is None:
+                    continue
+                empty = facts["empty"]
 
-            only_imports = bool(lines) and all(
-                line.startswith("import") or line.startswith("from")
-                for line in lines
-            )
+            else:
+                try:
+                    parsed_file = load_parsed_file(path, parsed)
+                except Exception:
+                    continue
+                if not parsed_file.is_utf8:
+                    continue
+                empty = is_empty_python_source(parsed_file.source)
 
-            if not lines or only_imports:
+            if empty:
                 findings.append(Finding(
                     level="WARNING",
                     message="Archivo Python vacío o sin código útil",
@@ -51,19 +74,14 @@ def detect_empty_python_files(project_path):
 def detect_empty_folders(project_path):
     """
     Detecta carpetas completamente vacías (sin archivos ni subcarpetas),
-    respetando las exclusiones de project_walker.
+    sin entrar en las carpetas excluidas por project_walker.
     """
     findings = []
 
-    for root, dirs, files in os.walk(project_path):
-        # Aplicar las mismas exclusiones que walk_project
-        dirs[:] = [
-            d for d in dirs
-            if d not in IGNORE_DIRS and not d.endswith(".egg-info")
-        ]
-
-        # Solo reportar si no hay archivos Y no quedan subcarpetas tras filtrar
-        if not files and not dirs:
+    for root, directory in get_manifest(project_path).directories().items():
+        # Se cuentan las entradas del disco: una carpeta con solo archivos
+        # ignorados por .gitignore (p. ej. *.log) no está vacía
+        if not directory.entry_count:
             findings.append(Finding(
                 level="WARNING",
                 message="Carpeta vacía detectada",
@@ -2,12 +2,12 @@ from .project_profiler import build_project_profile
 from .health_calculator import calculate_health
 
 
-def build_full_diagnosis_data(project_path, analysis_data):
+def build_full_diagnosis_data(project_path, analysis_data, parsed=None):
 
     if not analysis_data:
         return None
 
-    profile = build_project_profile(project_path)
+    profile = build_project_profile(project_path, parsed)
     findings = analysis_data.get("findings", [])
 
     # Calcular health usando los findings
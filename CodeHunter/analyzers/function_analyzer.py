@@ -14,7 +14,8 @@ IGNORED_FUNCTIONS = {
 MAX_FUNCTION_LINES = 80
 
 
-def analyze_function(node, file_path, source, findings, function_index):
+def analyze_function(node, file_path, source, findings, function_index, parsed_file=None):
+    # parsed_file: ParsedFile del archivo; evita re-dividir el código por cada función
     if node.name in IGNORED_FUNCTIONS:
         return  # Ignorar métodos especiales
 
@@ -22,7 +23,10 @@ def analyze_function(node, file_path, source, findings, function_index):
     end = getattr(node, "end_lineno", start)
     size = end - start + 1
 
-    body_text = ast.get_source_segment(source, node) or ""
+    if parsed_file is not None:
+        body_text = parsed_file.get_source_segment(node) or ""
+    else:
+        body_text = ast.get_source_segment(source, node) or ""
     body_hash = hash(normalize_code(body_text))
 
     function_index.setdefault(node.name, []).append({
@@ -1,4 +1,4 @@
-from collections import Counter
+from ..core.findings_store import as_findings_store
 
 PENALTIES = {
     "CRITICAL": 20,
@@ -7,10 +7,11 @@ PENALTIES = {
 }
 
 def calculate_health(findings):
-    counts = Counter(
-        f.level.value if hasattr(f.level, "value") else f.level
-        for f in findings
-    )
+    # findings: lista o FindingsStore; se cuenta sobre la columna de niveles
+    counts = {
+        level.value: count
+        for level, count in as_findings_store(findings).count_by_level().items()
+    }
 
     score = 100
     for level, penalty in PENALTIES.items():
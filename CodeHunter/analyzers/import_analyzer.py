@@ -1,7 +1,7 @@
-import sys 
-import importlib.util
 import ast
 
+from .import_classifier import get_import_classifier, STDLIB, FIRST_PARTY, THIRD_PARTY
+
 
 class ImportVisitor(ast.NodeVisitor):
     def __init__(self):
@@ -94,25 +94,36 @@ def detect_unused_imports(tree):
     )
 
 
-def classify_import(name, project_path):
+def classify_import(name, project_path, module_index=None, classifier=None):
+    """
+    Nivel del finding para un import no usado.
+    module_index: ModuleIndex del proyecto; los módulos internos se
+    reconocen sin llamar a find_spec().
+    classifier: ImportClassifier (por defecto el compartido por el proceso).
+    """
+    classifier = classifier or get_import_classifier()
+    category = classifier.classify(name, module_index)
+
     # 1️⃣ Librería estándar
-    if name in sys.builtin_module_names:
+    if category == STDLIB:
         return "INFO"
 
-    spec = importlib.util.find_spec(name)
-
-    if spec is None:
+    # 2️⃣ Interno del proyecto o terceros (según el índice y site-packages)
+    if category in (FIRST_PARTY, THIRD_PARTY):
         return "WARNING"
 
-    module_path = spec.origin or ""
+    module_path = classifier.origin(name)
+
+    if module_path is None:
+        return "WARNING"
 
-    # 2️⃣ Interno del proyecto
+    # 3️⃣ Interno del proyecto
     if project_path in module_path:
         return "WARNING"
 
-    # 3️⃣ Librería estándar instalada
+    # 4️⃣ Librería estándar instalada
     if "site-packages" not in module_path:
         return "INFO"
 
-    # 4️⃣ Terceros
-    return "WARNING"
\ No newline at end of file
+    # 5️⃣ Terceros
+    return "WARNING"
@@ -0,0 +1,218 @@
+"""
+CodeHunter - Clasificación de imports (stdlib / proyecto / terceros)
+Evita llamar a importlib.util.find_spec() por cada import: la librería
+estándar sale de sys.stdlib_module_names, los paquetes de terceros de un
+único escaneo de site-packages y el resto se resuelve una sola vez por
+nombre. La clasificación es compartida por todo el proceso y se puede
+persistir entre ejecuciones.
+"""
+
+import os
+import sys
+import json
+import site
+import logging
+import importlib.util
+
+
+logger = logging.getLogger(__name__)
+
+STDLIB = "stdlib"
+FIRST_PARTY = "first_party"
+THIRD_PARTY = "third_party"
+UNKNOWN = "unknown"
+
+CLASSIFICATION_FILE_NAME = "imports.json"
+CLASSIFICATION_FORMAT = 2
+
+SITE_DIR_NAMES = ("site-packages", "dist-packages")
+# Solo los paquetes de site-packages son THIRD_PARTY (WARNING); los de
+# dist-packages (Debian/Ubuntu) se resuelven con find_spec y, como antes,
+# classify_import() los trata como instalados con el sistema (INFO)
+THIRD_PARTY_DIR_NAME = "site-packages"
+MODULE_SUFFIXES = (".py", ".pyc", ".pyd", ".so")
+
+
+class ImportClassifier:
+    """
+    Clasificación memoizada de nombres de módulo de nivel superior.
+
+    Para los nombres que no son stdlib ni están en site-packages se guarda
+    el origen que reporta find_spec() (None si no existe), que es lo que
+    necesita classify_import() para decidir el nivel.
+    """
+
+    def __init__(self):
+        self._stdlib = set(sys.builtin_module_names) | set(getattr(sys, "stdlib_module_names", ()))
+        self._third_party = None
+        self._origins = {}
+        self._dirty = False
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Clasificación
+    # ──────────────────────────────────────────────────────────────────────
+
+    def classify(self, name, module_index=None):
+        """STDLIB, FIRST_PARTY (según module_index), THIRD_PARTY o UNKNOWN."""
+        top_level = name.split(".")[0]
+
+        if top_level in self._stdlib:
+            return STDLIB
+
+        if module_index is not None and module_index.is_first_party(top_level):
+            return FIRST_PARTY
+
+        if top_level in self.third_party_names():
+            return THIRD_PARTY
+
+        return UNKNOWN
+
+    def origin(self, name):
+        """spec.origin de find_spec(name), calculado una sola vez por nombre."""
+        if name not in self._origins:
+            try:
+                spec = importlib.util.find_spec(name)
+            except (ImportError, ValueError):
+                spec = None
+
+            self._origins[name] = (spec.origin or "") if spec is not None else None
+            self._dirty = True
+
+        return self._origins[name]
+
+    def third_party_names(self):
+        """Módulos de nivel superior instalados en site-packages (un solo escaneo)."""
+        if self._third_party is None:
+            self._third_party = _scan_site_packages(
+                directory for directory in site_directories()
+                if THIRD_PARTY_DIR_NAME in directory
+            )
+            self._dirty = True
+        return self._third_party
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Persistencia
+    # ──────────────────────────────────────────────────────────────────────
+
+    def load(self, cache_dir):
+        """Carga una clasificación guardada si corresponde al mismo entorno."""
+        path = os.path.join(cache_dir, CLASSIFICATION_FILE_NAME)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        if data.get("format") != CLASSIFICATION_FORMAT or data.get("environment") != environment_key():
+            return False
+
+        self._third_party = set(data.get("third_party", []))
+        self._origins.update(data.get("origins", {}))
+        self._dirty = False
+        return True
+
+    def save(self, cache_dir):
+        if not self._dirty:
+            return
+
+        path = os.path.join(cache_dir, CLASSIFICATION_FILE_NAME)
+
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": CLASSIFICATION_FORMAT,
+                    "environment": environment_key(),
+                    "third_party": sorted(self.third_party_names()),
+                    "origins": self._origins,
+                }, f)
+
+            os.replace(tmp_path, path)
+
+        except OSError as e:
+            logger.warning(f"[ImportClassifier] No se pudo guardar la clasificación en {cache_dir}: {e}")
+            return
+
+        self._dirty = False
+
+
+_DEFAULT_CLASSIFIER = ImportClassifier()
+
+
+def get_import_classifier():
+    """Clasificador compartido por todo el proceso."""
+    return _DEFAULT_CLASSIFIER
+
+
+def site_directories():
+    """Carpetas de paquetes instalados (site-packages / dist-packages)."""
+    directories = []
+
+    try:
+        directories.extend(site.getsitepackages())
+    except AttributeError:
+        pass
+
+    user_site = getattr(site, "getusersitepackages", lambda: None)()
+    if user_site:
+        directories.append(user_site)
+
+    directories.extend(
+        path for path in sys.path
+        if os.path.basename(path) in SITE_DIR_NAMES
+    )
+
+    unique = []
+    for directory in directories:
+        if directory not in unique and os.path.isdir(directory):
+            unique.append(directory)
+    return unique
+
+
+def environment_key():
+    """Identifica el intérprete y el estado de site-packages (mtime de las carpetas)."""
+    stamps = []
+    for directory in site_directories():
+        try:
+            stamps.append([directory, os.stat(directory).st_mtime_ns])
+        except OSError:
+            continue
+
+    return {
+        "executable": sys.executable,
+        "version": sys.version,
+        "path": sys.path,
+        "sites": stamps,
+    }
+
+
+def _scan_site_packages(directories):
+    names = set()
+
+    for directory in directories:
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                name = entry.name
+
+                if name.startswith(".") or name == "__pycache__":
+                    continue
+
+                if name.endswith((".dist-info", ".egg-info", ".pth")):
+                    continue
+
+                if entry.is_dir():
+                    if name.isidentifier():
+                        names.add(name)
+
+                elif name.endswith(MODULE_SUFFIXES):
+                    names.add(name.split(".")[0])
+
+    return names
@@ -0,0 +1,303 @@
+"""
+Near Duplicate Detector - Clones casi idénticos (Tipo 3) con MinHash/LSH
+Cada función se convierte en una secuencia de tokens del AST normalizado
+(sin identificadores), se trocea en shingles y se resume en una firma
+MinHash de una sola permutación (one permutation hashing con
+densificación por rotación: un hash por shingle en lugar de uno por
+shingle y permutación). Las firmas se agrupan en cubetas LSH por bandas,
+así que solo se comparan funciones que comparten alguna banda.
+Los pares similares se unen en grupos (por transitividad: dos miembros de
+un grupo pueden no ser similares entre sí) y se reporta un finding por grupo.
+"""
+
+import ast
+import os
+import zlib
+from functools import lru_cache
+
+from ..core.models import AdvancedFinding, Severity, Category
+from .ast_dispatch import DetectorPlugin, dispatch
+from .ast_fingerprint import Fingerprinter
+
+
+SIGNATURE_BITS = 6
+SIGNATURE_SIZE = 1 << SIGNATURE_BITS
+SHINGLE_SIZE = 5
+MIN_CLONE_TOKENS = 40
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+MAX_NAMES_IN_MESSAGE = 5
+
+_MASK_64 = (1 << 64) - 1
+_VALUE_BITS = 64 - SIGNATURE_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+# Base del hash de los shingles (primo FNV de 64 bits)
+_SHINGLE_BASE = 0x100000001B3
+
+_TOKEN_IDS = {}
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Firmas (por archivo, seguro para procesos worker)
+# ──────────────────────────────────────────────────────────────────────
+
+class NearCloneCollector(DetectorPlugin):
+    """Calcula la firma MinHash de cada función suficientemente grande."""
+
+    node_types = (ast.FunctionDef,)
+
+    def __init__(self, file_path, lines, fingerprinter=None):
+        super().__init__(file_path, lines)
+        self.fingerprinter = fingerprinter or Fingerprinter()
+        self.entries = []
+
+    def enter(self, node, depth):
+
+        tokens = function_tokens(node)
+
+        if len(tokens) < MIN_CLONE_TOKENS:
+            return
+
+        self.entries.append({
+            "signature": minhash_signature(tokens),
+            "hash": self.fingerprinter.fingerprint(node),
+            "name": node.name,
+            "file": self.file_path,
+            "line": node.lineno,
+            "snippet": self.lines[node.lineno - 1].strip()
+        })
+
+    def hashes(self):
+        return [] if self.failed else self.entries
+
+
+def collect_clone_signatures(tree, file_path, lines):
+    """Calcula las firmas de un archivo (sin estado global)."""
+
+    collector = NearCloneCollector(file_path, lines)
+    dispatch(tree, [collector])
+
+    return collector.hashes()
+
+
+def function_tokens(node):
+    """
+    Secuencia de tokens del subárbol en pre-orden: tipos de nodo y tipos de
+    constante. Los identificadores y el contexto Load/Store se descartan.
+    """
+
+    tokens = []
+    stack = [node]
+
+    while stack:
+        current = stack.pop()
+
+        if isinstance(current, ast.expr_context):
+            continue
+
+        token = type(current).__name__
+        if isinstance(current, ast.Constant):
+            token += ":" + type(current.value).__name__
+
+        tokens.append(_token_id(token))
+
+        children = list(ast.iter_child_nodes(current))
+        children.reverse()
+        stack.extend(children)
+
+    return tokens
+
+
+def _token_id(token):
+    token_id = _TOKEN_IDS.get(token)
+    if token_id is None:
+        token_id = _TOKEN_IDS[token] = zlib.crc32(token.encode())
+    return token_id
+
+
+def minhash_signature(tokens):
+    """
+    Firma MinHash (SIGNATURE_SIZE enteros) de los shingles de la secuencia.
+    Los bits altos del hash eligen la posición y se guarda el mínimo de los
+    bits bajos; las posiciones vacías copian la siguiente ocupada.
+    """
+
+    shingles = set(_shingle_hashes(tokens))
+
+    bins = [None] * SIGNATURE_SIZE
+
+    for shingle in shingles:
+        mixed = (shingle * _GOLDEN) & _MASK_64
+        position = mixed >> _VALUE_BITS
+        value = mixed & _VALUE_MASK
+        current = bins[position]
+        if current is None or value < current:
+            bins[position] = value
+
+    return _densify(bins)
+
+
+def _shingle_hashes(tokens):
+    """
+    Hash polinómico de 64 bits de cada shingle. No usa hash(): las firmas
+    se guardan en la caché de resultados y deben ser iguales en cualquier
+    versión de Python y ancho de puntero.
+    """
+    hashes = [0] * max(0, len(tokens) - SHINGLE_SIZE + 1)
+    for offset in range(SHINGLE_SIZE):
+        hashes = [(h * _SHINGLE_BASE + token) & _MASK_64
+                  for h, token in zip(hashes, tokens[offset:])]
+    return hashes
+
+
+def _densify(bins):
+    """Rellena las posiciones vacías rotando hacia la derecha (con desplazamiento)."""
+
+    if all(value is None for value in bins):
+        return [0] * SIGNATURE_SIZE
+
+    signature = list(bins)
+
+    for position, value in enumerate(bins):
+        if value is not None:
+            continue
+        distance = 1
+        while bins[(position + distance) % SIGNATURE_SIZE] is None:
+            distance += 1
+        borrowed = bins[(position + distance) % SIGNATURE_SIZE]
+        signature[position] = borrowed + (distance << _VALUE_BITS)
+
+    return signature
+
+
+# ──────────────────────────────────────────────────────────────────────
+# Índice LSH y agrupación (global, después de combinar los archivos)
+# ──────────────────────────────────────────────────────────────────────
+
+def resolve_near_duplicates(entries, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """
+    Agrupa las funciones conectadas por pares con similitud estimada >=
+    threshold y retorna un finding por grupo. Los grupos formados solo por
+    copias exactas se omiten (ya los reporta duplicate_code_detector).
+    """
+
+    clusters = find_clone_clusters(entries, threshold)
+    findings = []
+
+    for cluster in clusters:
+
+        members = [entries[i] for i in cluster]
+
+        if len({member["hash"] for member in members}) == 1:
+            continue
+
+        first = members[0]
+        names = ", ".join(
+            f"'{m['name']}' ({os.path.basename(m['file'])}:{m['line']})"
+            for m in members[:MAX_NAMES_IN_MESSAGE + 1]
+        )
+        if len(members) > MAX_NAMES_IN_MESSAGE + 1:
+            names += f" y {len(members) - MAX_NAMES_IN_MESSAGE - 1} más"
+
+        findings.append(
+            AdvancedFinding(
+                severity=Severity.MINOR,
+                category=Category.CODE_SMELL,
+                message=(
+                    f"Grupo de {len(members)} funciones casi duplicadas, "
+                    f"conectadas por similitud >= {threshold:.0%}: {names}"
+                ),
+                file=first["file"],
+                line=first["line"],
+                suggestion="Unificar la lógica común en una función parametrizada.",
+                code_snippet=first["snippet"]
+            )
+        )
+
+    return findings
+
+
+def find_clone_clusters(entries, threshold=DEFAULT_SIMILARITY_THRESHOLD):
+    """
+    Retorna los grupos (listas de índices ordenadas) de tamaño >= 2: las
+    componentes conexas del grafo de pares similares, no grupos en los que
+    todos los pares lo sean.
+
+    Dentro de cada cubeta cada firma se compara solo con la primera y la
+    anterior, así que el coste es lineal en el tamaño de las cubetas. Es
+    una concesión de exhaustividad: un par similar de la misma cubeta que
+    no sea (primera, x) ni consecutivo solo se une si otra comparación o
+    banda lo conecta.
+    """
+
+    bands, rows = lsh_parameters(threshold)
+    parent = list(range(len(entries)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(i, j):
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            return
+        if estimated_similarity(entries[i]["signature"], entries[j]["signature"]) >= threshold:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    for band in range(bands):
+        start = band * rows
+        buckets = {}
+
+        for index, entry in enumerate(entries):
+            key = tuple(entry["signature"][start:start + rows])
+            buckets.setdefault(key, []).append(index)
+
+        for members in buckets.values():
+            for position in range(1, len(members)):
+                union(members[0], members[position])
+                union(members[position - 1], members[position])
+
+    groups = {}
+    for index in range(len(entries)):
+        groups.setdefault(find(index), []).append(index)
+
+    return sorted(group for group in groups.values() if len(group) > 1)
+
+
+def estimated_similarity(signature_a, signature_b):
+    """Estimación de Jaccard: fracción de posiciones iguales."""
+    equal = sum(1 for a, b in zip(signature_a, signature_b) if a == b)
+    return equal / len(signature_a)
+
+
+@lru_cache(maxsize=None)
+def lsh_parameters(threshold, signature_size=SIGNATURE_SIZE):
+    """
+    Elige (bandas, filas) con bandas * filas <= signature_size minimizando la suma
+    de falsos positivos (por debajo del umbral) y falsos negativos (por encima).
+    """
+
+    def probability(s, bands, rows):
+        return 1 - (1 - s ** rows) ** bands
+
+    def area(low, high, bands, rows, negate, steps=100):
+        width = (high - low) / steps
+        total = 0.0
+        for step in range(steps):
+            s = low + (step + 0.5) * width
+            p = probability(s, bands, rows)
+            total += (1 - p if negate else p) * width
+        return total
+
+    best = None
+
+    for bands in range(1, signature_size + 1):
+        for rows in range(1, signature_size // bands + 1):
+            error = (area(0.0, threshold, bands, rows, False)
+                     + area(threshold, 1.0, bands, rows, True))
+            if best is None or error < best[0]:
+                best = (error, bands, rows)
+
+    return best[1], best[2]
@@ -2,6 +2,7 @@ import os
 import ast
 from collections import Counter
 from ..utils.project_walker import walk_project
+from ..core.parsed_project import load_parsed_file
 
 
 # 🔎 Palabras clave estratégicas
@@ -20,7 +21,8 @@ FRAMEWORK_KEYWORDS = {
 }
 
 
-def build_project_profile(project_path):
+def build_project_profile(project_path, parsed=None):
+    """parsed: ParsedProject opcional con los archivos ya leídos y parseados."""
 
     project_name = os.path.basename(project_path)
 
@@ -38,10 +40,7 @@ def build_project_profile(project_path):
             file_path = os.path.join(root, file)
 
             try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-
-                tree = ast.parse(content)
+                tree = load_parsed_file(file_path, parsed).parse()
 
             except Exception:
                 continue
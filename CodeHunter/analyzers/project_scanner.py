@@ -3,26 +3,47 @@ import ast
 from ..file_scanner import build_project_tree  # ← AGREGAR AQUÍ
 from ..core.models import Finding
 from ..utils.project_walker import walk_project
+from ..utils.module_index import get_module_index
+from ..core.parsed_project import load_parsed_file
 
 from .import_analyzer import detect_unused_imports, classify_import
+from .import_classifier import get_import_classifier
 from .function_analyzer import analyze_function, detect_duplicate_functions
 
 
-def scan_project(project_path):
-    """Escanea el proyecto buscando problemas de código"""
+def scan_project(project_path, cache_dir=None, parsed=None):
+    """
+    Escanea el proyecto buscando problemas de código
+
+    cache_dir: si se indica, la clasificación de imports (stdlib / terceros)
+    se carga y se guarda ahí para reutilizarla entre ejecuciones.
+    parsed: ParsedProject compartido con el resto de analizadores.
+    """
     findings = []
     function_index = {}
 
-    for root, files in walk_project(project_path):
-        for file in files:
-            if not file.endswith(".py"):
-                continue
+    classifier = get_import_classifier()
+    if cache_dir:
+        classifier.load(cache_dir)
+
+    file_paths = [
+        os.path.join(root, file)
+        for root, files in walk_project(project_path)
+        for file in files
+        if file.endswith(".py")
+    ]
+
+    # índice de módulos compartido por todos los archivos (sin stat por import)
+    module_index = get_module_index(project_path)
 
-            file_path = os.path.join(root, file)
-            analyze_file(file_path, findings, function_index, project_path)
+    for file_path in file_paths:
+        analyze_file(file_path, findings, function_index, project_path, module_index, parsed)
 
     detect_duplicate_functions(function_index, findings)
 
+    if cache_dir:
+        classifier.save(cache_dir)
+
     return findings
 
 
@@ -31,20 +52,20 @@ def scan_project_structure(project_path):
     return build_project_tree(project_path)
 
 
-def analyze_file(file_path, findings, function_index, project_path):
+def analyze_file(file_path, findings, function_index, project_path, module_index=None,
+                 parsed=None):
     """Analiza un archivo individual"""
 
     try:
-        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-            source = f.read()
-
-        tree = ast.parse(source)
+        parsed_file = load_parsed_file(file_path, parsed)
+        source = parsed_file.source
+        tree = parsed_file.parse()
 
         # 🔍 1️⃣ Detectar imports no usados
         unused_imports, duplicate_imports, imports_inside_functions, type_hint_only, wildcard_imports = detect_unused_imports(tree)
 
         for imp, line in unused_imports:
-            level = classify_import(imp, project_path)
+            level = classify_import(imp, project_path, module_index)
 
             findings.append(Finding(
                 level,
@@ -93,7 +114,7 @@ def analyze_file(file_path, findings, function_index, project_path):
         # 🔍 2️⃣ Analizar funciones
         for node in ast.walk(tree):
             if isinstance(node, ast.FunctionDef):
-                analyze_function(node, file_path, source, findings, function_index)
+                analyze_function(node, file_path, source, findings, function_index, parsed_file)
 
     except Exception as e:
         findings.append(Finding(
@@ -8,21 +8,19 @@ import logging
 from typing import List
 from ..core.models import AdvancedFinding, Severity, Category
 from ..utils.project_walker import walk_python_files
+from .ast_dispatch import DetectorPlugin, dispatch
 
 logger = logging.getLogger(__name__)
 
-class SecurityHotspotVisitor(ast.NodeVisitor):
+class SecurityHotspotVisitor(DetectorPlugin):
 
-    def __init__(self, file_path, lines):
+    node_types = (ast.Call, ast.Import)
 
-        self.file_path = file_path
-        self.lines = lines
-        self.findings = []
-
-    def get_snippet(self, line):
-        if line <= len(self.lines):
-            return self.lines[line - 1].strip()
-        return ""
+    def enter(self, node, depth):
+        if isinstance(node, ast.Call):
+            self.visit_Call(node)
+        else:
+            self.visit_Import(node)
 
     def visit_Call(self, node):
 
@@ -73,8 +71,6 @@ class SecurityHotspotVisitor(ast.NodeVisitor):
                         )
                     )
 
-        self.generic_visit(node)
-
     def visit_Import(self, node):
 
         for alias in node.names:
@@ -93,15 +89,15 @@ class SecurityHotspotVisitor(ast.NodeVisitor):
                     )
                 )
 
-        self.generic_visit(node)
-
 
 def run_hotspot_detectors(tree, file_path, lines, config):
 
-    visitor = SecurityHotspotVisitor(file_path, lines)
-    visitor.visit(tree)
+    return dispatch(tree, build_hotspot_plugins(file_path, lines, config))
+
 
-    return visitor.findings
+def build_hotspot_plugins(file_path, lines, config):
+    """Instancia los detectores de hotspots para un recorrido compartido del AST."""
+    return [SecurityHotspotVisitor(file_path, lines)]
 
 
 def detect_random_for_security(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
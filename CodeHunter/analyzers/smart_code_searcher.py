@@ -1,45 +1,72 @@
 import os
 import ast
 from ..utils.project_walker import walk_project
-
-
-def search_code(project_path, query):
-    """Búsqueda inteligente de código - busca solo lo que el usuario escribe"""
+from ..core.parsed_project import load_parsed_file
+from ..infrastructure.trigram_index import get_trigram_index
+from ..infrastructure.symbol_index import get_symbol_index
+from .code_query import parse_query, iter_query
+
+
+def search_code(project_path, query, parsed=None):
+    """
+    Búsqueda inteligente de código - busca solo lo que el usuario escribe
+    parsed: ParsedProject opcional; evita releer los archivos en cada búsqueda
+    """
+    return list(iter_search_code(project_path, query, parsed))
+
+
+def iter_search_code(project_path, query, parsed=None):
+    """
+    Igual que search_code() pero hace yield de cada resultado en cuanto se
+    encuentra (sin duplicados), para mostrarlos de inmediato o cortar antes.
+    Acepta además las consultas re:, call: y def: (ver code_query); lanza
+    ValueError si una de ellas está mal formada.
+    """
     query = query.strip()
-    results = []
+
+    # 0️⃣ Consulta con regex o patrón del AST
+    structured = parse_query(query)
+    if structured is not None:
+        yield from iter_query(project_path, structured, parsed)
+        return
 
     # 1️⃣ Si es una carpeta específica, mostrar archivos
     folder_path = os.path.join(project_path, query)
     if os.path.isdir(folder_path):
-        results.extend(search_in_folder(folder_path))
-        return results  # Solo mostrar contenido de carpeta
+        yield from search_in_folder(folder_path)
+        return  # Solo mostrar contenido de carpeta
 
     # 2️⃣ Si es un keyword estructural exacto (def, class, if, etc.)
     if query.lower() in ["def", "class", "if", "elif", "else", "for", "while", "try", "except", "with", "return", "yield", "import", "from", "lambda", "async", "await"]:
-        results.extend(search_keyword(project_path, query.lower()))
+        results = search_keyword(project_path, query.lower(), parsed)
 
     # 3️⃣ Si es un identificador válido, buscar funciones/clases/variables con ese nombre
     elif is_valid_identifier(query):
-        results.extend(search_definitions(project_path, query))
+        results = search_definitions(project_path, query, parsed)
 
     # 4️⃣ Búsqueda de texto plano (para todo lo demás)
     else:
-        results.extend(search_text(project_path, query))
+        results = iter_search_text(project_path, query, parsed)
 
-    # Si no encontró nada como definición, buscar como texto también
-    if not results:
-        results.extend(search_text(project_path, query))
-
-    # Eliminar duplicados
+    # Eliminar duplicados a medida que llegan
     seen = set()
-    unique_results = []
     for r in results:
         key = (r['file'], r['line'], r['content'])
         if key not in seen:
             seen.add(key)
-            unique_results.append(r)
+            yield r
+
+    # Si no encontró nada como definición, buscar nombres parecidos y como texto
+    if not seen:
+        fallbacks = [iter_search_text(project_path, query, parsed)]
+        if is_valid_identifier(query):
+            fallbacks.insert(0, search_fuzzy(project_path, query, parsed=parsed))
 
-    return unique_results
+        for r in (r for results in fallbacks for r in results):
+            key = (r['file'], r['line'], r['content'])
+            if key not in seen:
+                seen.add(key)
+                yield r
 
 
 def search_in_folder(folder_path):
@@ -59,8 +86,12 @@ def search_in_folder(folder_path):
     return results
 
 
-def search_keyword(project_path, keyword):
-    """Buscar keywords estructurales (def, class, if, return, etc.)"""
+def search_keyword(project_path, keyword, parsed=None, index=None):
+    """
+    Buscar keywords estructurales (def, class, if, return, etc.)
+    index: SymbolIndex del proyecto (por defecto el compartido, persistido en
+    la caché); solo se parsean los archivos modificados desde la última vez.
+    """
     results = []
     
     keyword_map = {
@@ -87,118 +118,112 @@ def search_keyword(project_path, keyword):
     if not node_type:
         return results
 
-    for root, files in walk_project(project_path):
-        for file in files:
-            if not file.endswith(".py"):
-                continue
-
-            path = os.path.join(root, file)
-
-            try:
-                with open(path, encoding="utf-8") as f:
-                    source = f.read()
-                    tree = ast.parse(source)
-                    lines = source.split('\n')
-            except Exception:
-                continue
-
-            for node in ast.walk(tree):
-                if isinstance(node, node_type):
-                    line_num = node.lineno
-                    content = lines[line_num - 1].strip() if line_num <= len(lines) else keyword
-                    
-                    results.append({
-                        "file": path,
-                        "line": line_num,
-                        "content": content,
-                        "type": "keyword"
-                    })
+    node_types = node_type if isinstance(node_type, tuple) else (node_type,)
+
+    index = _refreshed_symbol_index(project_path, parsed, index)
+
+    for symbol in index.statements([t.__name__ for t in node_types]):
+        results.append({
+            "file": symbol["file"],
+            "line": symbol["line"],
+            "content": symbol["content"] if symbol["content"] is not None else keyword,
+            "type": "keyword"
+        })
 
     return results
 
 
-def search_definitions(project_path, name):
-    """Buscar funciones, clases o variables con un nombre específico"""
+def search_definitions(project_path, name, parsed=None, index=None):
+    """
+    Buscar funciones, clases o variables con un nombre específico
+    index: SymbolIndex del proyecto (ver search_keyword)
+    """
     results = []
 
-    for root, files in walk_project(project_path):
-        for file in files:
-            if not file.endswith(".py"):
-                continue
-
-            path = os.path.join(root, file)
-
-            try:
-                with open(path, encoding="utf-8") as f:
-                    source = f.read()
-                    tree = ast.parse(source)
-                    lines = source.split('\n')
-            except Exception:
-                continue
-
-            for node in ast.walk(tree):
-                line_num = None
-                content = None
-                result_type = None
-
-                # Funciones
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
-                    line_num = node.lineno
-                    result_type = "function"
-
-                # Clases
-                elif isinstance(node, ast.ClassDef) and node.name == name:
-                    line_num = node.lineno
-                    result_type = "class"
-
-                # Variables (asignaciones)
-                elif isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and target.id == name:
-                            line_num = node.lineno
-                            result_type = "variable"
-                            break
-
-                if line_num:
-                    content = lines[line_num - 1].strip() if line_num <= len(lines) else name
-                    results.append({
-                        "file": path,
-                        "line": line_num,
-                        "content": content,
-                        "type": result_type
-                    })
+    index = _refreshed_symbol_index(project_path, parsed, index)
+
+    for symbol in index.definitions(name):
+        results.append({
+            "file": symbol["file"],
+            "line": symbol["line"],
+            "content": symbol["content"] if symbol["content"] is not None else name,
+            "type": symbol["kind"]
+        })
 
     return results
 
 
-def search_text(project_path, text):
-    """Búsqueda de texto plano (coincidencia parcial)"""
+def search_fuzzy(project_path, query, limit=20, parsed=None, index=None):
+    """
+    Definiciones con nombre parecido a query (incompleto, con erratas o en
+    otro estilo: gun -> get_user_name), de la más a la menos relevante.
+    Cada resultado incluye name y score además de los campos habituales.
+    index: SymbolIndex del proyecto (ver search_keyword)
+    """
     results = []
 
-    for root, files in walk_project(project_path):
-        for file in files:
-            if not file.endswith(".py"):
-                continue
-
-            path = os.path.join(root, file)
-
-            try:
-                with open(path, encoding="utf-8") as f:
-                    for i, line in enumerate(f, 1):
-                        # Búsqueda case-insensitive
-                        if text.lower() in line.lower():
-                            results.append({
-                                "file": path,
-                                "line": i,
-                                "content": line.strip(),
-                                "type": "text"
-                            })
-            except Exception:
-                continue
+    index = _refreshed_symbol_index(project_path, parsed, index)
+
+    for score, name in index.fuzzy().search(query, limit):
+        for symbol in index.definitions(name):
+            results.append({
+                "file": symbol["file"],
+                "line": symbol["line"],
+                "content": symbol["content"] if symbol["content"] is not None else name,
+                "type": "fuzzy",
+                "name": name,
+                "score": score
+            })
 
     return results
 
 
+def _refreshed_symbol_index(project_path, parsed, index):
+    if index is None:
+        index = get_symbol_index(project_path)
+    index.refresh(parsed=parsed)
+    return index
+
+
+def search_text(project_path, text, parsed=None, index=None):
+    """
+    Búsqueda de texto plano (coincidencia parcial)
+    index: TrigramIndex del proyecto (por defecto el compartido, persistido
+    en la caché); solo se leen los archivos que pueden contener el texto.
+    """
+    return list(iter_search_text(project_path, text, parsed, index))
+
+
+def iter_search_text(project_path, text, parsed=None, index=None):
+    """Generador de search_text(): un resultado por línea coincidente."""
+    if index is None:
+        index = get_trigram_index(project_path)
+    index.refresh(parsed)
+
+    for path in index.candidates(text):
+        try:
+            parsed_file = load_parsed_file(path, parsed)
+        except Exception:
+            continue
+
+        if not parsed_file.is_utf8:
+            continue
+
+        lines = parsed_file.lines
+        if not lines[-1]:
+            lines = lines[:-1]  # el salto de línea final no abre otra línea
+
+        for i, line in enumerate(lines, 1):
+            # Búsqueda case-insensitive
+            if text.lower() in line.lower():
+                yield {
+                    "file": path,
+                    "line": i,
+                    "content": line.strip(),
+                    "type": "text"
+                }
+
+
 def is_valid_identifier(text):
     """Verificar si es un identificador Python válido"""
     return text.isidentifier()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+CodeHunter - Tabla de símbolos por archivo
+Recolecta definiciones (funciones, clases, variables) y sentencias
+estructurales (if, for, return, import...) con su línea y ámbito, durante
+el recorrido compartido del AST. Los registros son serializables, así que
+se guardan en la caché y en el índice de símbolos (SymbolIndex).
+"""
+
+import ast
+
+from .ast_dispatch import DetectorPlugin, dispatch
+
+
+FUNCTION = "function"
+CLASS = "class"
+VARIABLE = "variable"
+STATEMENT = "statement"
+
+SCOPE_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+# Nodos que se pueden buscar por palabra clave (ver search_keyword)
+STATEMENT_TYPES = (
+    ast.If, ast.For, ast.While, ast.Try, ast.ExceptHandler, ast.With,
+    ast.Return, ast.Yield, ast.Import, ast.ImportFrom, ast.Lambda, ast.Await,
+)
+
+# Orden de los campos de cada registro
+SYMBOL_FIELDS = ("name", "kind", "node_type", "line", "depth", "seq", "scope", "content", "signature")
+
+
+class SymbolCollector(DetectorPlugin):
+    """
+    Genera un registro por definición o sentencia estructural.
+
+    depth y seq (orden de pre-orden) permiten reproducir el orden de
+    ast.walk(): ordenar por (depth, seq) da el recorrido en anchura.
+    """
+
+    node_types = SCOPE_TYPES + (ast.Assign,) + STATEMENT_TYPES
+    leave_types = SCOPE_TYPES
+
+    def __init__(self, file_path, lines):
+        super().__init__(file_path, lines)
+        self.symbols = []
+        self._scope = []
+        self._seq = 0
+
+    def enter(self, node, depth):
+        scope = ".".join(self._scope)
+
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = [arg.arg for arg in node.args.args]
+            signature = f"def {node.name}({', '.join(args)})"
+            self._add(node.name, FUNCTION, node, depth, scope, signature)
+            self._scope.append(node.name)
+
+        elif isinstance(node, ast.ClassDef):
+            self._add(node.name, CLASS, node, depth, scope)
+            self._scope.append(node.name)
+
+        elif isinstance(node, ast.Assign):
+            names = []
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id not in names:
+                    names.append(target.id)
+            for name in names:
+                self._add(name, VARIABLE, node, depth, scope)
+
+        else:
+            self._add(None, STATEMENT, node, depth, scope)
+
+        self._seq += 1
+
+    def leave(self, node, depth):
+        self._scope.pop()
+
+    def _add(self, name, kind, node, depth, scope, signature=None):
+        line = node.lineno
+        content = self.lines[line - 1].strip() if line <= len(self.lines) else None
+
+        self.symbols.append([
+            name, kind, type(node).__name__, line, depth, self._seq, scope, content, signature
+        ])
+
+
+def collect_symbols(tree, file_path, lines):
+    """Registros de símbolos de un AST ya parseado (un recorrido propio)."""
+    collector = SymbolCollector(file_path, lines)
+    dispatch(tree, [collector])
+    return symbols_of(collector)
+
+
+def symbols_of(collector):
+    """Registros del colector; vacío si falló a mitad del recorrido."""
+    return [] if collector.failed else collector.symbols
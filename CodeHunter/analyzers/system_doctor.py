@@ -3,17 +3,41 @@ System Doctor - Diagnóstico completo del sistema
 Usa análisis avanzado con categorización profesional
 """
 
-from .advanced_diagnostics import run_advanced_analysis
+from contextlib import nullcontext
+
+from .advanced_diagnostics import run_advanced_analysis, count_into_metrics
+from .analysis_engine import run_project_analysis, GLOBAL_FILE_FACTS
 from .file_analyzer import detect_empty_python_files, detect_empty_folders
 from .circular_imports import detect_circular_imports
-from ..core.models import Finding, AdvancedFinding, Severity, Category
+from ..core.parsed_project import ParsedProject
+from ..core.config_loader import load_config
+from ..infrastructure.result_cache import ResultCache
+from ..core.models import Finding, AdvancedFinding, Severity, Category, CYCLE_SEPARATOR
+from ..core.findings_store import as_findings_store
 
 
-def run_code_doctor(project_path: str) -> dict:
+def run_code_doctor(project_path: str, jobs: int = None,
+                    use_cache: bool = True, cache_dir: str = None,
+                    incremental: bool = False, base_revision: str = None,
+                    parsed: ParsedProject = None, sinks=(), profiler=None) -> dict:
     """
     Ejecuta diagnóstico completo del sistema
     Combina análisis legacy y avanzado
+
+    jobs: procesos worker para el análisis (None = número de CPUs, 1 = secuencial)
+    use_cache / cache_dir: caché de resultados por archivo (ver ResultCache)
+    incremental / base_revision: releer solo los archivos modificados según
+    el manifiesto de la caché (y siempre los que git reporta como
+    modificados desde esa revisión)
+    parsed: ParsedProject compartido (p. ej. con build_full_diagnosis_data);
+    si no se indica, se crea uno para esta ejecución
+    sinks: exportadores NDJSON / SARIF que reciben los hallazgos mientras se
+    analiza (ver infrastructure/findings_exporter); el llamador los cierra
+    profiler: AnalysisProfiler opcional (ver detector_profiler)
     """
+
+    if parsed is None:
+        parsed = ParsedProject(project_path)
     
     print("\n🩺 Ejecutando Code Doctor...")
     print("="*60)
@@ -21,7 +45,11 @@ def run_code_doctor(project_path: str) -> dict:
     # ═══════════════════════════════════════════════════════════
     # ANÁLISIS AVANZADO (nuevo)
     # ═══════════════════════════════════════════════════════════
-    advanced_result = run_advanced_analysis(project_path)
+    advanced_result = run_advanced_analysis(
+        project_path, jobs=jobs, use_cache=use_cache, cache_dir=cache_dir,
+        incremental=incremental, base_revision=base_revision, parsed=parsed,
+        sinks=sinks, profiler=profiler
+    )
     advanced_findings = advanced_result["findings"]
     metrics = advanced_result["metrics"]
     
@@ -29,42 +57,21 @@ def run_code_doctor(project_path: str) -> dict:
     # ANÁLISIS LEGACY (compatibilidad con código existente)
     # ═══════════════════════════════════════════════════════════
     
-    # Archivos vacíos
-    empty_files = detect_empty_python_files(project_path)
-    empty_folders = detect_empty_folders(project_path)
-    
-    # Dependencias circulares
-    cycles = detect_circular_imports(project_path)
-    
-    # Convertir findings legacy a AdvancedFinding
-    legacy_findings = []
-    
-    for finding in empty_files + empty_folders:
-        legacy_findings.append(AdvancedFinding(
-            severity=Severity.MINOR if "vacío" in finding.message else Severity.MAJOR,
-            category=Category.MAINTAINABILITY,
-            message=finding.message,
-            file=finding.file,
-            line=finding.line,
-            suggestion=finding.suggestion
-        ))
-    
-    for cycle in cycles:
-        legacy_findings.append(AdvancedFinding(
-            severity=Severity.CRITICAL,
-            category=Category.BUG,
-            message="Dependencia circular detectada",
-            file=" → ".join(cycle),
-            line=0,
-            suggestion="Reorganizar imports para eliminar la dependencia circular.",
-            cwe_id="CWE-1047"
-        ))
+    # Hechos por archivo del análisis avanzado (evitan releer los archivos)
+    with profiler.phase("project_findings") if profiler is not None else nullcontext():
+        legacy_findings = project_findings(project_path, advanced_result["file_facts"], parsed)
+    for sink in sinks:
+        sink.write_findings(legacy_findings)
     
     # Combinar findings avanzados y legacy
     all_advanced_findings = advanced_findings + legacy_findings
-    
+
+    # el store del análisis avanzado ya tiene sus columnas: solo se agregan los legacy
+    store = advanced_result["store"]
+    store.extend(legacy_findings)
+
     # Recalcular métricas con todos los findings
-    final_metrics = calculate_final_metrics(all_advanced_findings)
+    final_metrics = calculate_final_metrics(store)
     
     # ═══════════════════════════════════════════════════════════
     # CONVERSIÓN A FORMATO LEGACY (para compatibilidad)
@@ -83,7 +90,9 @@ def run_code_doctor(project_path: str) -> dict:
         
         # Formato avanzado (nuevo)
         "advanced_findings": all_advanced_findings,
+        "findings_store": store,
         "metrics": final_metrics,
+        "budget_skips": advanced_result["budget_skips"],
         "by_severity": {
             "blocker": final_metrics["blocker"],
             "critical": final_metrics["critical"],
@@ -101,8 +110,87 @@ def run_code_doctor(project_path: str) -> dict:
     }
 
 
+def project_findings(project_path: str, file_facts: dict, parsed: ParsedProject = None) -> list:
+    """
+    Hallazgos de proyecto (archivos y carpetas vacías, dependencias
+    circulares) como AdvancedFinding. file_facts: hechos por archivo del
+    análisis avanzado (evitan releer los archivos).
+    """
+
+    # Archivos vacíos
+    empty_files = detect_empty_python_files(project_path, file_facts, parsed)
+    empty_folders = detect_empty_folders(project_path)
+    
+    # Dependencias circulares
+    cycles = detect_circular_imports(project_path, file_facts, parsed=parsed)
+    
+    # Convertir findings legacy a AdvancedFinding
+    legacy_findings = []
+    
+    for finding in empty_files + empty_folders:
+        legacy_findings.append(AdvancedFinding(
+            severity=Severity.MINOR if "vacío" in finding.message else Severity.MAJOR,
+            category=Category.MAINTAINABILITY,
+            message=finding.message,
+            file=finding.file,
+            line=finding.line,
+            suggestion=finding.suggestion
+        ))
+    
+    for cycle in cycles:
+        legacy_findings.append(AdvancedFinding(
+            severity=Severity.CRITICAL,
+            category=Category.BUG,
+            message="Dependencia circular detectada",
+            file=CYCLE_SEPARATOR.join(cycle),
+            line=0,
+            suggestion="Reorganizar imports para eliminar la dependencia circular.",
+            cwe_id="CWE-1047"
+        ))
+
+    return legacy_findings
+
+
+def export_findings(project_path: str, sinks, jobs: int = None,
+                    use_cache: bool = False, cache_dir: str = None,
+                    incremental: bool = False, base_revision: str = None,
+                    parsed: ParsedProject = None, profiler=None) -> None:
+    """
+    Igual que run_code_doctor() pero solo escribe los hallazgos en los
+    exportadores (sinks), sin acumularlos: la memoria no crece con el número
+    de hallazgos. El llamador cierra los exportadores.
+
+    Por defecto sin caché de resultados: guarda en memoria el resultado de
+    cada archivo hasta el final. Sin ella solo se retienen los datos que
+    necesitan los detectores de proyecto (firmas de clones, hashes de
+    duplicados e imports por archivo), de tamaño fijo por función o archivo.
+    """
+
+    if parsed is None:
+        parsed = ParsedProject(project_path)
+
+    config = load_config(project_path)
+    cache = ResultCache(project_path, config, cache_dir) if use_cache else None
+
+    run_project_analysis(
+        project_path, config, jobs=jobs, cache=cache,
+        incremental=incremental, base_revision=base_revision, parsed=parsed,
+        sinks=sinks, keep_findings=False, profiler=profiler
+    )
+
+    with profiler.phase("project_findings") if profiler is not None else nullcontext():
+        findings = project_findings(project_path, GLOBAL_FILE_FACTS, parsed)
+    for sink in sinks:
+        sink.write_findings(findings)
+
+
 def calculate_final_metrics(findings: list) -> dict:
-    """Calcula métricas finales con todos los findings"""
+    """
+    Calcula métricas finales con todos los findings
+    findings: lista o FindingsStore (con el store no se recorre cada hallazgo)
+    """
+
+    store = as_findings_store(findings)
     
     metrics = {
         "blocker": 0,
@@ -115,21 +203,12 @@ def calculate_final_metrics(findings: list) -> dict:
         "code_smells": 0,
         "security_hotspots": 0,
         "maintainability": 0,
-        "total": len(findings),
+        "total": len(store),
         "quality_score": 100,
         "status": "HEALTHY"
     }
-    
-    for finding in findings:
-        # Severidad
-        severity = finding.severity.value.lower()
-        if severity in metrics:
-            metrics[severity] += 1
-        
-        # Categoría
-        category = finding.category.value.lower()
-        if category in metrics:
-            metrics[category] += 1
+
+    count_into_metrics(metrics, store)
     
     # Calcular score
     score = 100
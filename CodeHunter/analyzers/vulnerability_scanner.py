@@ -8,6 +8,7 @@ import logging
 from typing import List
 from ..core.models import AdvancedFinding, Severity, Category
 from ..utils.project_walker import walk_python_files
+from .ast_dispatch import DetectorPlugin, dispatch, run_plugin
 
 
 logger = logging.getLogger(__name__)
@@ -15,25 +16,12 @@ logger = logging.getLogger(__name__)
 
 def run_vulnerability_detectors(tree, file_path, lines, config):
 
-    findings = []
-
-    detectors = [
-        lambda t, f, l: detect_eval_exec(t, f, l),
-        lambda t, f, l: detect_pickle_usage(t, f, l),
-        lambda t, f, l: detect_shell_injection(t, f, l),
-        lambda t, f, l: detect_sql_injection(t, f, l),
-        lambda t, f, l: detect_path_traversal(t, f, l),
-        lambda t, f, l: detect_unsafe_deserialization(t, f, l),
-        lambda t, f, l: detect_weak_crypto(t, f, l),
-    ]
+    return dispatch(tree, build_vulnerability_plugins(file_path, lines, config))
 
-    for detector in detectors:
-        try:
-            findings.extend(detector(tree, file_path, lines))
-        except Exception as e:
-            logger.warning(f"[VulnerabilityScanner] error: {e}")
 
-    return findings
+def build_vulnerability_plugins(file_path, lines, config):
+    """Instancia los detectores de vulnerabilidades para un recorrido compartido del AST."""
+    return [detector(file_path, lines) for detector in VULNERABILITY_DETECTORS]
 
 def analyze_file_for_vulnerabilities(file_path: str) -> List[AdvancedFinding]:
     """Analiza un archivo en busca de vulnerabilidades"""
@@ -55,134 +43,113 @@ def analyze_file_for_vulnerabilities(file_path: str) -> List[AdvancedFinding]:
     except Exception:
         return findings
 
-    # 🔍 Ejecutar detecciones con protección
-    detectors = [
-        ("eval_exec", lambda t, f, l: detect_eval_exec(t, f, l)),
-        ("pickle_usage", lambda t, f, l: detect_pickle_usage(t, f, l)),
-        ("shell_injection", lambda t, f, l: detect_shell_injection(t, f, l)),
-        ("hardcoded_secrets", lambda t, f, l: detect_hardcoded_secrets(t, f, l, source)),
-        ("sql_injection", lambda t, f, l: detect_sql_injection(t, f, l)),
-        ("path_traversal", lambda t, f, l: detect_path_traversal(t, f, l)),
-        ("unsafe_deserialization", lambda t, f, l: detect_unsafe_deserialization(t, f, l)),
-        ("weak_crypto", lambda t, f, l: detect_weak_crypto(t, f, l)),
-    ]
-    
-    for name, detector in detectors:
-        try:
-            findings.extend(detector(tree, file_path, lines))
-        except Exception as e:
-            logger.warning(f"[VulnerabilityScanner] Detector '{name}' falló en {file_path}: {e}")
+    # 🔍 Ejecutar detecciones con protección (un solo recorrido del AST)
+    findings.extend(run_vulnerability_detectors(tree, file_path, lines, None))
+
+    try:
+        findings.extend(detect_hardcoded_secrets(tree, file_path, lines))
+    except Exception as e:
+        logger.warning(f"[VulnerabilityScanner] Detector 'hardcoded_secrets' falló en {file_path}: {e}")
 
     return findings
 
 
-def detect_eval_exec(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class EvalExecDetector(DetectorPlugin):
     """Detecta uso peligroso de eval() y exec()"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            func_name = None
-            
-            if isinstance(node.func, ast.Name):
-                func_name = node.func.id
-            
-            if func_name in ['eval', 'exec']:
+    node_types = (ast.Call,)
+
+    def enter(self, node, depth):
+        func_name = None
+
+        if isinstance(node.func, ast.Name):
+            func_name = node.func.id
+
+        if func_name in ['eval', 'exec']:
+            line_num = node.lineno
+
+            self.findings.append(AdvancedFinding(
+                severity=Severity.BLOCKER,
+                category=Category.VULNERABILITY,
+                message=f"Uso de {func_name}() puede ejecutar código arbitrario",
+                file=self.file_path,
+                line=line_num,
+                suggestion=f"Evitar {func_name}(). Usar alternativas seguras como ast.literal_eval() o soluciones específicas.",
+                code_snippet=self.get_snippet(line_num),
+                cwe_id="CWE-95"
+            ))
+
+
+class PickleUsageDetector(DetectorPlugin):
+    """Detecta uso de pickle sin validación"""
+
+    node_types = (ast.Call,)
+
+    def enter(self, node, depth):
+        if isinstance(node.func, ast.Attribute):
+            if (isinstance(node.func.value, ast.Name) and 
+                node.func.value.id == 'pickle' and 
+                node.func.attr in ['load', 'loads']):
+
                 line_num = node.lineno
-                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
 
-                findings.append(AdvancedFinding(
-                    severity=Severity.BLOCKER,
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.CRITICAL,
                     category=Category.VULNERABILITY,
-                    message=f"Uso de {func_name}() puede ejecutar código arbitrario",
-                    file=file_path,
+                    message="Deserialización insegura con pickle puede ejecutar código malicioso",
+                    file=self.file_path,
                     line=line_num,
-                    suggestion=f"Evitar {func_name}(). Usar alternativas seguras como ast.literal_eval() o soluciones específicas.",
-                    code_snippet=snippet,
-                    cwe_id="CWE-95"
+                    suggestion="Usar JSON o formatos seguros. Si pickle es necesario, validar origen de datos.",
+                    code_snippet=self.get_snippet(line_num),
+                    cwe_id="CWE-502"
                 ))
 
-    return findings
 
+class ShellInjectionDetector(DetectorPlugin):
+    """Detecta posibles inyecciones de comandos shell"""
 
-def detect_pickle_usage(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta uso de pickle sin validación"""
-    findings = []
+    node_types = (ast.Call,)
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                if (isinstance(node.func.value, ast.Name) and 
-                    node.func.value.id == 'pickle' and 
-                    node.func.attr in ['load', 'loads']):
-                    
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                    findings.append(AdvancedFinding(
-                        severity=Severity.CRITICAL,
-                        category=Category.VULNERABILITY,
-                        message="Deserialización insegura con pickle puede ejecutar código malicioso",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar JSON o formatos seguros. Si pickle es necesario, validar origen de datos.",
-                        code_snippet=snippet,
-                        cwe_id="CWE-502"
-                    ))
+    def enter(self, node, depth):
+        if not isinstance(node.func, ast.Attribute):
+            return
 
-    return findings
+        module_name = None
+        if isinstance(node.func.value, ast.Name):
+            module_name = node.func.value.id
 
+        # Detectar subprocess con shell=True
+        if module_name == 'subprocess':
+            for keyword in node.keywords:
+                if keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant):
+                    if keyword.value.value is True:
+                        line_num = node.lineno
 
-def detect_shell_injection(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
-    """Detecta posibles inyecciones de comandos shell"""
-    findings = []
+                        self.findings.append(AdvancedFinding(
+                            severity=Severity.CRITICAL,
+                            category=Category.VULNERABILITY,
+                            message="subprocess con shell=True permite inyección de comandos",
+                            file=self.file_path,
+                            line=line_num,
+                            suggestion="Usar shell=False y pasar comando como lista. Validar inputs.",
+                            code_snippet=self.get_snippet(line_num),
+                            cwe_id="CWE-78"
+                        ))
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                module_name = None
-                if isinstance(node.func.value, ast.Name):
-                    module_name = node.func.value.id
-                
-                # Detectar subprocess con shell=True
-                if module_name == 'subprocess':
-                    for keyword in node.keywords:
-                        if keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant):
-                            if keyword.value.value is True:
-                                line_num = node.lineno
-                                snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                                findings.append(AdvancedFinding(
-                                    severity=Severity.CRITICAL,
-                                    category=Category.VULNERABILITY,
-                                    message="subprocess con shell=True permite inyección de comandos",
-                                    file=file_path,
-                                    line=line_num,
-                                    suggestion="Usar shell=False y pasar comando como lista. Validar inputs.",
-                                    code_snippet=snippet,
-                                    cwe_id="CWE-78"
-                                ))
-                
-                # Detectar os.system()
-                if (isinstance(node.func.value, ast.Name) and 
-                    node.func.value.id == 'os' and 
-                    node.func.attr == 'system'):
-                    
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                    findings.append(AdvancedFinding(
-                        severity=Severity.CRITICAL,
-                        category=Category.VULNERABILITY,
-                        message="os.system() permite inyección de comandos",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar subprocess.run() con lista de argumentos.",
-                        code_snippet=snippet,
-                        cwe_id="CWE-78"
-                    ))
+        # Detectar os.system()
+        if module_name == 'os' and node.func.attr == 'system':
+            line_num = node.lineno
 
-    return findings
+            self.findings.append(AdvancedFinding(
+                severity=Severity.CRITICAL,
+                category=Category.VULNERABILITY,
+                message="os.system() permite inyección de comandos",
+                file=self.file_path,
+                line=line_num,
+                suggestion="Usar subprocess.run() con lista de argumentos.",
+                code_snippet=self.get_snippet(line_num),
+                cwe_id="CWE-78"
+            ))
 
 
 def detect_hardcoded_secrets(tree, file_path, lines):
@@ -222,120 +189,156 @@ def detect_hardcoded_secrets(tree, file_path, lines):
     return findings
 
 
-def detect_sql_injection(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class SqlInjectionDetector(DetectorPlugin):
     """Detecta posibles inyecciones SQL por concatenación"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Mod)):
-            line_num = node.lineno
-            snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-            snippet_lower = snippet.lower()
-            
-            # Verificar si contiene palabras SQL
-            sql_keywords = ['select', 'insert', 'update', 'delete', 'from', 'where']
-            if any(keyword in snippet_lower for keyword in sql_keywords):
-                # Verificar si hay formato o concatenación
-                if '+' in snippet or '%' in snippet or '.format(' in snippet or 'f"' in snippet or "f'" in snippet:
-                    findings.append(AdvancedFinding(
-                        severity=Severity.CRITICAL,
-                        category=Category.VULNERABILITY,
-                        message="Posible inyección SQL por concatenación de strings",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar consultas parametrizadas o prepared statements.",
-                        code_snippet=snippet,
-                        cwe_id="CWE-89"
-                    ))
+    node_types = (ast.BinOp,)
 
-    return findings
+    sql_keywords = ['select', 'insert', 'update', 'delete', 'from', 'where']
 
+    def enter(self, node, depth):
+        if not isinstance(node.op, (ast.Add, ast.Mod)):
+            return
 
-def detect_path_traversal(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+        line_num = node.lineno
+        snippet = self.get_snippet(line_num)
+        snippet_lower = snippet.lower()
+
+        # Verificar si contiene palabras SQL
+        if any(keyword in snippet_lower for keyword in self.sql_keywords):
+            # Verificar si hay formato o concatenación
+            if '+' in snippet or '%' in snippet or '.format(' in snippet or 'f"' in snippet or "f'" in snippet:
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.CRITICAL,
+                    category=Category.VULNERABILITY,
+                    message="Posible inyección SQL por concatenación de strings",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion="Usar consultas parametrizadas o prepared statements.",
+                    code_snippet=snippet,
+                    cwe_id="CWE-89"
+                ))
+
+
+class PathTraversalDetector(DetectorPlugin):
     """Detecta posibles vulnerabilidades de path traversal"""
-    findings = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Name) and node.func.id == 'open':
-                if node.args:
-                    first_arg = node.args[0]
-                    if isinstance(first_arg, ast.BinOp):
-                        line_num = node.lineno
-                        snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+    node_types = (ast.Call,)
 
-                        findings.append(AdvancedFinding(
-                            severity=Severity.MAJOR,
-                            category=Category.VULNERABILITY,
-                            message="Posible path traversal: apertura de archivo con ruta construida dinámicamente",
-                            file=file_path,
-                            line=line_num,
-                            suggestion="Validar y sanitizar rutas. Usar os.path.abspath() y verificar que esté dentro del directorio permitido.",
-                            code_snippet=snippet,
-                            cwe_id="CWE-22"
-                        ))
+    def enter(self, node, depth):
+        if isinstance(node.func, ast.Name) and node.func.id == 'open':
+            if node.args and isinstance(node.args[0], ast.BinOp):
+                line_num = node.lineno
 
-    return findings
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.VULNERABILITY,
+                    message="Posible path traversal: apertura de archivo con ruta construida dinámicamente",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion="Validar y sanitizar rutas. Usar os.path.abspath() y verificar que esté dentro del directorio permitido.",
+                    code_snippet=self.get_snippet(line_num),
+                    cwe_id="CWE-22"
+                ))
 
 
-def detect_unsafe_deserialization(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class UnsafeDeserializationDetector(DetectorPlugin):
     """Detecta deserialización insegura (yaml.load, marshal, etc)"""
-    findings = []
+
+    node_types = (ast.Call,)
 
     unsafe_funcs = {
         'yaml': ['load', 'unsafe_load'],
         'marshal': ['load', 'loads'],
     }
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                if isinstance(node.func.value, ast.Name):
-                    module = node.func.value.id
-                    func = node.func.attr
-                    
-                    if module in unsafe_funcs and func in unsafe_funcs[module]:
-                        line_num = node.lineno
-                        snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
+    def enter(self, node, depth):
+        if isinstance(node.func, ast.Attribute) and isinstance(node.func.value, ast.Name):
+            module = node.func.value.id
+            func = node.func.attr
 
-                        findings.append(AdvancedFinding(
-                            severity=Severity.CRITICAL,
-                            category=Category.VULNERABILITY,
-                            message=f"Deserialización insegura con {module}.{func}()",
-                            file=file_path,
-                            line=line_num,
-                            suggestion=f"Usar yaml.safe_load() en vez de yaml.load(). Validar origen de datos.",
-                            code_snippet=snippet,
-                            cwe_id="CWE-502"
-                        ))
+            if module in self.unsafe_funcs and func in self.unsafe_funcs[module]:
+                line_num = node.lineno
 
-    return findings
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.CRITICAL,
+                    category=Category.VULNERABILITY,
+                    message=f"Deserialización insegura con {module}.{func}()",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion=f"Usar yaml.safe_load() en vez de yaml.load(). Validar origen de datos.",
+                    code_snippet=self.get_snippet(line_num),
+                    cwe_id="CWE-502"
+                ))
 
 
-def detect_weak_crypto(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+class WeakCryptoDetector(DetectorPlugin):
     """Detecta uso de algoritmos criptográficos débiles"""
-    findings = []
+
+    node_types = (ast.Call,)
 
     weak_algorithms = ['md5', 'sha1', 'des', 'rc4']
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Call):
-            if isinstance(node.func, ast.Attribute):
-                func_name = node.func.attr.lower()
-                
-                if func_name in weak_algorithms:
-                    line_num = node.lineno
-                    snippet = lines[line_num - 1].strip() if line_num <= len(lines) else ""
-
-                    findings.append(AdvancedFinding(
-                        severity=Severity.MAJOR,
-                        category=Category.VULNERABILITY,
-                        message=f"Algoritmo criptográfico débil: {func_name}",
-                        file=file_path,
-                        line=line_num,
-                        suggestion="Usar SHA-256, SHA-3 o algoritmos modernos como bcrypt para passwords.",
-                        code_snippet=snippet,
-                        cwe_id="CWE-327"
-                    ))
-
-    return findings
\ No newline at end of file
+    def enter(self, node, depth):
+        if isinstance(node.func, ast.Attribute):
+            func_name = node.func.attr.lower()
+
+            if func_name in self.weak_algorithms:
+                line_num = node.lineno
+
+                self.findings.append(AdvancedFinding(
+                    severity=Severity.MAJOR,
+                    category=Category.VULNERABILITY,
+                    message=f"Algoritmo criptográfico débil: {func_name}",
+                    file=self.file_path,
+                    line=line_num,
+                    suggestion="Usar SHA-256, SHA-3 o algoritmos modernos como bcrypt para passwords.",
+                    code_snippet=self.get_snippet(line_num),
+                    cwe_id="CWE-327"
+                ))
+
+
+VULNERABILITY_DETECTORS = [
+    EvalExecDetector,
+    PickleUsageDetector,
+    ShellInjectionDetector,
+    SqlInjectionDetector,
+    PathTraversalDetector,
+    UnsafeDeserializationDetector,
+    WeakCryptoDetector,
+]
+
+
+def detect_eval_exec(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta uso peligroso de eval() y exec()"""
+    return run_plugin(tree, EvalExecDetector(file_path, lines))
+
+
+def detect_pickle_usage(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta uso de pickle sin validación"""
+    return run_plugin(tree, PickleUsageDetector(file_path, lines))
+
+
+def detect_shell_injection(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta posibles inyecciones de comandos shell"""
+    return run_plugin(tree, ShellInjectionDetector(file_path, lines))
+
+
+def detect_sql_injection(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta posibles inyecciones SQL por concatenación"""
+    return run_plugin(tree, SqlInjectionDetector(file_path, lines))
+
+
+def detect_path_traversal(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta posibles vulnerabilidades de path traversal"""
+    return run_plugin(tree, PathTraversalDetector(file_path, lines))
+
+
+def detect_unsafe_deserialization(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta deserialización insegura (yaml.load, marshal, etc)"""
+    return run_plugin(tree, UnsafeDeserializationDetector(file_path, lines))
+
+
+def detect_weak_crypto(tree: ast.AST, file_path: str, lines: List[str]) -> List[AdvancedFinding]:
+    """Detecta uso de algoritmos criptográficos débiles"""
+    return run_plugin(tree, WeakCryptoDetector(file_path, lines))
@@ -4,7 +4,18 @@ from pathlib import Path
 
 DEFAULT_CONFIG = {
     "analysis": {
-        "ignored_numbers": [0, 1, -1]
+        "ignored_numbers": [0, 1, -1],
+        # similitud mínima para reportar funciones casi duplicadas (0 = desactivado)
+        "near_duplicate_threshold": 0.8,
+        # segundos de CPU por archivo / por detector y archivo (0 = sin límite)
+        "file_cpu_budget": 60,
+        "detector_cpu_budget": 0
+    },
+    "walker": {
+        # hilos para listar carpetas (útil en sistemas de archivos de red; 0 = secuencial)
+        "threads": 0,
+        # respetar .gitignore / .codehunterignore
+        "ignore_files": True
     }
 }
 
@@ -41,7 +52,8 @@ def merge_configs(default: dict, user: dict) -> dict:
 
     for key, value in user.items():
         if isinstance(value, dict) and key in result:
-            result[key].update(value)
+            # copiar: no modificar DEFAULT_CONFIG entre proyectos
+            result[key] = {**result[key], **value}
         else:
             result[key] = value
 
@@ -0,0 +1,224 @@
+"""
+CodeHunter - Almacén columnar de hallazgos
+Guarda severidad, categoría, nivel, archivo, línea y regla de cada hallazgo
+en columnas compactas (bytearray / array). Los conteos y filtros recorren
+esas columnas con operaciones en C (bytearray.count, Counter, compress),
+sin volver a leer los atributos de cada objeto.
+"""
+
+from array import array
+from collections import Counter
+from itertools import compress, repeat
+from operator import eq, and_, attrgetter
+
+from .models import Severity, Category, Level, PATHS, Finding, AdvancedFinding
+
+
+# Código de las columnas de enums cuando el hallazgo no tiene ese campo
+MISSING = 255
+# Línea de los hallazgos sin número de línea ("-", None...)
+NO_LINE = -1
+
+_SEVERITIES = tuple(Severity)
+_CATEGORIES = tuple(Category)
+_LEVELS = tuple(Level)
+
+_SEVERITY_CODES = {member: i for i, member in enumerate(_SEVERITIES)}
+_CATEGORY_CODES = {member: i for i, member in enumerate(_CATEGORIES)}
+_LEVEL_CODES = {member: i for i, member in enumerate(_LEVELS)}
+
+
+class RuleTable:
+    """
+    Reglas de los hallazgos internadas como ids. Los hallazgos no tienen un
+    identificador de regla propio; se usa su CWE ("" = sin regla, id 0).
+    """
+
+    def __init__(self):
+        self.rules = [""]
+        self._ids = {"": 0}
+
+    def intern(self, rule):
+        rule_id = self._ids.get(rule)
+        if rule_id is None:
+            rule_id = self._ids[rule] = len(self.rules)
+            self.rules.append(rule)
+        return rule_id
+
+    def __getitem__(self, rule_id):
+        return self.rules[rule_id]
+
+
+class FindingsStore:
+    """
+    Hallazgos en columnas, en el orden en que se agregan.
+
+    Acepta AdvancedFinding, Finding (legacy) o sus dicts; las columnas de
+    los campos que un hallazgo no tiene quedan en MISSING. Se puede iterar
+    e indexar como la lista original.
+    """
+
+    def __init__(self, findings=()):
+        self.findings = []
+        self.severity = bytearray()
+        self.category = bytearray()
+        self.level = bytearray()
+        self.file_id = array("I")
+        self.line = array("q")
+        self.rule_id = array("I")
+        self.rules = RuleTable()
+
+        self.extend(findings)
+
+    def add(self, finding):
+        self.findings.append(finding)
+        self.severity.append(_code(_field(finding, "severity"), Severity, _SEVERITY_CODES))
+        self.category.append(_code(_field(finding, "category"), Category, _CATEGORY_CODES))
+        self.level.append(_code(_field(finding, "level"), Level, _LEVEL_CODES))
+        self.file_id.append(_file_id(finding))
+        self.line.append(_line(finding))
+        self.rule_id.append(self.rules.intern(_field(finding, "cwe_id") or ""))
+
+    def extend(self, findings):
+        findings = list(findings)
+
+        # los hallazgos de models ya guardan enums y ruta como enteros:
+        # las columnas se llenan con map() sin pasar por cada atributo
+        kinds = set(map(type, findings))
+        if kinds == {AdvancedFinding}:
+            self._extend_columns(findings, attrgetter("severity_id"), attrgetter("category_id"), None)
+        elif kinds == {Finding}:
+            self._extend_columns(findings, None, None, attrgetter("level_id"))
+        else:
+            for finding in findings:
+                self.add(finding)
+
+    def _extend_columns(self, findings, severity, category, level):
+        missing = bytes([MISSING]) * len(findings)
+
+        self.findings.extend(findings)
+        self.severity.extend(map(severity, findings) if severity else missing)
+        self.category.extend(map(category, findings) if category else missing)
+        self.level.extend(map(level, findings) if level else missing)
+        self.file_id.extend(map(attrgetter("file_id"), findings))
+
+        lines = array("q")
+        try:
+            lines.extend(map(attrgetter("line"), findings))
+        except (TypeError, OverflowError):
+            lines = array("q", (_line(finding) for finding in findings))
+        self.line.extend(lines)
+
+        cwe_ids = map(attrgetter("cwe_id"), findings) if severity else repeat("", len(findings))
+        self.rule_id.extend(map(self.rules.intern, cwe_ids))
+
+    def __len__(self):
+        return len(self.findings)
+
+    def __iter__(self):
+        return iter(self.findings)
+
+    def __getitem__(self, index):
+        return self.findings[index]
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Conteos
+    # ──────────────────────────────────────────────────────────────────────
+
+    def count_by_severity(self):
+        """{Severity: cantidad}, solo las severidades presentes."""
+        return _count_codes(self.severity, _SEVERITIES)
+
+    def count_by_category(self):
+        """{Category: cantidad}, solo las categorías presentes."""
+        return _count_codes(self.category, _CATEGORIES)
+
+    def count_by_level(self):
+        """{Level: cantidad}, solo los niveles presentes (hallazgos legacy)."""
+        return _count_codes(self.level, _LEVELS)
+
+    def count_by_rule(self):
+        """{regla: cantidad} (ver RuleTable)."""
+        return {self.rules[rule_id]: count for rule_id, count in Counter(self.rule_id).items()}
+
+    def top_files(self, limit=None):
+        """
+        {ruta: cantidad} de los archivos con más hallazgos, de mayor a menor;
+        los empates quedan en el orden en que apareció cada archivo.
+        """
+        counts = Counter(self.file_id).most_common(limit)
+        return {PATHS[file_id]: count for file_id, count in counts}
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Filtros
+    # ──────────────────────────────────────────────────────────────────────
+
+    def where(self, severity=None, category=None, level=None, file=None):
+        """Hallazgos que cumplen todas las condiciones indicadas, en orden."""
+        masks = []
+
+        if severity is not None:
+            masks.append(_mask(self.severity, _SEVERITY_CODES[Severity(severity)]))
+        if category is not None:
+            masks.append(_mask(self.category, _CATEGORY_CODES[Category(category)]))
+        if level is not None:
+            masks.append(_mask(self.level, _LEVEL_CODES[Level(level)]))
+        if file is not None:
+            masks.append(_mask(self.file_id, PATHS.intern(file)))
+
+        if not masks:
+            return list(self.findings)
+
+        mask = masks[0]
+        for other in masks[1:]:
+            mask = map(and_, mask, other)
+
+        return list(compress(self.findings, mask))
+
+
+def as_findings_store(findings):
+    """findings como FindingsStore (sin copiar si ya lo es)."""
+    return findings if isinstance(findings, FindingsStore) else FindingsStore(findings)
+
+
+def _field(finding, name):
+    if isinstance(finding, dict):
+        return finding.get(name)
+    return getattr(finding, name, None)
+
+
+def _code(value, enum, codes):
+    if value is None:
+        return MISSING
+    try:
+        return codes[enum(value)]
+    except ValueError:
+        return MISSING
+
+
+def _line(finding):
+    line = _field(finding, "line")
+    return line if type(line) is int else NO_LINE
+
+
+def _file_id(finding):
+    # los hallazgos de models ya tienen la ruta internada
+    file_id = getattr(finding, "file_id", None)
+    if file_id is not None:
+        return file_id
+
+    path = _field(finding, "file")
+    return PATHS.intern(path) if path else PATHS.intern_normalized("")
+
+
+def _count_codes(column, members):
+    counts = {}
+    for code, member in enumerate(members):
+        count = column.count(code)
+        if count:
+            counts[member] = count
+    return counts
+
+
+def _mask(column, code):
+    return map(eq, column, repeat(code))
@@ -1,5 +1,6 @@
 import os
-from dataclasses import dataclass
+import sys
+import threading
 from enum import Enum
 
 
@@ -29,49 +30,198 @@ class Level(str, Enum):
     INFO = "INFO"
 
 
-@dataclass
+# Enums guardados como enteros pequeños (índice en estas tuplas)
+_SEVERITIES = tuple(Severity)
+_CATEGORIES = tuple(Category)
+_LEVELS = tuple(Level)
+
+_SEVERITY_IDS = {member: i for i, member in enumerate(_SEVERITIES)}
+_CATEGORY_IDS = {member: i for i, member in enumerate(_CATEGORIES)}
+_LEVEL_IDS = {member: i for i, member in enumerate(_LEVELS)}
+
+
+class PathTable:
+    """
+    Rutas de los hallazgos, normalizadas con os.path.relpath() e internadas:
+    cada hallazgo guarda solo el id de su ruta. relpath se calcula una vez
+    por ruta distinta (y de nuevo si cambia el directorio de trabajo).
+    """
+
+    def __init__(self):
+        self.paths = []
+        self._ids = {}       # ruta normalizada -> id
+        self._raw_ids = {}   # ruta recibida -> id
+        self._cwd = None
+        self._lock = threading.Lock()
+
+    def intern(self, path):
+        """Id de la ruta tal como la normaliza os.path.relpath(path)."""
+        cwd = os.getcwd()
+        if cwd != self._cwd:
+            with self._lock:
+                self._raw_ids = {}
+                self._cwd = cwd
+
+        file_id = self._raw_ids.get(path)
+        if file_id is None:
+            file_id = self.intern_normalized(os.path.relpath(path))
+            self._raw_ids[path] = file_id
+        return file_id
+
+    def intern_normalized(self, path):
+        """Id de una ruta que ya está normalizada."""
+        file_id = self._ids.get(path)
+        if file_id is None:
+            with self._lock:
+                file_id = self._ids.get(path)
+                if file_id is None:
+                    file_id = len(self.paths)
+                    self.paths.append(sys.intern(path))
+                    self._ids[path] = file_id
+        return file_id
+
+    def __getitem__(self, file_id):
+        return self.paths[file_id]
+
+    def __len__(self):
+        return len(self.paths)
+
+
+# Tabla compartida por todos los hallazgos del proceso
+PATHS = PathTable()
+
+# Separa los módulos de un ciclo de imports en el campo file de un hallazgo
+# (rutas relativas al proyecto, no al directorio de trabajo)
+CYCLE_SEPARATOR = " → "
+
+
+def _intern_text(text):
+    # sugerencias, snippets y CWE se repiten mucho entre hallazgos
+    return sys.intern(text) if type(text) is str else text
+
+
 class Finding:
     """Hallazgo básico (legacy - para compatibilidad)"""
-    level: Level
-    message: str
-    file: str
-    line: int
-    suggestion: str
 
-    def __post_init__(self):
-        # Convertir string a Enum automáticamente
-        if isinstance(self.level, str):
-            self.level = Level(self.level)
+    __slots__ = ("_level", "message", "_file_id", "line", "suggestion")
+    _FIELDS = ("level", "message", "file", "line", "suggestion")
 
+    def __init__(self, level, message, file, line, suggestion):
+        # Convertir string a Enum automáticamente
+        self.level = level
+        self.message = message
         # Normalizar ruta
-        self.file = os.path.relpath(self.file)
+        self.file = file
+        self.line = line
+        self.suggestion = _intern_text(suggestion)
+
+    @property
+    def level(self):
+        return _LEVELS[self._level]
+
+    @level.setter
+    def level(self, value):
+        self._level = _LEVEL_IDS[Level(value)]
+
+    @property
+    def file(self):
+        return PATHS[self._file_id]
+
+    @file.setter
+    def file(self, value):
+        self._file_id = PATHS.intern(value)
+
+    @property
+    def file_id(self):
+        """Id de la ruta en PATHS."""
+        return self._file_id
+
+    @property
+    def level_id(self):
+        """Nivel como índice en tuple(Level)."""
+        return self._level
 
     def __str__(self):
         return f"[{self.level.value}] {self.message} ({self.file}:{self.line})"
 
+    def __repr__(self):
+        return (f"Finding(level={self.level!r}, message={self.message!r}, file={self.file!r}, "
+                f"line={self.line!r}, suggestion={self.suggestion!r})")
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _astuple(self) == _astuple(other)
+
+    def __reduce__(self):
+        # los ids de ruta solo valen en este proceso: se envía la ruta
+        return _restore, (self.__class__, _astuple(self))
+
 
-@dataclass
 class AdvancedFinding:
-    """Hallazgo avanzado con categorización profesional"""
-    severity: Severity       # BLOCKER, CRITICAL, MAJOR, MINOR, INFO
-    category: Category       # BUG, VULNERABILITY, CODE_SMELL, SECURITY_HOTSPOT
-    message: str            # Descripción del problema
-    file: str               # Ruta del archivo
-    line: int               # Número de línea
-    suggestion: str         # Cómo arreglarlo
-    code_snippet: str = ""  # Fragmento de código problemático (opcional)
-    cwe_id: str = ""        # CWE ID si aplica (ej: "CWE-89" para SQL injection)
-
-    def __post_init__(self):
+    """
+    Hallazgo avanzado con categorización profesional.
+
+    Usa __slots__: la ruta se guarda como id en PATHS y severidad/categoría
+    como enteros pequeños; los atributos se leen igual que antes y
+    to_dict() / from_dict() conservan el formato de siempre.
+    """
+
+    __slots__ = ("_severity", "_category", "message", "_file_id", "line",
+                 "suggestion", "code_snippet", "cwe_id")
+    _FIELDS = ("severity", "category", "message", "file", "line",
+               "suggestion", "code_snippet", "cwe_id")
+
+    def __init__(self, severity, category, message, file, line, suggestion,
+                 code_snippet="", cwe_id=""):
+        self.severity = severity        # BLOCKER, CRITICAL, MAJOR, MINOR, INFO
+        self.category = category        # BUG, VULNERABILITY, CODE_SMELL, SECURITY_HOTSPOT
+        self.message = message          # Descripción del problema
+        self.file = file                # Ruta del archivo (se normaliza con relpath)
+        self.line = line                # Número de línea
+        self.suggestion = _intern_text(suggestion)      # Cómo arreglarlo
+        self.code_snippet = _intern_text(code_snippet)  # Fragmento de código problemático (opcional)
+        self.cwe_id = _intern_text(cwe_id)              # CWE ID si aplica (ej: "CWE-89" para SQL injection)
+
+    @property
+    def severity(self):
+        return _SEVERITIES[self._severity]
+
+    @severity.setter
+    def severity(self, value):
         # Convertir strings a Enums automáticamente
-        if isinstance(self.severity, str):
-            self.severity = Severity(self.severity)
-        
-        if isinstance(self.category, str):
-            self.category = Category(self.category)
+        self._severity = _SEVERITY_IDS[Severity(value)]
 
-        # Normalizar ruta
-        self.file = os.path.relpath(self.file)
+    @property
+    def category(self):
+        return _CATEGORIES[self._category]
+
+    @category.setter
+    def category(self, value):
+        self._category = _CATEGORY_IDS[Category(value)]
+
+    @property
+    def file(self):
+        return PATHS[self._file_id]
+
+    @file.setter
+    def file(self, value):
+        self._file_id = PATHS.intern(value)
+
+    @property
+    def file_id(self):
+        """Id de la ruta en PATHS."""
+        return self._file_id
+
+    @property
+    def severity_id(self):
+        """Severidad como índice en tuple(Severity)."""
+        return self._severity
+
+    @property
+    def category_id(self):
+        """Categoría como índice en tuple(Category)."""
+        return self._category
 
     def __str__(self):
         icon = {
@@ -84,6 +234,21 @@ class AdvancedFinding:
         
         return f"{icon} [{self.severity.value}] {self.message} ({self.file}:{self.line})"
 
+    def __repr__(self):
+        return (f"AdvancedFinding(severity={self.severity!r}, category={self.category!r}, "
+                f"message={self.message!r}, file={self.file!r}, line={self.line!r}, "
+                f"suggestion={self.suggestion!r}, code_snippet={self.code_snippet!r}, "
+                f"cwe_id={self.cwe_id!r})")
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _astuple(self) == _astuple(other)
+
+    def __reduce__(self):
+        # los ids de ruta solo valen en este proceso: se envía la ruta
+        return _restore, (self.__class__, _astuple(self))
+
     def to_dict(self):
         """Convertir a diccionario para reportes"""
         return {
@@ -95,4 +260,25 @@ class AdvancedFinding:
             "suggestion": self.suggestion,
             "code_snippet": self.code_snippet,
             "cwe_id": self.cwe_id
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Reconstruye un hallazgo desde to_dict() (p. ej. al leer la caché)"""
+        return cls(**data)
+
+
+def _astuple(finding):
+    """Campos del hallazgo en el orden del constructor (ruta como texto)."""
+    return tuple(getattr(finding, name) for name in finding._FIELDS)
+
+
+def _restore(cls, values):
+    """Inverso de __reduce__: la ruta ya viene normalizada."""
+    finding = cls.__new__(cls)
+    for name, value in zip(cls._FIELDS, values):
+        if name == "file":
+            finding._file_id = PATHS.intern_normalized(value)
+        else:
+            setattr(finding, name, value)
+    return finding
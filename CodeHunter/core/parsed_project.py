@@ -0,0 +1,278 @@
+"""
+CodeHunter - Almacén de archivos parseados
+Cada archivo se lee y se parsea una sola vez por ejecución y se comparte
+entre todos los analizadores (código, líneas, AST y offsets de línea).
+La memoria se acota con una política LRU sobre el tamaño del código.
+
+Los archivos se leen con mmap y se decodifican directamente desde el mapeo;
+las líneas no se copian: se guarda una tabla de offsets y cada línea se
+extrae solo cuando un detector la pide (p. ej. para el snippet).
+"""
+
+import os
+import ast
+import mmap
+import threading
+from array import array
+from itertools import accumulate
+from collections import OrderedDict
+
+
+DEFAULT_MAX_FILES = 5000
+# Aproximación de la memoria usada: caracteres de código fuente retenidos
+DEFAULT_MAX_CHARS = 32 * 1024 * 1024
+
+# Caracteres por bloque al calcular los offsets de línea
+OFFSET_BLOCK_CHARS = 1024 * 1024
+
+
+class LineTable:
+    """
+    Las líneas de un texto, igual que text.split("\\n"), sin copiarlas.
+
+    Solo guarda el offset de inicio de cada línea (8 bytes por línea). Admite
+    len(), índices (también negativos), iteración y slices, que retornan
+    otra vista sobre el mismo texto.
+    """
+
+    __slots__ = ("_text", "_offsets", "_start", "_stop")
+
+    def __init__(self, text, offsets=None, start=0, stop=None):
+        if offsets is None:
+            offsets = _line_starts(text)
+        self._text = text
+        self._offsets = offsets
+        self._start = start
+        # el último offset es el final del texto + 1 (fin de la última línea)
+        self._stop = len(offsets) - 1 if stop is None else stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return LineTable(self._text, self._offsets, self._start + start,
+                             self._start + max(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+
+        position = self._start + index
+        return self._text[self._offsets[position]:self._offsets[position + 1] - 1]
+
+    def __iter__(self):
+        text = self._text
+        offsets = self._offsets
+        for position in range(self._start, self._stop):
+            yield text[offsets[position]:offsets[position + 1] - 1]
+
+    def offset(self, index):
+        """Offset (en caracteres) del inicio de la línea index."""
+        return self._offsets[self._start + index]
+
+    def __repr__(self):
+        return f"LineTable({len(self)} líneas)"
+
+
+class ParsedFile:
+    """
+    Un archivo .py leído como texto (UTF-8, ignorando bytes inválidos).
+
+    parse(strict=True) se comporta como leer con encoding="utf-8" y luego
+    ast.parse(): lanza las mismas excepciones, así cada analizador conserva
+    su manejo de errores.
+    """
+
+    def __init__(self, path, source, decode_error=None, stat=None):
+        self.path = path
+        self.source = source
+        self.decode_error = decode_error
+        self.stat_key = (stat.st_mtime_ns, stat.st_size) if stat else None
+
+        self._lines = None
+        self._tree = None
+        self._parse_error = None
+
+    @property
+    def lines(self):
+        """LineTable del código (se calcula la primera vez que se pide)."""
+        if self._lines is None:
+            self._lines = LineTable(self.source)
+        return self._lines
+
+    @property
+    def is_utf8(self):
+        return self.decode_error is None
+
+    def parse(self, strict=False):
+        """AST del archivo (parseado una sola vez)."""
+        if strict and self.decode_error is not None:
+            raise self.decode_error
+
+        if self._tree is None and self._parse_error is None:
+            try:
+                self._tree = ast.parse(self.source)
+            except Exception as e:
+                self._parse_error = e
+
+        if self._parse_error is not None:
+            raise self._parse_error
+
+        return self._tree
+
+    def text_until_line(self, count):
+        """Las primeras count líneas, con sus saltos de línea."""
+        if count >= len(self.lines):
+            return self.source
+        return self.source[:self.lines.offset(count)]
+
+    def get_source_segment(self, node):
+        """Igual que ast.get_source_segment() sin re-dividir el archivo en cada llamada."""
+        try:
+            if node.end_lineno is None or node.end_col_offset is None:
+                return None
+            lineno = node.lineno - 1
+            end_lineno = node.end_lineno - 1
+            col_offset = node.col_offset
+            end_col_offset = node.end_col_offset
+        except AttributeError:
+            return None
+
+        # el código ya tiene los saltos normalizados a \n (ver read_parsed_file)
+        lines = self.lines
+
+        if end_lineno == lineno:
+            return lines[lineno].encode()[col_offset:end_col_offset].decode()
+
+        first = (lines[lineno] + "\n").encode()[col_offset:].decode()
+        middle = self.source[lines.offset(lineno + 1):lines.offset(end_lineno)]
+        last = lines[end_lineno].encode()[:end_col_offset].decode()
+
+        return first + middle + last
+
+
+class ParsedProject:
+    """
+    Caché LRU de ParsedFile por ruta. Antes de reutilizar una entrada se
+    comprueba el mtime y el tamaño, así que sirve también entre ejecuciones
+    dentro del mismo proceso (GUI, menú del CLI). Es seguro usarla desde
+    varios hilos.
+    """
+
+    def __init__(self, project_path=None, max_files=DEFAULT_MAX_FILES,
+                 max_chars=DEFAULT_MAX_CHARS):
+        self.project_path = project_path
+        self.max_files = max_files
+        self.max_chars = max_chars
+
+        self._files = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """ParsedFile de path. Lanza OSError si el archivo no se puede leer."""
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._files.get(key)
+            if cached is not None and cached.stat_key == stat_key:
+                self._files.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        # la lectura se hace fuera del lock
+        parsed_file = read_parsed_file(path, stat)
+
+        with self._lock:
+            previous = self._files.pop(key, None)
+            if previous is not None:
+                self._chars -= len(previous.source)
+            self._files[key] = parsed_file
+            self._chars += len(parsed_file.source)
+            self._evict()
+
+        return parsed_file
+
+    def __len__(self):
+        return len(self._files)
+
+    def clear(self):
+        with self._lock:
+            self._files.clear()
+            self._chars = 0
+
+    def _evict(self):
+        while len(self._files) > 1 and (
+            len(self._files) > self.max_files or self._chars > self.max_chars
+        ):
+            _, evicted = self._files.popitem(last=False)
+            self._chars -= len(evicted.source)
+
+
+def load_parsed_file(path, parsed=None):
+    """ParsedFile de path desde el almacén parsed o, sin almacén, leyéndolo."""
+    if parsed is not None:
+        return parsed.get(path)
+    return read_parsed_file(path)
+
+
+def read_parsed_file(path, stat=None):
+    """
+    Lee un archivo sin pasar por la caché (p. ej. en procesos worker).
+    El resultado es el mismo que con open(path, encoding="utf-8").read()
+    (o errors="ignore" si no es UTF-8 válido), saltos de línea incluidos,
+    pero sin la copia intermedia en bytes.
+    """
+    decode_error = None
+
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            data = f.read()  # archivo vacío: no se puede mapear
+
+    try:
+        try:
+            source = str(data, "utf-8")
+        except UnicodeDecodeError as e:
+            decode_error = e
+            source = str(data, "utf-8", "ignore")
+    finally:
+        # el mapeo se cierra enseguida (en Windows bloquea el archivo)
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    # mismos saltos de línea que el modo texto (newline=None)
+    if "\r" in source:
+        source = source.replace("\r\n", "\n").replace("\r", "\n")
+
+    return ParsedFile(path, source, decode_error, stat)
+
+
+def _line_starts(text):
+    """
+    Offsets de inicio de cada línea más el final del texto + 1. Se divide
+    por bloques para no tener nunca todas las líneas en memoria a la vez.
+    """
+    starts = array("q", [0])
+
+    for block_start in range(0, len(text), OFFSET_BLOCK_CHARS):
+        pieces = text[block_start:block_start + OFFSET_BLOCK_CHARS].split("\n")
+        # cada trozo salvo el último termina en un salto: la línea siguiente
+        # empieza len(trozo) + 1 caracteres después
+        offsets = accumulate(map((1).__add__, map(len, pieces[:-1])), initial=block_start)
+        next(offsets)
+        starts.extend(offsets)
+
+    starts.append(len(text) + 1)
+    return starts
@@ -4,29 +4,34 @@ Genera el árbol de estructura del proyecto.
 """
 
 import os
-from CodeHunter.utils.project_walker import IGNORE_DIRS
+from CodeHunter.utils.project_walker import get_manifest
 
 
 def build_project_tree(root_path, prefix=""):
-    """Genera el árbol visual de archivos del proyecto."""
-    lines = []
-    try:
-        items = sorted(os.listdir(root_path))
-    except PermissionError:
-        return lines
+    """Genera el árbol visual de archivos del proyecto (desde el manifiesto del proyecto)."""
+    return _tree_lines(get_manifest(root_path).directories(), root_path, prefix)
+
 
-    # Filtrar carpetas ignoradas de la lista visible
-    visible = [i for i in items if i not in IGNORE_DIRS]
+def _tree_lines(directories, dir_path, prefix):
+    directory = directories.get(dir_path)
+    if directory is None:
+        return []
 
-    for index, item in enumerate(visible):
-        full_path = os.path.join(root_path, item)
-        is_last   = index == len(visible) - 1
+    # carpetas y archivos mezclados, por nombre
+    items = sorted(
+        [(os.path.basename(path), path) for path in directory.subdirs]
+        + [(entry.name, None) for entry in directory.files]
+    )
+
+    lines = []
+    for index, (item, subdir) in enumerate(items):
+        is_last   = index == len(items) - 1
         connector = "└── " if is_last else "├── "
 
-        if os.path.isdir(full_path):
+        if subdir is not None:
             lines.append(prefix + connector + item + "/")
             new_prefix = prefix + ("    " if is_last else "│   ")
-            lines.extend(build_project_tree(full_path, new_prefix))
+            lines.extend(_tree_lines(directories, subdir, new_prefix))
         else:
             lines.append(prefix + connector + item)
 
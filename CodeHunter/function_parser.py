@@ -1,9 +1,10 @@
 import ast
 import os
 
-def extract_functions(file_path, base_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        tree = ast.parse(f.read())
+from .core.parsed_project import load_parsed_file
+
+def extract_functions(file_path, base_path, parsed=None):
+    tree = load_parsed_file(file_path, parsed).parse(strict=True)
 
     functions = []
     relative_path = os.path.relpath(file_path, base_path)
@@ -6,6 +6,7 @@ import threading
 import customtkinter as ctk
 from tkinter import filedialog
 from CodeHunter.analyzers.system_doctor import run_code_doctor
+from CodeHunter.core.findings_store import FindingsStore
 
 
 class Sidebar(ctk.CTkFrame):
@@ -161,10 +162,12 @@ class Sidebar(ctk.CTkFrame):
         try:
             result = run_code_doctor(
                 self.state.project_path,
-                level=self.analysis_level.get()
+                level=self.analysis_level.get(),
+                parsed=self.state.parsed
             )
             self.state.diagnosis_data = result
             self.state.findings       = result.get("findings", [])
+            self.state.findings_store = FindingsStore(self.state.findings)
             self.state.health_score   = result.get("score", 0.0)
             self.state.status         = "DONE"
             self.state.notify("analysis_done", result)
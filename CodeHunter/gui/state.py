@@ -6,6 +6,9 @@ import logging
 from dataclasses import dataclass, field
 from typing import Any
 
+from CodeHunter.core.parsed_project import ParsedProject
+from CodeHunter.core.findings_store import FindingsStore
+
 
 @dataclass
 class AppState:
@@ -18,12 +21,18 @@ class AppState:
     # Hallazgos procesados
     findings: list = field(default_factory=list)
 
+    # Los mismos hallazgos en columnas, para contadores y filtros
+    findings_store: FindingsStore = field(default_factory=FindingsStore, repr=False)
+
     # Score de salud (0-100)
     health_score: float = 0.0
 
     # Estado general
     status: str = "IDLE"   # IDLE | RUNNING | DONE | ERROR
 
+    # Archivos leídos y parseados, compartidos entre vistas y análisis
+    parsed: ParsedProject = field(default_factory=ParsedProject, repr=False)
+
     # Callbacks para notificar a las vistas cuando cambia el estado
     _listeners: list = field(default_factory=list, repr=False)
 
@@ -42,6 +51,8 @@ class AppState:
     def reset(self):
         self.diagnosis_data = {}
         self.findings = []
+        self.findings_store = FindingsStore()
         self.health_score = 0.0
         self.status = "IDLE"
+        self.parsed.clear()
         self.notify("reset")
@@ -14,12 +14,14 @@ import time
 from tkinter import filedialog, messagebox
 from ..utils import get_level as _level, get_attr as _attr
 from CodeHunter.utils.project_walker import walk_python_files
+from CodeHunter.core.parsed_project import load_parsed_file
+from CodeHunter.core.models import Level
 from CodeHunter.infrastructure.pdf_exporter import export_report_to_pdf
 
 
 logger = logging.getLogger(__name__)
 
-def _scan_project(path):
+def _scan_project(path, parsed=None):
     """Lee el proyecto y retorna estadísticas + muestra de código."""
     stats = {"files": 0, "lines": 0, "functions": 0, "classes": 0, "modules": set()}
     code_sample = []
@@ -35,8 +37,10 @@ def _scan_project(path):
             stats["modules"].add(top)
 
         try:
-            with open(fpath, encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
+            parsed_file = load_parsed_file(fpath, parsed)
+            lines = parsed_file.lines
+            if not lines[-1]:
+                lines = lines[:-1]  # el salto de línea final no abre otra línea
             stats["lines"] += len(lines)
             for line in lines:
                 s = line.strip()
@@ -47,7 +51,7 @@ def _scan_project(path):
             if len(code_sample) < 3 and len(lines) > 5:
                 code_sample.append({
                     "file": os.path.relpath(fpath, path),
-                    "code": "".join(lines[:40]),
+                    "code": parsed_file.text_until_line(40),
                 })
         except Exception as e:
             logger.warning(f"[ProjectScan] No se pudo leer {fpath} ({type(e).__name__}): {e}")
@@ -347,7 +351,7 @@ class DashboardView(ctk.CTkFrame):
         path  = self.state.project_path
         self.after(50, lambda: self.animate_gauge(score))
         self._update_status_badge(score)
-        self._update_counters(finds)
+        self._update_counters()
         if path:
             threading.Thread(target=self._generate_project_info, args=(path,), daemon=True).start()
         self._render_recent_findings(finds)
@@ -359,11 +363,11 @@ class DashboardView(ctk.CTkFrame):
         else:             badge_color, badge_text = C["accent_red"],    "  CRITICAL  "
         self.status_badge.configure(text=badge_text, fg_color=badge_color, text_color="#0D1117")
 
-    def _update_counters(self, finds):
-        def count(level): return sum(1 for f in finds if _level(f) == level)
-        self.counter_critical.configure(text=str(count("critical")))
-        self.counter_warning.configure(text=str(count("warning")))
-        self.counter_info.configure(text=str(count("info")))
+    def _update_counters(self):
+        counts = self.state.findings_store.count_by_level()
+        self.counter_critical.configure(text=str(counts.get(Level.CRITICAL, 0)))
+        self.counter_warning.configure(text=str(counts.get(Level.WARNING, 0)))
+        self.counter_info.configure(text=str(counts.get(Level.INFO, 0)))
 
     def _render_recent_findings(self, finds):
         C = self.colors
@@ -406,7 +410,7 @@ class DashboardView(ctk.CTkFrame):
 
     def _generate_project_info(self, path):
         project_name = os.path.basename(path)
-        stats, code_sample = _scan_project(path)
+        stats, code_sample = _scan_project(path, self.state.parsed)
         self.after(0, lambda: self._update_stats(stats))
         self.after(0, lambda: self.readme_label.configure(
             text="🤖  Analizando código con IA...", text_color=self.colors["text_muted"]))
@@ -448,12 +452,14 @@ class DashboardView(ctk.CTkFrame):
         try:
             finds    = self.state.findings
             score    = self.state.health_score
-            critical = sum(1 for f in finds if _level(f) == "critical")
-            warnings = sum(1 for f in finds if _level(f) == "warning")
+            counts   = self.state.findings_store.count_by_level()
+            critical = counts.get(Level.CRITICAL, 0)
+            warnings = counts.get(Level.WARNING, 0)
             output_path = export_report_to_pdf(
                 self.state.project_path,
                 f"Proyecto: {self.state.project_path}\nTotal hallazgos: {len(finds)}",
                 {"score": score, "critical": critical, "warnings": warnings, "findings": finds},
+                output_path=save_path,
             )
             messagebox.showinfo("✅ Exportado", f"PDF guardado en:\n{output_path}")
         except Exception as e:
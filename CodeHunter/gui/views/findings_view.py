@@ -83,7 +83,7 @@ class FindingsView(ctk.CTkFrame):
         status = self.state.status
         filtered = (
             finds if self._filter == "all"
-            else [f for f in finds if _level(f) == self._filter]
+            else self.state.findings_store.where(level=self._filter.upper())
         )
 
         if not filtered:
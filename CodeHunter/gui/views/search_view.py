@@ -1,15 +1,30 @@
 """
 CodeHunter GUI - Vista Búsqueda
-Buscador de texto en el código del proyecto.
+Buscador de texto en el código del proyecto, con sugerencias de símbolos
+(búsqueda aproximada) mientras se escribe.
 """
 
 import os
+import time
 import threading
 import customtkinter as ctk
 import logging
+from CodeHunter.core.parsed_project import load_parsed_file
+from CodeHunter.infrastructure.trigram_index import get_trigram_index
+from CodeHunter.infrastructure.symbol_index import get_symbol_index
+from CodeHunter.analyzers.code_query import parse_query, iter_query
 
 logger = logging.getLogger(__name__)
 
+MAX_RESULTS = 200
+
+# Sugerencias mientras se escribe
+SUGGEST_DELAY_MS = 150
+SUGGEST_MIN_LENGTH = 2
+MAX_SUGGESTIONS = 20
+# Como mucho una actualización del índice de símbolos cada tantos segundos
+SUGGEST_REFRESH_SECONDS = 5
+
 
 class SearchView(ctk.CTkFrame):
     def __init__(self, parent, state, colors):
@@ -18,6 +33,9 @@ class SearchView(ctk.CTkFrame):
         self.grid_rowconfigure(2, weight=1)
         self.state  = state
         self.colors = colors
+        self._suggest_job = None
+        self._suggest_token = 0
+        self._last_refresh = {}
         self._build_search()
 
     def _build_search(self):
@@ -32,13 +50,14 @@ class SearchView(ctk.CTkFrame):
         search_bar.grid_columnconfigure(0, weight=1)
 
         self.search_entry = ctk.CTkEntry(search_bar,
-            placeholder_text="🔍  Busca funciones, variables, imports...",
+            placeholder_text="🔍  Busca funciones, variables, imports...  (re:, call:, def:params>N)",
             font=ctk.CTkFont(size=13), height=42,
             fg_color=C["bg_card"], border_color=C["border"],
             text_color=C["text_primary"], corner_radius=8,
         )
         self.search_entry.grid(row=0, column=0, sticky="ew", padx=(0, 10))
         self.search_entry.bind("<Return>", lambda e: self._do_search())
+        self.search_entry.bind("<KeyRelease>", self._schedule_suggestions)
 
         ctk.CTkButton(search_bar,
             text="Buscar",
@@ -56,6 +75,7 @@ class SearchView(ctk.CTkFrame):
         ).pack(pady=40)
 
     def _do_search(self):
+        self._cancel_suggestions()
         query = self.search_entry.get().strip()
         if not query:
             return
@@ -69,34 +89,117 @@ class SearchView(ctk.CTkFrame):
         results = []
         root = self.state.project_path
         query_lower = query.lower()
+        parsed = self.state.parsed
+
+        try:
+            structured = parse_query(query)
+        except ValueError as e:
+            message = f"⚠️  Consulta inválida: {e}"
+            self.after(0, lambda: self._show_message(message))
+            return
+
+        if structured is not None:
+            # consultas re: / call: / def: — se corta al llegar al máximo
+            for match in iter_query(root, structured, parsed):
+                results.append({
+                    "file": os.path.relpath(match["file"], root),
+                    "line": match["line"],
+                    "content": match["content"],
+                })
+                if len(results) >= MAX_RESULTS:
+                    break
+            self.after(0, lambda: self._render_results(query, results))
+            return
 
         try:
-            for dirpath, _, files in os.walk(root):
-                parts = dirpath.replace("\\", "/").split("/")
-                if any(p in ("__pycache__", ".venv", "venv", ".git") for p in parts):
+            # solo se leen los archivos que contienen los trigramas de la consulta
+            index = get_trigram_index(root)
+            index.refresh(parsed)
+
+            for fpath in index.candidates(query):
+                try:
+                    lines = load_parsed_file(fpath, parsed).lines
+                except Exception as e:
+                    logger.warning(f"[SearchView] No se pudo leer {fpath} ({type(e).__name__}): {e}")
                     continue
-                for fname in files:
-                    if not fname.endswith(".py"):
-                        continue
-                    fpath = os.path.join(dirpath, fname)
-                    try:
-                        with open(fpath, encoding="utf-8", errors="ignore") as f:
-                            for lineno, line in enumerate(f, 1):
-                                if query_lower in line.lower():
-                                    rel = os.path.relpath(fpath, root)
-                                    results.append({"file": rel, "line": lineno, "content": line.rstrip()})
-                                    if len(results) >= 200:
-                                        break
-                    except Exception as e:
-                        logger.warning(f"[SearchView] No se pudo leer {fpath} ({type(e).__name__}): {e}")
-                if len(results) >= 200:
+                for lineno, line in enumerate(lines, 1):
+                    if query_lower in line.lower():
+                        rel = os.path.relpath(fpath, root)
+                        results.append({"file": rel, "line": lineno, "content": line.rstrip()})
+                        if len(results) >= MAX_RESULTS:
+                            break
+                if len(results) >= MAX_RESULTS:
                     break
         except Exception as e:
-            logger.warning(f"[SearchView] No se pudo leer {fpath} ({type(e).__name__}): {e}")
+            logger.warning(f"[SearchView] Error en la búsqueda de {query!r} ({type(e).__name__}): {e}")
 
         self.after(0, lambda: self._render_results(query, results))
 
-    def _render_results(self, query: str, results: list):
+    # ──────────────────────────────────────────────────────────────────────
+    # Sugerencias mientras se escribe
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _schedule_suggestions(self, event=None):
+        """Espera a que se deje de teclear SUGGEST_DELAY_MS antes de buscar."""
+        if event is not None and event.keysym == "Return":
+            return
+
+        self._cancel_suggestions()
+        query = self.search_entry.get().strip()
+
+        # solo nombres: las consultas re: / call: / def: y el texto libre esperan a Enter
+        if len(query) < SUGGEST_MIN_LENGTH or not query.isidentifier() or not self.state.project_path:
+            return
+
+        self._suggest_job = self.after(SUGGEST_DELAY_MS, lambda: self._start_suggestions(query))
+
+    def _cancel_suggestions(self):
+        if self._suggest_job is not None:
+            self.after_cancel(self._suggest_job)
+            self._suggest_job = None
+        # descarta las sugerencias que sigan en curso
+        self._suggest_token += 1
+
+    def _start_suggestions(self, query: str):
+        self._suggest_job = None
+        token = self._suggest_token
+        threading.Thread(target=self._suggest_symbols, args=(query, token), daemon=True).start()
+
+    def _suggest_symbols(self, query: str, token: int):
+        root = self.state.project_path
+        results = []
+
+        try:
+            index = get_symbol_index(root)
+
+            # al teclear no se recorre el proyecto en cada pulsación
+            now = time.monotonic()
+            if now - self._last_refresh.get(root, 0) > SUGGEST_REFRESH_SECONDS:
+                index.refresh(parsed=self.state.parsed)
+                self._last_refresh[root] = now
+
+            for score, name in index.fuzzy().search(query, MAX_SUGGESTIONS):
+                if token != self._suggest_token:
+                    return
+                for symbol in index.definitions(name):
+                    results.append({
+                        "file": os.path.relpath(symbol["file"], root),
+                        "line": symbol["line"],
+                        "content": symbol["content"] or name,
+                    })
+        except Exception as e:
+            logger.warning(f"[SearchView] Error en las sugerencias de {query!r} ({type(e).__name__}): {e}")
+            return
+
+        self.after(0, lambda: self._render_suggestions(query, results, token))
+
+    def _render_suggestions(self, query: str, results: list, token: int):
+        # si se siguió escribiendo o se pulsó Enter, estas ya no sirven
+        if token != self._suggest_token or not results:
+            return
+        self._render_results(query, results[:MAX_RESULTS], title="símbolo(s) parecido(s) a")
+
+    def _render_results(self, query: str, results: list, title: str = "resultado(s) para"):
         C = self.colors
         for w in self.results_frame.winfo_children():
             w.destroy()
@@ -109,7 +212,7 @@ class SearchView(ctk.CTkFrame):
             return
 
         ctk.CTkLabel(self.results_frame,
-            text=f'  {len(results)} resultado(s) para "{query}"',
+            text=f'  {len(results)} {title} "{query}"',
             font=ctk.CTkFont(size=12), text_color=C["text_muted"],
         ).pack(anchor="w", pady=(4, 12))
 
@@ -5,6 +5,7 @@ Muestra la estructura con líneas tipo ├── └──
 
 import os
 import customtkinter as ctk
+from CodeHunter.utils.project_walker import get_manifest
 
 
 class TreeView(ctk.CTkFrame):
@@ -54,35 +55,39 @@ class TreeView(ctk.CTkFrame):
             text_color=C["accent"], anchor="w",
         ).pack(fill="x", padx=12, pady=(8, 2))
 
-        self._render_dir(path, prefix="")
+        # mismas carpetas y exclusiones que el análisis, sin volver a recorrer el disco
+        self._render_dir(get_manifest(path).directories(), path, prefix="")
 
-    def _render_dir(self, dir_path, prefix):
+    def _render_dir(self, directories, dir_path, prefix):
         C = self.colors
-        IGNORE = {".git", "__pycache__", ".venv", "venv", "node_modules", ".idea", ".vscode"}
 
-        try:
-            entries = sorted(os.scandir(dir_path), key=lambda e: (not e.is_dir(), e.name))
-            entries = [e for e in entries if e.name not in IGNORE and not e.name.startswith(".")]
-        except PermissionError:
+        directory = directories.get(dir_path)
+        if directory is None:
             return
 
-        for i, entry in enumerate(entries):
+        # carpetas primero, después archivos, cada grupo por nombre
+        entries = sorted(
+            [(False, os.path.basename(subdir), subdir) for subdir in directory.subdirs]
+            + [(True, entry.name, entry.path) for entry in directory.files]
+        )
+
+        for i, (is_file, entry_name, entry_path) in enumerate(entries):
             is_last = (i == len(entries) - 1)
-            is_dir  = entry.is_dir()
+            is_dir  = not is_file
 
             # Conector ├── o └──
             connector = "└── " if is_last else "├── "
-            icon      = self._file_icon(entry.name, is_dir)
+            icon      = self._file_icon(entry_name, is_dir)
 
             # Color según tipo
             if is_dir:
                 color  = C["accent"]
                 weight = "bold"
-                name   = entry.name + "/"
+                name   = entry_name + "/"
             else:
                 color  = C["text_primary"]
                 weight = "normal"
-                name   = entry.name
+                name   = entry_name
 
             line = f"{prefix}{connector}{icon} {name}"
 
@@ -95,7 +100,7 @@ class TreeView(ctk.CTkFrame):
             # Recursión con el prefijo correcto
             if is_dir and prefix.count("│") + prefix.count(" ") // 4 < 4:
                 extension = "    " if is_last else "│   "
-                self._render_dir(entry.path, prefix + extension)
+                self._render_dir(directories, entry_path, prefix + extension)
 
     def _file_icon(self, name: str, is_dir: bool) -> str:
         if is_dir:
@@ -1,15 +1,28 @@
-from .function_parser import extract_functions
+import os
 
-def build_function_index(python_files, base_path):
-    index = {}
-    total = len(python_files)
+from .infrastructure.symbol_index import SymbolIndex
+
+def build_function_index(python_files, base_path, parsed=None, symbol_index=None):
+    """
+    Índice {nombre: [funciones]} construido sobre la tabla de símbolos
+    persistente: solo se parsean los archivos nuevos o modificados.
+    """
+    symbol_index = symbol_index or SymbolIndex(base_path)
+    print(f"🔍 Indexando {len(python_files)} archivos...")
+    symbol_index.refresh(python_files, parsed)
 
-    for i, file in enumerate(python_files, start=1):
-        print(f"🔍 [{i}/{total}] Analizando: {file}")
+    index = {}
 
-        functions = extract_functions(file, base_path)
+    for symbol in symbol_index.functions(python_files):
+        relative_path = os.path.relpath(symbol["file"], base_path)
+        folder, file = os.path.split(relative_path)
 
-        for fn in functions:
-            index.setdefault(fn["name"], []).append(fn)
+        index.setdefault(symbol["name"], []).append({
+            "name": symbol["name"],
+            "signature": symbol["signature"],
+            "line": symbol["line"],
+            "file": file,
+            "folder": folder or "."
+        })
 
     return index
@@ -0,0 +1,247 @@
+"""
+CodeHunter - Exportación incremental de hallazgos (NDJSON y SARIF 2.1.0)
+Los exportadores reciben los hallazgos de cada archivo en cuanto el análisis
+los produce (write_findings) y los escriben y vacían al disco de inmediato:
+la memoria no crece con el tamaño del proyecto y otras herramientas pueden
+leer la salida (tail -f) mientras el análisis sigue en marcha.
+"""
+
+import os
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from urllib.parse import quote
+
+from .. import __version__
+from ..core.models import CYCLE_SEPARATOR
+
+
+TOOL_NAME = "CodeHunter"
+TOOL_URI = "https://github.com/Jeremy2730/Code-Hunter-Analizer"
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SRCROOT = "SRCROOT"
+# Marca que se sustituye por los resultados al dividir el documento
+_RESULTS_PLACEHOLDER = "__codehunter_results__"
+
+# Severidad de CodeHunter -> nivel de SARIF
+SARIF_LEVELS = {
+    "BLOCKER": "error",
+    "CRITICAL": "error",
+    "MAJOR": "warning",
+    "MINOR": "note",
+    "INFO": "note",
+}
+
+NDJSON = "ndjson"
+SARIF = "sarif"
+
+# Extensiones reconocidas por open_exporter()
+_FORMATS_BY_SUFFIX = {
+    ".ndjson": NDJSON,
+    ".jsonl": NDJSON,
+    ".sarif": SARIF,
+}
+
+
+class _StreamExporter(ABC):
+    """Base: archivo (o stream) de salida, context manager y close()."""
+
+    def __init__(self, output):
+        self._owns_stream = isinstance(output, (str, os.PathLike))
+        self._stream = open(output, "w", encoding="utf-8") if self._owns_stream else output
+        self.count = 0
+
+    @abstractmethod
+    def write_findings(self, findings):
+        """Escribe los hallazgos (AdvancedFinding) y vacía la salida."""
+
+    def close(self):
+        if self._stream is None:
+            return
+        self._finish()
+        self._stream.flush()
+        if self._owns_stream:
+            self._stream.close()
+        self._stream = None
+
+    def _finish(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SeverityCounter:
+    """
+    Sink que solo cuenta los hallazgos por severidad (p. ej. para decidir
+    el código de salida sin guardar los hallazgos).
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._counts = {}
+
+    def write_findings(self, findings):
+        for finding in findings:
+            self._counts[finding.severity] = self._counts.get(finding.severity, 0) + 1
+        self.count += len(findings)
+
+    def count_by_severity(self):
+        """{Severity: cantidad}, como FindingsStore.count_by_severity()."""
+        return dict(self._counts)
+
+
+class NdjsonExporter(_StreamExporter):
+    """Un objeto JSON por línea, con el mismo formato que AdvancedFinding.to_dict()."""
+
+    def write_findings(self, findings):
+        if not findings:
+            return
+        for finding in findings:
+            self._stream.write(json.dumps(finding.to_dict(), ensure_ascii=False))
+            self._stream.write("\n")
+        self.count += len(findings)
+        self._stream.flush()
+
+
+class SarifExporter(_StreamExporter):
+    """
+    Un log SARIF 2.1.0 con un solo run. La cabecera se escribe al abrir y
+    cada resultado en cuanto llega; el documento queda completo (JSON
+    válido) al llamar a close().
+
+    Las rutas se escriben relativas a project_path (uriBaseId SRCROOT).
+    Un ciclo de imports tiene una ubicación por módulo. Los hallazgos no
+    tienen un id de regla propio: ruleId es la categoría, y el CWE va en
+    las propiedades.
+    """
+
+    def __init__(self, output, project_path=None):
+        super().__init__(output)
+        self.project_path = os.path.abspath(project_path) if project_path else None
+        self._tail = ""
+        self._write_header()
+
+    def _write_header(self):
+        """Escribe el documento hasta la apertura del array de resultados."""
+        run = {
+            "tool": {
+                "driver": {
+                    "name": TOOL_NAME,
+                    "version": __version__,
+                    "informationUri": TOOL_URI,
+                }
+            },
+        }
+        if self.project_path:
+            run["originalUriBaseIds"] = {
+                SRCROOT: {"uri": Path(self.project_path).as_uri() + "/"}
+            }
+
+        run["results"] = [_RESULTS_PLACEHOLDER]
+
+        document = json.dumps(
+            {"$schema": SARIF_SCHEMA, "version": SARIF_VERSION, "runs": [run]},
+            ensure_ascii=False
+        )
+        head, self._tail = document.split(json.dumps(_RESULTS_PLACEHOLDER))
+
+        self._stream.write(head + "\n")
+        self._stream.flush()
+
+    def write_findings(self, findings):
+        if not findings:
+            return
+        for finding in findings:
+            if self.count:
+                self._stream.write(",\n")
+            self._stream.write(json.dumps(self._result(finding), ensure_ascii=False))
+            self.count += 1
+        self._stream.flush()
+
+    def _finish(self):
+        self._stream.write("\n" + self._tail + "\n")
+
+    def _result(self, finding):
+        severity = finding.severity.value
+        message = finding.message
+        modules = finding.file.split(CYCLE_SEPARATOR)
+
+        if len(modules) > 1:
+            message = f"{message}: {finding.file}"
+            # ciclo de imports: el campo file no es una ruta sino la cadena de módulos
+            locations = [
+                {"physicalLocation": {"artifactLocation": self._project_artifact(module)}}
+                for module in modules
+            ]
+        else:
+            location = {"artifactLocation": self._artifact(finding.file)}
+
+            # SARIF exige startLine >= 1 (los hallazgos de proyecto usan línea 0)
+            if isinstance(finding.line, int) and finding.line >= 1:
+                region = {"startLine": finding.line}
+                if finding.code_snippet:
+                    region["snippet"] = {"text": finding.code_snippet}
+                location["region"] = region
+
+            locations = [{"physicalLocation": location}]
+
+        properties = {"severity": severity, "category": finding.category.value}
+        if finding.cwe_id:
+            properties["cwe"] = finding.cwe_id
+        if finding.suggestion:
+            properties["suggestion"] = finding.suggestion
+
+        return {
+            "ruleId": finding.category.value,
+            "level": SARIF_LEVELS.get(severity, "note"),
+            "message": {"text": message},
+            "locations": locations,
+            "properties": properties,
+        }
+
+    def _artifact(self, file_path):
+        # las rutas de los hallazgos son relativas al directorio de trabajo (ver PathTable)
+        absolute = os.path.abspath(file_path)
+
+        if self.project_path:
+            relative = os.path.relpath(absolute, self.project_path)
+            if not relative.startswith(os.pardir):
+                return {"uri": quote(relative.replace(os.sep, "/")), "uriBaseId": SRCROOT}
+
+        return {"uri": Path(absolute).as_uri()}
+
+    def _project_artifact(self, rel_path):
+        """Ruta relativa a la raíz del proyecto (módulos de un ciclo)."""
+        uri = quote(rel_path.replace(os.sep, "/"))
+        if self.project_path:
+            return {"uri": uri, "uriBaseId": SRCROOT}
+        return {"uri": uri}
+
+
+def exporter_format(output_path):
+    """NDJSON o SARIF según la extensión (.ndjson/.jsonl, .sarif/.sarif.json)."""
+    name = str(output_path).lower()
+    if name.endswith(".sarif.json"):
+        return SARIF
+    return _FORMATS_BY_SUFFIX.get(os.path.splitext(name)[1])
+
+
+def open_exporter(output_path, fmt=None, project_path=None):
+    """
+    Crea el exportador para output_path. fmt: NDJSON o SARIF; por defecto
+    se deduce de la extensión. Lanza ValueError si no se reconoce.
+    """
+    fmt = fmt or exporter_format(output_path)
+
+    if fmt == NDJSON:
+        return NdjsonExporter(output_path)
+    if fmt == SARIF:
+        return SarifExporter(output_path, project_path)
+
+    raise ValueError(f"Formato de exportación no reconocido para {output_path} (usa .ndjson o .sarif)")
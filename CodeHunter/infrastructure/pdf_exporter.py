@@ -1,79 +1,313 @@
+"""
+CodeHunter - Exportación del informe a PDF
+Los hallazgos se agrupan por archivo en tablas y se resumen por regla; el
+detalle se limita por regla y en total, de modo que el PDF de un proyecto
+con cientos de miles de hallazgos sigue siendo legible y rápido de generar.
+Los flowables se generan a medida que se maquetan las páginas en lugar de
+construir toda la historia antes de empezar.
+"""
+
 import os
+import re
+from collections import Counter
 from datetime import datetime
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+
+# Hallazgos detallados como máximo por regla y en todo el informe
+DEFAULT_MAX_PER_RULE = 25
+DEFAULT_MAX_DETAIL = 2000
+
+# Archivos listados en el resumen de archivos con más hallazgos
+TOP_FILES = 20
+
+# Filas por tabla: las tablas largas se parten en bloques para que
+# reportlab no tenga que volver a dividir una tabla enorme en cada página
+TABLE_CHUNK_ROWS = 100
+
+# Flowables que se piden al generador cada vez que la historia se vacía,
+# y mínimo que se mantiene cargado (keepWithNext mira los siguientes).
+# Ver _StreamingDocTemplate; probado con reportlab 4.4 (requirements.txt)
+STORY_BATCH = 50
+STORY_LOOKAHEAD = 4
+
+# Caracteres máximos de un mensaje o sugerencia dentro de una celda
+MAX_CELL_CHARS = 300
 
-def export_report_to_pdf(project_path, profile_description, analysis_data):
-    project_name = os.path.basename(project_path)
+# Partes variables de un mensaje (nombres, números, archivos, paréntesis):
+# lo que queda es la regla que produjo el hallazgo
+_RULE_NOISE = re.compile(r"'[^']*'|\"[^\"]*\"|\([^)]*\)|\S+\.py\b|\d+(?:\.\d+)?")
+_SPACES = re.compile(r"\s+")
+
+NO_LINE = -1
+
+HEADER_BACKGROUND = colors.HexColor("#2b2b2b")
+ROW_BACKGROUNDS = (colors.white, colors.HexColor("#f2f2f2"))
+
+
+def default_report_path(project_path, directory=None):
+    """
+    Ruta del informe: directory (o ~/Downloads si existe, si no el
+    directorio actual) / CodeHunter_Report_<proyecto>_<fecha>.pdf
+    """
+    if directory is None:
+        downloads = os.path.join(os.path.expanduser("~"), "Downloads")
+        directory = downloads if os.path.isdir(downloads) else os.getcwd()
+
+    project_name = os.path.basename(os.path.abspath(project_path))
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(directory, f"CodeHunter_Report_{project_name}_{timestamp}.pdf")
+
+
+def rule_key(finding):
+    """Regla de un hallazgo: su mensaje sin las partes variables."""
+    message = _RULE_NOISE.sub("…", finding.message).split(":")[0]
+    return _SPACES.sub(" ", message).strip()
 
-    downloads_path = os.path.join(os.path.expanduser("~"), "Downloads")
-    filename = os.path.join(
-        downloads_path,
-        f"CodeHunter_Report_{project_name}_{timestamp}.pdf"
-    )
 
-    doc = SimpleDocTemplate(filename)
-    elements = []
+def export_report_to_pdf(project_path, profile_description, analysis_data,
+                         output_path=None, max_per_rule=DEFAULT_MAX_PER_RULE,
+                         max_detail=DEFAULT_MAX_DETAIL):
+    """
+    Genera el informe y devuelve su ruta.
 
+    output_path: archivo .pdf o directorio donde crearlo (por defecto, ver
+    default_report_path). max_per_rule / max_detail: hallazgos detallados
+    como máximo por regla y en total; el resto solo cuenta en los resúmenes.
+    """
+    if output_path is None or os.path.isdir(output_path):
+        filename = default_report_path(project_path, output_path)
+    else:
+        filename = output_path
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    os.makedirs(directory, exist_ok=True)
+
+    doc = _StreamingDocTemplate(filename)
+    doc.build_streamed(_report_flowables(
+        doc, project_path, profile_description, analysis_data, max_per_rule, max_detail
+    ))
+    return filename
+
+
+class _StreamingDocTemplate(SimpleDocTemplate):
+    """
+    SimpleDocTemplate cuya historia sale de un generador. filterFlowables()
+    (gancho de reportlab que se llama antes de maquetar cada flowable)
+    completa la lista con el siguiente lote, así que los flowables se crean
+    a medida que se maquetan y se liberan tras dibujarse.
+    """
+
+    _story = None
+    _pending = None
+
+    def build_streamed(self, flowables):
+        self._pending = iter(flowables)
+        self._story = list(islice(self._pending, STORY_BATCH))
+        self.build(self._story)
+
+        # si build() dejara de llamar a filterFlowables(), el informe saldría cortado
+        if self._pending is not None and next(self._pending, None) is not None:
+            raise RuntimeError("reportlab no consumió toda la historia del informe")
+
+    def filterFlowables(self, flowables):
+        # también se llama con listas internas de reportlab (p. ej. las de PageBegin)
+        if flowables is not self._story or self._pending is None:
+            return
+
+        if len(flowables) < STORY_LOOKAHEAD:
+            batch = list(islice(self._pending, STORY_BATCH))
+            if batch:
+                flowables.extend(batch)
+            else:
+                self._pending = None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Contenido
+# ──────────────────────────────────────────────────────────────────────────
+
+def _report_flowables(doc, project_path, profile_description, analysis_data,
+                      max_per_rule, max_detail):
     styles = getSampleStyleSheet()
     title_style = styles["Title"]
     heading_style = styles["Heading2"]
+    file_style = styles["Heading4"]
     normal_style = styles["Normal"]
+    cell_style = ParagraphStyle("Cell", parent=normal_style, fontSize=8, leading=10)
 
     # TÍTULO
-    elements.append(Paragraph("CODE HUNTER", title_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    elements.append(Paragraph("Informe Profesional de Diagnóstico", heading_style))
-    elements.append(Spacer(1, 0.4 * inch))
+    yield Paragraph("CODE HUNTER", title_style)
+    yield Spacer(1, 0.2 * inch)
+    yield Paragraph("Informe Profesional de Diagnóstico", heading_style)
+    yield Spacer(1, 0.4 * inch)
 
     # PERFIL
-    elements.append(Paragraph("1. Perfil del Sistema Analizado", heading_style))
-    elements.append(Spacer(1, 0.2 * inch))
+    yield Paragraph("1. Perfil del Sistema Analizado", heading_style)
+    yield Spacer(1, 0.2 * inch)
 
     for line in profile_description.split("\n"):
         if line.strip():
-            elements.append(Paragraph(line, normal_style))
-            elements.append(Spacer(1, 0.15 * inch))
+            yield Paragraph(escape(line), normal_style)
+            yield Spacer(1, 0.15 * inch)
 
-    elements.append(Spacer(1, 0.4 * inch))
+    yield Spacer(1, 0.4 * inch)
 
     # RESULTADOS
-    elements.append(Paragraph("2. Resultado del Análisis", heading_style))
-    elements.append(Spacer(1, 0.2 * inch))
-
-    critical = analysis_data.get("critical", 0)
-    warnings = analysis_data.get("warnings", 0)
-    score = analysis_data.get("score", 0)
-
-    elements.append(Paragraph(f"Índice de Salud: {score}/100", normal_style))
-    elements.append(Paragraph(f"Problemas críticos: {critical}", normal_style))
-    elements.append(Paragraph(f"Advertencias: {warnings}", normal_style))
-    elements.append(Spacer(1, 0.3 * inch))
-
-    # DETALLE
-    elements.append(Paragraph("3. Detalle de Hallazgos", heading_style))
-    elements.append(Spacer(1, 0.2 * inch))
+    yield Paragraph("2. Resultado del Análisis", heading_style)
+    yield Spacer(1, 0.2 * inch)
 
     findings = analysis_data.get("findings", [])
 
+    yield Paragraph(f"Índice de Salud: {analysis_data.get('score', 0)}/100", normal_style)
+    yield Paragraph(f"Problemas críticos: {analysis_data.get('critical', 0)}", normal_style)
+    yield Paragraph(f"Advertencias: {analysis_data.get('warnings', 0)}", normal_style)
+    yield Paragraph(f"Total de hallazgos: {len(findings)}", normal_style)
+    yield Spacer(1, 0.3 * inch)
+
     if not findings:
-        elements.append(Paragraph("No se detectaron problemas relevantes.", normal_style))
+        yield Paragraph("3. Detalle de Hallazgos", heading_style)
+        yield Spacer(1, 0.2 * inch)
+        yield Paragraph("No se detectaron problemas relevantes.", normal_style)
     else:
-        for f in findings:
-            level = f.level.value if hasattr(f.level, "value") else f.level
-            elements.append(Paragraph(f"[{level}] {f.message}", normal_style))
-            elements.append(Paragraph(f"Archivo: {f.file}", normal_style))
-            elements.append(Paragraph(f"Línea: {f.line}", normal_style))
-            elements.append(Paragraph(f"Sugerencia: {f.suggestion}", normal_style))
-            elements.append(Spacer(1, 0.3 * inch))
-
-    elements.append(Spacer(1, 0.5 * inch))
-    elements.append(Paragraph(
+        rules = [rule_key(finding) for finding in findings]
+        by_file, shown_by_rule = _select_detail(findings, rules, max_per_rule, max_detail)
+        shown = sum(shown_by_rule.values())
+
+        # RESUMEN POR REGLA
+        yield Paragraph("3. Resumen por Regla", heading_style)
+        yield Spacer(1, 0.2 * inch)
+
+        rule_rows = [
+            [Paragraph(escape(rule), cell_style), count, shown_by_rule.get(rule, 0)]
+            for rule, count in Counter(rules).most_common()
+        ]
+        yield from _tables(["Regla", "Hallazgos", "Detallados"], rule_rows,
+                           [doc.width - 1.6 * inch, 0.8 * inch, 0.8 * inch])
+        yield Spacer(1, 0.3 * inch)
+
+        # ARCHIVOS CON MÁS HALLAZGOS
+        yield Paragraph("4. Archivos con más Hallazgos", heading_style)
+        yield Spacer(1, 0.2 * inch)
+
+        file_counts = Counter(finding.file for finding in findings)
+        file_rows = [
+            [Paragraph(escape(str(path)), cell_style), count]
+            for path, count in file_counts.most_common(TOP_FILES)
+        ]
+        yield from _tables(["Archivo", "Hallazgos"], file_rows,
+                           [doc.width - 0.8 * inch, 0.8 * inch])
+        yield Spacer(1, 0.3 * inch)
+
+        # DETALLE POR ARCHIVO
+        yield Paragraph("5. Detalle de Hallazgos", heading_style)
+        yield Spacer(1, 0.2 * inch)
+
+        if shown < len(findings):
+            yield Paragraph(
+                f"Se detallan {shown} de {len(findings)} hallazgos "
+                f"(máximo {max_per_rule} por regla y {max_detail} en total); "
+                "el resto se cuenta en el resumen por regla.",
+                normal_style
+            )
+            yield Spacer(1, 0.2 * inch)
+
+        widths = [0.6 * inch, 0.9 * inch, doc.width - 1.5 * inch]
+        for path in sorted(by_file):
+            rows = [
+                [_line_text(finding.line), _level_text(finding), _finding_cell(finding, cell_style)]
+                for finding in by_file[path]
+            ]
+            omitted = file_counts[path] - len(rows)
+
+            yield Paragraph(escape(str(path)), file_style)
+            yield from _tables(["Línea", "Nivel", "Hallazgo"], rows, widths)
+            if omitted:
+                yield Paragraph(f"… y {omitted} hallazgos más en este archivo.", cell_style)
+            yield Spacer(1, 0.15 * inch)
+
+    yield Spacer(1, 0.5 * inch)
+    yield Paragraph(
         f"Documento generado por CodeHunter — {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
         styles["Italic"]
-    ))
+    )
+
+
+def _select_detail(findings, rules, max_per_rule, max_detail):
+    """
+    Hallazgos a detallar agrupados por archivo ({ruta: [hallazgos por línea]})
+    y cuántos se detallan de cada regla. Se eligen recorriendo los archivos
+    en orden, hasta max_per_rule por regla y max_detail en total.
+    """
+    ordered = sorted(
+        range(len(findings)),
+        key=lambda i: (str(findings[i].file), _line_number(findings[i].line))
+    )
+
+    by_file = {}
+    shown_by_rule = Counter()
+    shown = 0
+
+    for i in ordered:
+        if shown >= max_detail:
+            break
+        rule = rules[i]
+        if shown_by_rule[rule] >= max_per_rule:
+            continue
+        shown_by_rule[rule] += 1
+        shown += 1
+        by_file.setdefault(findings[i].file, []).append(findings[i])
+
+    return by_file, shown_by_rule
+
+
+def _tables(header, rows, widths):
+    """Las filas en tablas de TABLE_CHUNK_ROWS con la cabecera repetida."""
+    for start in range(0, len(rows), TABLE_CHUNK_ROWS):
+        table = Table([header] + rows[start:start + TABLE_CHUNK_ROWS],
+                      colWidths=widths, repeatRows=1)
+        table.setStyle(_TABLE_STYLE)
+        yield table
+
+
+_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), HEADER_BACKGROUND),
+    ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), ROW_BACKGROUNDS),
+    ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+])
+
+
+def _finding_cell(finding, style):
+    text = escape(_truncate(finding.message))
+    if finding.suggestion:
+        text += f"<br/><i>Sugerencia: {escape(_truncate(finding.suggestion))}</i>"
+    return Paragraph(text, style)
+
+
+def _level_text(finding):
+    # hallazgos legacy (level) o avanzados (severity)
+    level = getattr(finding, "level", None) or getattr(finding, "severity", "")
+    return level.value if hasattr(level, "value") else str(level)
+
+
+def _line_number(line):
+    return line if type(line) is int else NO_LINE
+
+
+def _line_text(line):
+    return str(line) if type(line) is int and line >= 0 else "-"
+
 
-    doc.build(elements)
-    return filename
\ No newline at end of file
+def _truncate(text):
+    text = str(text)
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
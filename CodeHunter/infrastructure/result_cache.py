@@ -0,0 +1,216 @@
+"""
+CodeHunter - Caché persistente de resultados por archivo
+Guarda los findings y las contribuciones de hashes de duplicados de cada
+archivo, indexados por digest del contenido + versión + configuración.
+También guarda un manifiesto (mtime, tamaño, clave) por ruta para el
+análisis incremental, que evita leer los archivos sin cambios.
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+from .. import __version__
+from ..core.models import AdvancedFinding
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = ".codehunter_cache"
+CACHE_FILE_NAME = "results.json"
+
+# Subir si cambia el formato de las entradas guardadas
+CACHE_FORMAT = 5
+
+FINDING_KEYS = ("findings", "hotspot_findings")
+HASH_KEYS = ("smell_function_hashes", "function_hashes", "block_hashes", "clone_signatures")
+PLAIN_KEYS = ("facts",)
+
+
+def default_cache_dir(project_path):
+    return os.path.join(project_path, CACHE_DIR_NAME)
+
+
+class ResultCache:
+    """
+    Caché de resultados de analyze_file() persistida en un único JSON.
+
+    Solo se conservan las entradas usadas en la última ejecución, así que
+    el archivo no crece con versiones antiguas de los mismos archivos.
+    """
+
+    def __init__(self, project_path, config, cache_dir=None):
+        self.project_path = project_path
+        self.cache_dir = cache_dir or default_cache_dir(project_path)
+        self.cache_file = os.path.join(self.cache_dir, CACHE_FILE_NAME)
+
+        config_blob = json.dumps(config, sort_keys=True, default=str)
+        self._salt = f"{__version__}:{CACHE_FORMAT}:{config_blob}".encode()
+
+        self._entries, self._manifest = self._load()
+        self._used = {}
+        self._used_manifest = {}
+        self._dirty = False
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Claves
+    # ──────────────────────────────────────────────────────────────────────
+
+    def key_for_file(self, file_path, trust_manifest=False):
+        """
+        Digest del contenido del archivo (None si no se puede leer).
+
+        trust_manifest: reutilizar la clave de la ejecución anterior sin leer
+        el archivo si su mtime y tamaño no cambiaron.
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        rel_path = os.path.relpath(file_path, self.project_path)
+        previous = self._manifest.get(rel_path)
+
+        if trust_manifest and previous is not None:
+            mtime, size, key = previous
+            if mtime == stat.st_mtime_ns and size == stat.st_size and key in self._entries:
+                self._record(rel_path, stat, key)
+                return key
+
+        try:
+            with open(file_path, "rb") as f:
+                content = f.read()
+        except OSError:
+            return None
+
+        digest = hashlib.blake2b(self._salt, digest_size=16)
+        digest.update(content)
+        key = digest.hexdigest()
+
+        self._record(rel_path, stat, key)
+        return key
+
+    def _record(self, rel_path, stat, key):
+        entry = [stat.st_mtime_ns, stat.st_size, key]
+        if self._manifest.get(rel_path) != entry:
+            self._dirty = True
+        self._used_manifest[rel_path] = entry
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Lectura / escritura de entradas
+    # ──────────────────────────────────────────────────────────────────────
+
+    def has(self, key):
+        """True si hay un resultado guardado para la clave."""
+        return key is not None and key in self._entries
+
+    def lookup(self, key, file_path):
+        """
+        Retorna (True, resultado) si la clave está en caché, o (False, None).
+        El resultado puede ser None si el archivo se omitió en su momento.
+        """
+        if key is None or key not in self._entries:
+            return False, None
+
+        entry = self._entries[key]
+        self._used[key] = entry
+
+        return True, _decode_result(entry, file_path)
+
+    def store(self, key, result):
+        if key is None:
+            return
+
+        self._used[key] = _encode_result(result)
+        self._dirty = True
+
+    def save(self):
+        """Persiste solo las entradas y rutas usadas en esta ejecución."""
+        if (not self._dirty
+                and len(self._used) == len(self._entries)
+                and len(self._used_manifest) == len(self._manifest)):
+            return
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = self.cache_file + ".tmp"
+
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "format": CACHE_FORMAT,
+                    "entries": self._used,
+                    "manifest": self._used_manifest,
+                }, f)
+
+            os.replace(tmp_path, self.cache_file)
+
+        except OSError as e:
+            logger.warning(f"[ResultCache] No se pudo guardar la caché en {self.cache_dir}: {e}")
+            return
+
+        self._entries = self._used
+        self._manifest = self._used_manifest
+        self._used = {}
+        self._used_manifest = {}
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+
+        if data.get("format") != CACHE_FORMAT:
+            return {}, {}
+
+        return data.get("entries", {}), data.get("manifest", {})
+
+
+def _encode_result(result):
+    """Convierte el resultado de analyze_file() a JSON sin rutas absolutas."""
+    if result is None:
+        return None
+
+    encoded = {}
+
+    for key in FINDING_KEYS:
+        encoded[key] = []
+        for finding in result[key]:
+            data = finding.to_dict()
+            del data["file"]
+            encoded[key].append(data)
+
+    for key in HASH_KEYS:
+        encoded[key] = [
+            {k: v for k, v in entry.items() if k != "file"}
+            for entry in result[key]
+        ]
+
+    for key in PLAIN_KEYS:
+        encoded[key] = result[key]
+
+    return encoded
+
+
+def _decode_result(entry, file_path):
+    """Operación inversa de _encode_result() para la ruta actual del archivo."""
+    if entry is None:
+        return None
+
+    result = {"file": file_path}
+
+    for key in FINDING_KEYS:
+        result[key] = [
+            AdvancedFinding.from_dict({**data, "file": file_path})
+            for data in entry[key]
+        ]
+
+    for key in HASH_KEYS:
+        result[key] = [{**data, "file": file_path} for data in entry[key]]
+
+    for key in PLAIN_KEYS:
+        result[key] = entry[key]
+
+    return result
@@ -0,0 +1,334 @@
+"""
+CodeHunter - Índice persistente de símbolos (SQLite)
+Guarda la tabla de símbolos de cada archivo (nombre, tipo, archivo, línea
+y ámbito) en .codehunter_cache/symbols.db. Las búsquedas por nombre, por
+prefijo o por tipo de sentencia usan índices de SQLite en lugar de parsear
+el proyecto. Se actualiza por mtime y tamaño, o directamente con los
+símbolos recolectados durante el análisis.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+
+from ..utils.project_walker import walk_project
+from ..utils.fuzzy_index import FuzzyIndex
+from ..core.parsed_project import load_parsed_file
+from ..analyzers.symbol_collector import collect_symbols, SYMBOL_FIELDS
+from ..analyzers.symbol_collector import FUNCTION, CLASS, VARIABLE
+from .result_cache import default_cache_dir
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "symbols.db"
+
+# Subir si cambia el esquema o el contenido de los registros
+INDEX_FORMAT = 1
+
+DEFINITION_KINDS = (FUNCTION, CLASS, VARIABLE)
+
+# Mayor carácter Unicode: cota superior para las búsquedas por prefijo
+_MAX_CHAR = "\U0010ffff"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS symbols (
+    file_id INTEGER NOT NULL,
+    name TEXT,
+    kind TEXT NOT NULL,
+    node_type TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    content TEXT,
+    signature TEXT
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols (name);
+CREATE INDEX IF NOT EXISTS symbols_node_type ON symbols (node_type);
+CREATE INDEX IF NOT EXISTS symbols_file ON symbols (file_id);
+"""
+
+# Columnas retornadas por las consultas (ruta absoluta + campos del registro)
+_SELECT = (
+    "SELECT f.path, s.name, s.kind, s.node_type, s.line, s.scope, s.content, s.signature "
+    "FROM symbols s JOIN files f ON f.id = s.file_id "
+)
+
+# Orden de archivo del último recorrido y, dentro del archivo, el de ast.walk()
+_ORDER = " ORDER BY f.position, s.depth, s.seq"
+
+
+class SymbolIndex:
+    """
+    Tabla de símbolos del proyecto persistida en SQLite.
+
+    Las consultas retornan dicts con file (ruta como la generaría
+    os.path.join sobre project_path), name, kind, node_type, line, scope,
+    content y signature, en el mismo orden que un recorrido completo.
+    """
+
+    def __init__(self, project_path, cache_dir=None):
+        self.project_path = project_path
+        self.index_file = os.path.join(cache_dir or default_cache_dir(project_path), INDEX_FILE_NAME)
+        self._lock = threading.Lock()
+        self._db = self._connect()
+        # sube con cada cambio de la tabla; invalida el índice aproximado
+        self._generation = 0
+        self._fuzzy = None
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Actualización
+    # ──────────────────────────────────────────────────────────────────────
+
+    def refresh(self, file_paths=None, parsed=None):
+        """
+        Reindexa los archivos nuevos o con mtime/tamaño distintos. Sin
+        file_paths se recorre el proyecto y se eliminan los archivos borrados.
+        """
+        walked = file_paths is None
+        if walked:
+            file_paths = [
+                os.path.join(root, file)
+                for root, files in walk_project(self.project_path)
+                for file in files
+                if file.endswith(".py")
+            ]
+
+        with self._lock, self._db:
+            known = {
+                path: (file_id, mtime, size)
+                for file_id, path, mtime, size in self._db.execute(
+                    "SELECT id, path, mtime_ns, size FROM files"
+                )
+            }
+            seen = set()
+
+            for position, file_path in enumerate(file_paths):
+                rel_path = self._relative(file_path)
+                seen.add(rel_path)
+
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+
+                previous = known.get(rel_path)
+                if previous is not None and previous[1:] == (stat.st_mtime_ns, stat.st_size):
+                    if walked:
+                        self._db.execute("UPDATE files SET position = ? WHERE id = ?",
+                                         (position, previous[0]))
+                    continue
+
+                self._store(rel_path, stat, position, _parse_symbols(file_path, parsed))
+
+            if walked:
+                for rel_path in set(known) - seen:
+                    self._delete(known[rel_path][0])
+
+    def store_results(self, symbols_by_file):
+        """
+        Guarda los símbolos recolectados durante el análisis ({ruta: registros};
+        None si el archivo no es UTF-8 válido) sin volver a parsear.
+        """
+        with self._lock, self._db:
+            known = {
+                path: (mtime, size)
+                for path, mtime, size in self._db.execute("SELECT path, mtime_ns, size FROM files")
+            }
+
+            for position, (file_path, symbols) in enumerate(symbols_by_file.items()):
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+
+                rel_path = self._relative(file_path)
+                if known.get(rel_path) == (stat.st_mtime_ns, stat.st_size):
+                    continue
+
+                self._store(rel_path, stat, position, symbols or [])
+
+    def _store(self, rel_path, stat, position, symbols):
+        row = self._db.execute("SELECT id FROM files WHERE path = ?", (rel_path,)).fetchone()
+
+        if row is not None:
+            file_id = row[0]
+            self._db.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+            self._db.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, position = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, position, file_id)
+            )
+        else:
+            file_id = self._db.execute(
+                "INSERT INTO files (path, mtime_ns, size, position) VALUES (?, ?, ?, ?)",
+                (rel_path, stat.st_mtime_ns, stat.st_size, position)
+            ).lastrowid
+
+        self._db.executemany(
+            f"INSERT INTO symbols (file_id, {', '.join(SYMBOL_FIELDS)}) "
+            f"VALUES (?{', ?' * len(SYMBOL_FIELDS)})",
+            ((file_id, *symbol) for symbol in symbols)
+        )
+        self._generation += 1
+
+    def _delete(self, file_id):
+        self._db.execute("DELETE FROM symbols WHERE file_id = ?", (file_id,))
+        self._db.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        self._generation += 1
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Consultas
+    # ──────────────────────────────────────────────────────────────────────
+
+    def definitions(self, name):
+        """Funciones, clases y variables llamadas exactamente name."""
+        return self._query(
+            f"WHERE s.name = ? AND s.kind IN ({_placeholders(DEFINITION_KINDS)})",
+            (name, *DEFINITION_KINDS)
+        )
+
+    def definitions_with_prefix(self, prefix, limit=None):
+        """Definiciones cuyo nombre empieza por prefix (usa el índice por nombre)."""
+        return self._query(
+            f"WHERE s.name >= ? AND s.name < ? AND s.kind IN ({_placeholders(DEFINITION_KINDS)})",
+            (prefix, prefix + _MAX_CHAR, *DEFINITION_KINDS),
+            limit
+        )
+
+    def names(self):
+        """Nombres distintos de todas las definiciones."""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT DISTINCT name FROM symbols WHERE kind IN ({_placeholders(DEFINITION_KINDS)})",
+                DEFINITION_KINDS
+            ).fetchall()
+        return [name for name, in rows]
+
+    def fuzzy(self):
+        """
+        FuzzyIndex con los nombres de las definiciones. Se construye una vez
+        y se reutiliza en cada pulsación hasta que cambia la tabla.
+        """
+        cached = self._fuzzy
+        if cached is not None and cached[0] == self._generation:
+            return cached[1]
+
+        generation = self._generation
+        index = FuzzyIndex(self.names())
+        self._fuzzy = (generation, index)
+        return index
+
+    def statements(self, node_types):
+        """Nodos de los tipos indicados (nombres de clase de ast, p. ej. "If")."""
+        return self._query(f"WHERE s.node_type IN ({_placeholders(node_types)})", tuple(node_types))
+
+    def functions(self, file_paths):
+        """FunctionDef de los archivos indicados, en el orden de file_paths."""
+        by_file = {}
+        for symbol in self._query("WHERE s.node_type = 'FunctionDef'"):
+            by_file.setdefault(self._relative(symbol["file"]), []).append(symbol)
+
+        return [
+            symbol
+            for file_path in file_paths
+            for symbol in by_file.get(self._relative(file_path), [])
+        ]
+
+    def _query(self, where, params=(), limit=None):
+        sql = _SELECT + where + _ORDER
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+
+        return [
+            {
+                "file": os.path.join(self.project_path, path),
+                "name": name,
+                "kind": kind,
+                "node_type": node_type,
+                "line": line,
+                "scope": scope,
+                "content": content,
+                "signature": signature,
+            }
+            for path, name, kind, node_type, line, scope, content, signature in rows
+        ]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM symbols").fetchone()[0]
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Base de datos
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _connect(self):
+        """Abre la base en disco; si no se puede, usa una en memoria."""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            db = sqlite3.connect(self.index_file, check_same_thread=False)
+            _ensure_schema(db)
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"[SymbolIndex] No se pudo abrir {self.index_file}, se usa un índice en memoria: {e}")
+
+        db = sqlite3.connect(":memory:", check_same_thread=False)
+        _ensure_schema(db)
+        return db
+
+    def _relative(self, file_path):
+        return os.path.relpath(file_path, self.project_path)
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_symbol_index(project_path, cache_dir=None):
+    """Índice del proyecto compartido por todo el proceso (CLI y GUI)."""
+    key = (os.path.abspath(project_path), cache_dir)
+
+    with _INDEXES_LOCK:
+        if key not in _INDEXES:
+            _INDEXES[key] = SymbolIndex(project_path, cache_dir)
+        return _INDEXES[key]
+
+
+def _ensure_schema(db):
+    """Crea las tablas; si el formato guardado es otro, se descartan."""
+    with db:
+        db.executescript(_SCHEMA)
+        row = db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+
+        if row is None or row[0] != str(INDEX_FORMAT):
+            db.execute("DELETE FROM symbols")
+            db.execute("DELETE FROM files")
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('format', ?)",
+                       (str(INDEX_FORMAT),))
+
+
+def _parse_symbols(file_path, parsed):
+    """Registros de un archivo; vacío si no es UTF-8 válido o no parsea."""
+    try:
+        parsed_file = load_parsed_file(file_path, parsed)
+        tree = parsed_file.parse(strict=True)
+    except Exception:
+        return []
+
+    return collect_symbols(tree, file_path, parsed_file.lines)
+
+
+def _placeholders(values):
+    return ", ".join("?" * len(values))
@@ -0,0 +1,412 @@
+"""
+CodeHunter - Índice de trigramas para la búsqueda de texto (SQLite)
+Guarda, por archivo, los trigramas de su código en minúsculas (y los
+unigramas y bigramas, para las consultas cortas) en
+.codehunter_cache/trigrams.db, con las listas de archivos de cada grama. Una
+búsqueda lee solo las filas de los gramas de la consulta y los archivos
+que los contienen todos; el resto se descarta sin abrirlo.
+
+La actualización se apoya en el manifiesto: solo se hace stat de los
+archivos de las carpetas nuevas o con otro mtime, y solo se reescriben las
+filas de los archivos con mtime/tamaño distintos. Editar un archivo en su
+sitio no cambia el mtime de su carpeta: esas ediciones se detectan en la
+primera consulta de cada proceso y después, como mucho, cada
+FULL_CHECK_INTERVAL segundos (o con refresh(max_age=0)).
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+
+from array import array
+
+from ..utils.project_walker import get_manifest
+from ..core.parsed_project import load_parsed_file
+from .result_cache import default_cache_dir
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = "trigrams.db"
+
+# Subir si cambia el esquema o el contenido de los registros
+INDEX_FORMAT = 2
+
+TRIGRAM_SIZE = 3
+
+# Segundos durante los que no se repite el stat de todos los archivos
+FULL_CHECK_INTERVAL = 30.0
+
+# Trigramas de la consulta que se intersectan (el resto solo afinaría el filtro)
+MAX_QUERY_GRAMS = 64
+
+# Parámetros por consulta (el mínimo que acepta cualquier versión de SQLite)
+MAX_SQL_VARIABLES = 999
+
+# Las listas de archivos de cada grama se guardan en tramos de 2**CHUNK_BITS
+# ids: reindexar un archivo solo reescribe los tramos de su id
+CHUNK_BITS = 8
+
+# Archivos que se reindexan antes de escribir sus tramos
+FLUSH_FILES = 1 << CHUNK_BITS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    grams TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grams (
+    gram TEXT NOT NULL,
+    chunk INTEGER NOT NULL,
+    file_ids BLOB NOT NULL,
+    PRIMARY KEY (gram, chunk)
+) WITHOUT ROWID;
+"""
+
+
+def trigrams(text):
+    """Conjunto de trigramas de text (ya en minúsculas)."""
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def index_grams(text):
+    """Unigramas, bigramas y trigramas de text (ya en minúsculas)."""
+    grams = trigrams(text)
+
+    # los prefijos de los trigramas, más los del final del texto
+    bigrams = {gram[:2] for gram in grams}
+    if len(text) >= 2:
+        bigrams.add(text[-2:])
+    unigrams = {gram[0] for gram in bigrams}
+    if text:
+        unigrams.add(text[-1])
+
+    grams.update(bigrams)
+    grams.update(unigrams)
+    return grams
+
+
+def query_grams(text):
+    """Gramas que debe contener un archivo con text: la propia consulta si es corta."""
+    if len(text) < TRIGRAM_SIZE:
+        return {text} if text else set()
+    return trigrams(text)
+
+
+class TrigramIndex:
+    """
+    Índice invertido grama -> archivos de un proyecto persistido en SQLite.
+
+    Cada grama tiene una fila por tramo de ids con los de sus archivos;
+    cada archivo guarda sus gramas para poder quitarlo de esas filas al
+    reindexarlo. El orden de
+    los archivos es el del último recorrido del proyecto, así que los
+    candidatos salen en el mismo orden que una búsqueda completa.
+    """
+
+    def __init__(self, project_path, cache_dir=None):
+        self.project_path = project_path
+        self.index_file = os.path.join(cache_dir or default_cache_dir(project_path), INDEX_FILE_NAME)
+
+        self._listing = {}        # {ruta: ManifestDirectory} del último refresh
+        self._dir_files = {}      # {ruta de la carpeta: [rutas relativas de sus .py]}
+        self._position = {}       # {ruta relativa: posición en el recorrido}
+        self._paths = {}          # {id en la base: ruta relativa}
+        self._pending = {}        # {tramo: {grama: ([ids que se quitan], [ids que se añaden])}}
+        self._pending_files = 0
+        self._checked_at = None   # time.monotonic() del último stat de todos los archivos
+        self._lock = threading.Lock()
+        self._db = self._connect()
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Actualización
+    # ──────────────────────────────────────────────────────────────────────
+
+    def refresh(self, parsed=None, max_age=FULL_CHECK_INTERVAL):
+        """
+        Sincroniza el índice con el proyecto: indexa los archivos nuevos,
+        elimina los borrados y reindexa los que tienen mtime/tamaño
+        distintos, solo en las carpetas que el manifiesto volvió a listar.
+
+        max_age: segundos desde el último stat de todos los archivos tras
+        los que se repite, para ver las ediciones en su sitio (0 = ahora).
+        """
+        with self._lock:
+            listing = get_manifest(self.project_path).directories()
+
+            now = time.monotonic()
+            full = self._checked_at is None or now - self._checked_at >= max_age
+
+            # el manifiesto reemplaza las carpetas que cambian: las mismas no se revisan
+            changed = [
+                directory for directory in listing.values()
+                if full or self._listing.get(directory.path) is not directory
+            ]
+            removed = [path for path in self._listing if path not in listing]
+
+            if changed or removed:
+                with self._db:
+                    self._sync(changed, removed, full, parsed)
+                    self._flush()
+
+                self._position = {
+                    rel_path: position
+                    for position, rel_path in enumerate(
+                        rel_path for path in listing for rel_path in self._dir_files[path]
+                    )
+                }
+
+            self._listing = listing
+            if full:
+                self._checked_at = now
+
+    def _sync(self, changed, removed, full, parsed):
+        # en la revisión completa se leen todas las filas de una vez
+        known = None
+        if full:
+            known = {
+                path: (file_id, mtime, size)
+                for file_id, path, mtime, size in self._db.execute(
+                    "SELECT id, path, mtime_ns, size FROM files"
+                )
+            }
+
+        for path in removed:
+            for rel_path in self._dir_files.pop(path, ()):
+                self._delete(rel_path)
+
+        for directory in changed:
+            rel_paths = self._python_files(directory)
+
+            for rel_path in set(self._dir_files.get(directory.path, ())) - set(rel_paths):
+                self._delete(rel_path)
+            for rel_path in rel_paths:
+                self._update(rel_path, known, parsed)
+
+            self._dir_files[directory.path] = rel_paths
+
+        if full:
+            # archivos borrados mientras el índice no estaba abierto
+            listed = {rel_path for rel_paths in self._dir_files.values() for rel_path in rel_paths}
+            for rel_path in set(known) - listed:
+                self._delete(rel_path)
+
+    def _python_files(self, directory):
+        """Rutas relativas de los .py de la carpeta, en orden de listado."""
+        rel_root = os.path.relpath(directory.path, self.project_path)
+        prefix = "" if rel_root == os.curdir else rel_root + os.sep
+        return [prefix + entry.name for entry in directory.files if entry.name.endswith(".py")]
+
+    def _update(self, rel_path, known, parsed):
+        path = os.path.join(self.project_path, rel_path)
+
+        if known is not None:
+            previous = known.get(rel_path)
+        else:
+            previous = self._db.execute(
+                "SELECT id, mtime_ns, size FROM files WHERE path = ?", (rel_path,)
+            ).fetchone()
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._delete(rel_path)
+            return
+
+        if previous is not None and previous[1:] == (stat.st_mtime_ns, stat.st_size):
+            # puede haberlo indexado otro proceso
+            self._paths[previous[0]] = rel_path
+            return
+
+        try:
+            source = load_parsed_file(path, parsed).source
+        except OSError as e:
+            logger.warning(f"[TrigramIndex] No se pudo leer {path}: {e}")
+            self._delete(rel_path)
+            return
+
+        self._store(rel_path, stat, index_grams(source.lower()))
+
+    def _store(self, rel_path, stat, grams):
+        row = self._db.execute("SELECT id, grams FROM files WHERE path = ?", (rel_path,)).fetchone()
+        joined = json.dumps(sorted(grams), ensure_ascii=False)
+
+        if row is not None:
+            file_id = row[0]
+            self._queue(file_id, json.loads(row[1]), removing=True)
+            self._db.execute(
+                "UPDATE files SET mtime_ns = ?, size = ?, grams = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, joined, file_id)
+            )
+        else:
+            file_id = self._db.execute(
+                "INSERT INTO files (path, mtime_ns, size, grams) VALUES (?, ?, ?, ?)",
+                (rel_path, stat.st_mtime_ns, stat.st_size, joined)
+            ).lastrowid
+
+        self._queue(file_id, grams, removing=False)
+        self._paths[file_id] = rel_path
+
+    def _delete(self, rel_path):
+        row = self._db.execute("SELECT id, grams FROM files WHERE path = ?", (rel_path,)).fetchone()
+        if row is None:
+            return
+
+        self._queue(row[0], json.loads(row[1]), removing=True)
+        self._db.execute("DELETE FROM files WHERE id = ?", (row[0],))
+        self._paths.pop(row[0], None)
+
+    def _queue(self, file_id, grams, removing):
+        """Anota el cambio en los tramos de los gramas; se escriben juntos en _flush()."""
+        changes = self._pending.setdefault(file_id >> CHUNK_BITS, {})
+        side = 0 if removing else 1
+
+        for gram in grams:
+            change = changes.get(gram)
+            if change is None:
+                changes[gram] = change = ([], [])
+            change[side].append(file_id)
+
+        if not removing:
+            self._pending_files += 1
+            if self._pending_files >= FLUSH_FILES:
+                self._flush()
+
+    def _flush(self):
+        """Escribe los tramos de los gramas afectados por los archivos reindexados."""
+        for chunk, changes in self._pending.items():
+            grams = list(changes)
+            stored = {}
+            for start in range(0, len(grams), MAX_SQL_VARIABLES):
+                part = grams[start:start + MAX_SQL_VARIABLES]
+                stored.update(self._db.execute(
+                    f"SELECT gram, file_ids FROM grams WHERE chunk = ? AND gram IN ({_placeholders(part)})",
+                    (chunk, *part)
+                ))
+
+            rows = []
+            emptied = []
+            for gram, (removed, added) in changes.items():
+                blob = stored.get(gram)
+
+                file_ids = set(_unpack(blob)) if blob is not None else set()
+                file_ids.difference_update(removed)
+                file_ids.update(added)
+
+                if file_ids:
+                    # al reindexar un archivo, la mayoría de sus gramas no cambian
+                    packed = _pack(sorted(file_ids))
+                    if packed != blob:
+                        rows.append((gram, chunk, packed))
+                elif blob is not None:
+                    emptied.append((gram, chunk))
+
+            self._db.executemany("INSERT OR REPLACE INTO grams (gram, chunk, file_ids) VALUES (?, ?, ?)", rows)
+            self._db.executemany("DELETE FROM grams WHERE gram = ? AND chunk = ?", emptied)
+
+        self._pending = {}
+        self._pending_files = 0
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Consultas
+    # ──────────────────────────────────────────────────────────────────────
+
+    def candidates(self, text):
+        """
+        Rutas absolutas de los archivos que pueden contener text (sin
+        distinguir mayúsculas), en el orden del último refresh().
+        """
+        with self._lock:
+            grams = sorted(query_grams(text.lower()))[:MAX_QUERY_GRAMS]
+
+            if not grams:
+                matches = list(self._position)
+            else:
+                postings = []
+                for gram in grams:
+                    blobs = [blob for blob, in self._db.execute(
+                        "SELECT file_ids FROM grams WHERE gram = ?", (gram,)
+                    )]
+                    if not blobs:
+                        return []
+                    postings.append(_unpack(b"".join(blobs)))
+
+                postings.sort(key=len)
+                selected = set(postings[0]).intersection(*postings[1:])
+
+                position = self._position
+                paths = (self._paths.get(file_id) for file_id in selected)
+                matches = sorted((rel_path for rel_path in paths if rel_path in position),
+                                 key=position.__getitem__)
+
+            return [os.path.join(self.project_path, rel_path) for rel_path in matches]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Base de datos
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _connect(self):
+        """Abre la base en disco; si no se puede, usa una en memoria."""
+        try:
+            os.makedirs(os.path.dirname(self.index_file), exist_ok=True)
+            db = sqlite3.connect(self.index_file, check_same_thread=False)
+            _ensure_schema(db)
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"[TrigramIndex] No se pudo abrir {self.index_file}, se usa un índice en memoria: {e}")
+
+        db = sqlite3.connect(":memory:", check_same_thread=False)
+        _ensure_schema(db)
+        return db
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_trigram_index(project_path, cache_dir=None):
+    """Índice del proyecto compartido por todo el proceso (CLI y GUI)."""
+    key = (os.path.abspath(project_path), cache_dir)
+
+    with _INDEXES_LOCK:
+        if key not in _INDEXES:
+            _INDEXES[key] = TrigramIndex(project_path, cache_dir)
+        return _INDEXES[key]
+
+
+def _ensure_schema(db):
+    """Crea las tablas; si el formato guardado es otro, se descartan."""
+    with db:
+        db.executescript(_SCHEMA)
+        row = db.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+
+        if row is None or row[0] != str(INDEX_FORMAT):
+            db.execute("DELETE FROM grams")
+            db.execute("DELETE FROM files")
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('format', ?)",
+                       (str(INDEX_FORMAT),))
+
+
+def _pack(file_ids):
+    return array("I", file_ids).tobytes()
+
+
+def _unpack(blob):
+    file_ids = array("I")
+    file_ids.frombytes(blob)
+    return file_ids
+
+
+def _placeholders(values):
+    return ", ".join("?" * len(values))
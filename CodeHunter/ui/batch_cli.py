@@ -0,0 +1,324 @@
+"""
+CodeHunter - CLI no interactivo
+Subcomandos para scripts y CI (scan, search, tree, report) con salida
+legible por máquinas y códigos de salida; el menú interactivo sigue en
+cli_controller.run_cli.
+
+    python -m CodeHunter scan <proyecto> --format sarif -o hallazgos.sarif --fail-on critical
+    python -m CodeHunter search <proyecto> "call:open" --format json
+    python -m CodeHunter tree <proyecto>
+    python -m CodeHunter report <proyecto> -o informe.pdf
+
+Los mensajes de progreso del análisis van a stderr, de modo que stdout
+solo contiene el resultado pedido.
+"""
+
+import os
+import sys
+import json
+import argparse
+from contextlib import contextmanager, redirect_stdout
+from itertools import islice
+
+from .. import __version__
+from ..core.models import Severity, Category
+from ..core.parsed_project import ParsedProject
+from ..analyzers.system_doctor import run_code_doctor, export_findings
+from ..analyzers.smart_code_searcher import iter_search_code
+from ..analyzers.project_scanner import scan_project_structure
+from ..analyzers.detector_profiler import AnalysisProfiler
+from ..infrastructure.findings_exporter import open_exporter, SeverityCounter, NDJSON, SARIF
+from .diagnosis_presenter import print_diagnosis_report
+from .search_presenter import print_search_results
+
+
+# Códigos de salida
+EXIT_OK = 0
+EXIT_FINDINGS = 1   # hallazgos en el umbral de --fail-on (o search sin coincidencias)
+EXIT_USAGE = 2      # argumentos inválidos (argparse)
+EXIT_ERROR = 3      # proyecto inexistente, error de escritura...
+
+TEXT = "text"
+JSON = "json"
+
+STDOUT = "-"
+
+# Severidades de --fail-on, de mayor a menor gravedad
+SEVERITY_ORDER = tuple(Severity)
+
+# Categoría -> clave de by_category en el documento JSON de scan
+CATEGORY_KEYS = {
+    Category.BUG: "bugs",
+    Category.VULNERABILITY: "vulnerabilities",
+    Category.CODE_SMELL: "code_smells",
+    Category.SECURITY_HOTSPOT: "security_hotspots",
+    Category.MAINTAINABILITY: "maintainability",
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="codehunter",
+        description="Analizador de proyectos Python (modo no interactivo).",
+    )
+    parser.add_argument("--version", action="version", version=f"CodeHunter {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    # opciones comunes de los comandos que ejecutan el diagnóstico
+    analysis = argparse.ArgumentParser(add_help=False)
+    analysis.add_argument("-j", "--jobs", type=int, default=None,
+                          help="procesos worker (por defecto, número de CPUs; 1 = secuencial)")
+    analysis.add_argument("--cache-dir", default=None,
+                          help="directorio de la caché de resultados (por defecto, en el proyecto)")
+    analysis.add_argument("--no-cache", action="store_true",
+                          help="no leer ni guardar la caché de resultados")
+    analysis.add_argument("--incremental", action="store_true",
+                          help="releer solo los archivos modificados según la caché")
+    analysis.add_argument("--since", metavar="REVISION", default=None,
+                          help="como --incremental, releyendo siempre los modificados en git desde REVISION")
+    analysis.add_argument("--fail-on", type=str.upper, default=None,
+                          choices=[severity.value for severity in SEVERITY_ORDER],
+                          help="salir con código 1 si hay hallazgos de esta severidad o más graves")
+    analysis.add_argument("--profile", action="store_true",
+                          help="mostrar en stderr los detectores y archivos más lentos")
+    analysis.add_argument("--profile-json", metavar="FILE", default=None,
+                          help="guardar el perfil completo (por detector y por archivo) en JSON")
+    analysis.add_argument("--profile-memory", action="store_true",
+                          help="medir también el pico de memoria con tracemalloc (más lento)")
+
+    scan = commands.add_parser("scan", parents=[analysis], help="diagnóstico completo del proyecto")
+    scan.add_argument("project")
+    scan.add_argument("-f", "--format", choices=[TEXT, JSON, NDJSON, SARIF], default=TEXT)
+    scan.add_argument("-o", "--output", default=STDOUT, help="archivo de salida (por defecto, stdout)")
+    scan.set_defaults(handler=cmd_scan)
+
+    search = commands.add_parser("search", help="buscar código (mismas consultas que el menú)")
+    search.add_argument("project")
+    search.add_argument("query")
+    search.add_argument("-f", "--format", choices=[TEXT, JSON, NDJSON], default=TEXT)
+    search.add_argument("-n", "--limit", type=int, default=None, help="máximo de resultados")
+    search.set_defaults(handler=cmd_search)
+
+    tree = commands.add_parser("tree", help="árbol de estructura del proyecto")
+    tree.add_argument("project")
+    tree.add_argument("-f", "--format", choices=[TEXT, JSON], default=TEXT)
+    tree.set_defaults(handler=cmd_tree)
+
+    report = commands.add_parser("report", parents=[analysis], help="informe completo en PDF")
+    report.add_argument("project")
+    report.add_argument("-o", "--output", default=None,
+                        help="archivo .pdf o directorio (por defecto, ~/Downloads)")
+    report.add_argument("--max-per-rule", type=int, default=None,
+                        help="hallazgos detallados como máximo por regla")
+    report.add_argument("--max-detail", type=int, default=None,
+                        help="hallazgos detallados como máximo en total")
+    report.set_defaults(handler=cmd_report)
+
+    return parser
+
+
+def main(argv=None):
+    """Punto de entrada; devuelve el código de salida."""
+    args = build_parser().parse_args(argv)
+
+    if not os.path.isdir(args.project):
+        print(f"❌ No existe el directorio del proyecto: {args.project}", file=sys.stderr)
+        return EXIT_ERROR
+
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Comandos
+# ──────────────────────────────────────────────────────────────────────────
+
+def cmd_scan(args):
+    parsed = ParsedProject(args.project)
+
+    if args.format in (NDJSON, SARIF):
+        # los hallazgos se escriben archivo por archivo durante el análisis y
+        # no se guardan: --fail-on se decide con el recuento por severidad
+        counter = SeverityCounter()
+        output = sys.stdout if args.output == STDOUT else args.output
+        with open_exporter(output, args.format, args.project) as exporter:
+            _run_export(args, parsed, [exporter, counter])
+        return _exit_code(counter, args.fail_on)
+
+    result = _run_doctor(args, parsed)
+
+    with _open_output(args.output) as out:
+        if args.format == JSON:
+            json.dump(_scan_document(args.project, result), out, ensure_ascii=False, indent=2)
+            out.write("\n")
+        else:
+            with redirect_stdout(out):
+                print_diagnosis_report(result)
+
+    return _exit_code(result["findings_store"], args.fail_on)
+
+
+def cmd_search(args):
+    results = iter_search_code(args.project, args.query)
+    if args.limit is not None:
+        results = islice(results, args.limit)
+
+    if args.format == TEXT:
+        results = list(results)
+        print_search_results(results)
+        return EXIT_OK if results else EXIT_FINDINGS
+
+    count = 0
+    if args.format == JSON:
+        results = list(results)
+        count = len(results)
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2, default=str)
+        sys.stdout.write("\n")
+    else:
+        for result in results:
+            sys.stdout.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            count += 1
+
+    return EXIT_OK if count else EXIT_FINDINGS
+
+
+def cmd_tree(args):
+    lines = scan_project_structure(args.project)
+
+    if args.format == JSON:
+        json.dump({"project": os.path.abspath(args.project), "tree": lines},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for line in lines:
+            print(line)
+
+    return EXIT_OK
+
+
+def cmd_report(args):
+    # reportlab solo hace falta para este comando
+    from ..analyzers.full_report import build_full_diagnosis_data
+    from ..infrastructure.pdf_exporter import export_report_to_pdf
+
+    parsed = ParsedProject(args.project)
+    result = _run_doctor(args, parsed)
+
+    with redirect_stdout(sys.stderr):
+        full_report = build_full_diagnosis_data(args.project, result, parsed)
+
+    limits = {}
+    if args.max_per_rule is not None:
+        limits["max_per_rule"] = args.max_per_rule
+    if args.max_detail is not None:
+        limits["max_detail"] = args.max_detail
+
+    description = full_report.get("profile", {}).get("description", "Sin descripción")
+    print(export_report_to_pdf(args.project, description, full_report, args.output, **limits))
+
+    return _exit_code(result["findings_store"], args.fail_on)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Utilidades
+# ──────────────────────────────────────────────────────────────────────────
+
+def _run_doctor(args, parsed):
+    profiler = _make_profiler(args)
+
+    # el progreso del análisis no debe mezclarse con la salida en stdout
+    with redirect_stdout(sys.stderr):
+        result = run_code_doctor(
+            args.project, jobs=args.jobs, use_cache=not args.no_cache,
+            cache_dir=args.cache_dir, incremental=args.incremental or bool(args.since),
+            base_revision=args.since, parsed=parsed, profiler=profiler
+        )
+
+    _report_profile(args, profiler)
+    return result
+
+
+def _run_export(args, parsed, sinks):
+    """
+    Como _run_doctor() pero sin acumular hallazgos (ver export_findings).
+    La caché de resultados solo se usa con --incremental / --since, que la
+    necesitan: guarda el resultado de cada archivo hasta el final.
+    """
+    profiler = _make_profiler(args)
+    incremental = args.incremental or bool(args.since)
+
+    with redirect_stdout(sys.stderr):
+        export_findings(
+            args.project, sinks, jobs=args.jobs,
+            use_cache=incremental and not args.no_cache, cache_dir=args.cache_dir,
+            incremental=incremental, base_revision=args.since, parsed=parsed,
+            profiler=profiler
+        )
+
+    _report_profile(args, profiler)
+
+
+def _make_profiler(args):
+    if args.profile or args.profile_json or args.profile_memory:
+        return AnalysisProfiler(trace_memory=args.profile_memory)
+    return None
+
+
+def _report_profile(args, profiler):
+    if profiler is not None:
+        print(profiler.format_table(), file=sys.stderr)
+        if args.profile_json:
+            profiler.save(args.profile_json)
+
+
+def _exit_code(counter, fail_on):
+    """
+    EXIT_FINDINGS si hay hallazgos de severidad fail_on o más graves.
+    counter: FindingsStore o SeverityCounter (con count_by_severity()).
+    """
+    if fail_on is None:
+        return EXIT_OK
+
+    counts = counter.count_by_severity()
+    threshold = SEVERITY_ORDER.index(Severity(fail_on))
+    if any(counts.get(severity) for severity in SEVERITY_ORDER[:threshold + 1]):
+        return EXIT_FINDINGS
+    return EXIT_OK
+
+
+def _scan_document(project_path, result):
+    return {
+        "tool": "CodeHunter",
+        "version": __version__,
+        "project": os.path.abspath(project_path),
+        "score": result["score"],
+        "status": result["status"],
+        "total": len(result["advanced_findings"]),
+        "by_severity": result["by_severity"],
+        "by_category": _category_counts(result["findings_store"]),
+        "budget_skips": result["budget_skips"],
+        "findings": [finding.to_dict() for finding in result["advanced_findings"]],
+    }
+
+
+def _category_counts(store):
+    """
+    {clave: cantidad} con las claves de result["by_category"], contadas
+    desde el store: las métricas del diagnóstico no cuentan las categorías.
+    """
+    counts = store.count_by_category()
+    return {key: counts.get(category, 0) for category, key in CATEGORY_KEYS.items()}
+
+
+@contextmanager
+def _open_output(output):
+    """stdout o un archivo (stdout no se cierra)."""
+    if output == STDOUT:
+        yield sys.stdout
+        return
+
+    with open(output, "w", encoding="utf-8") as out:
+        yield out
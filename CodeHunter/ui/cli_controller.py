@@ -1,15 +1,19 @@
 
+import os
+
 from CodeHunter.ui.menu_controller import show_main_menu
 from CodeHunter.ui.project_presenter import print_project_tree
 from CodeHunter.ui.search_presenter import print_search_results
 from CodeHunter.ui.diagnosis_presenter import print_diagnosis_report
 from CodeHunter.ui.full_report_presenter import print_full_diagnosis_report, ask_export_pdf
 from CodeHunter.infrastructure.pdf_exporter import export_report_to_pdf
+from CodeHunter.infrastructure.findings_exporter import open_exporter
 
 from CodeHunter.analyzers.project_scanner import scan_project_structure
-from CodeHunter.analyzers.smart_code_searcher import search_code
-from CodeHunter.analyzers.system_doctor import run_code_doctor
+from CodeHunter.analyzers.smart_code_searcher import iter_search_code
+from CodeHunter.analyzers.system_doctor import run_code_doctor, export_findings
 from CodeHunter.analyzers.full_report import build_full_diagnosis_data
+from CodeHunter.core.parsed_project import ParsedProject
 
 
 def clear_screen():
@@ -23,6 +27,9 @@ def pause():
 
 def run_cli(project_path):
     """Controlador principal del CLI"""
+    # archivos parseados compartidos por todas las opciones del menú
+    parsed = ParsedProject(project_path)
+
     while True:
         clear_screen()
         print("\n🎯 CODE HUNTER - ANALIZADOR PROFESIONAL DE PROYECTOS PYTHON\n")
@@ -37,22 +44,25 @@ def run_cli(project_path):
 
         elif option == "2":
             clear_screen()
+            print("💡 Consultas avanzadas: re:<regex> · call:<función> [kw:<argumento>] · def:params>N")
             query = input("🔎 Buscar código (palabra clave): ").strip()
             if query:
-                results = search_code(project_path, query)
-                print_search_results(results)
+                try:
+                    print_search_results(iter_search_code(project_path, query, parsed))
+                except ValueError as e:
+                    print(f"\n⚠️ Consulta inválida: {e}")
             pause()
 
         elif option == "3":
             clear_screen()
-            analysis_data = run_code_doctor(project_path)
+            analysis_data = run_code_doctor(project_path, parsed=parsed)
             print_diagnosis_report(analysis_data)
             pause()
 
         elif option == "4":
             clear_screen()
-            analysis_data = run_code_doctor(project_path)
-            full_report = build_full_diagnosis_data(project_path, analysis_data)
+            analysis_data = run_code_doctor(project_path, parsed=parsed)
+            full_report = build_full_diagnosis_data(project_path, analysis_data, parsed)
             
             if full_report:
                 print_full_diagnosis_report(full_report)
@@ -75,6 +85,21 @@ def run_cli(project_path):
             
             pause()
 
+        elif option == "5":
+            clear_screen()
+            output = input("💾 Archivo de salida (.ndjson o .sarif): ").strip()
+            if output:
+                try:
+                    # los hallazgos se escriben archivo por archivo durante el análisis
+                    with open_exporter(output, project_path=project_path) as exporter:
+                        print(f"\n⏳ Analizando y exportando a {output}...")
+                        export_findings(project_path, [exporter], parsed=parsed)
+                    print(f"\n✅ {exporter.count} hallazgos exportados:")
+                    print(f"   📁 {os.path.abspath(output)}")
+                except (ValueError, OSError) as e:
+                    print(f"\n❌ Error al exportar: {e}")
+            pause()
+
         elif option == "0":
             print("\n👋 ¡Hasta luego!\n")
             break
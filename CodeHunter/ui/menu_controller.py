@@ -4,6 +4,7 @@ def show_main_menu():
     print("2️⃣ Buscar código")
     print("3️⃣ Diagnóstico del sistema (Code Doctor)")
     print("4️⃣ Análisis profundo profesional")
+    print("5️⃣ Exportar hallazgos (NDJSON / SARIF)")
     print("0️⃣ Salir")
 
     return input("\n👉 Selecciona una opción: ").strip()
\ No newline at end of file
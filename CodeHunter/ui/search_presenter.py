@@ -1,13 +1,27 @@
-def print_search_results(results):
-    if not results:
-        print("❌ No se encontraron coincidencias")
-        return
-
-    print(f"\n🔎 Coincidencias encontradas: {len(results)}\n")
+def print_search_results(results, limit=None):
+    """
+    Imprime cada resultado en cuanto llega (results puede ser un generador).
+    limit: dejar de consumir resultados al llegar a ese número.
+    """
+    count = 0
 
     for r in results:
+        if count == 0:
+            print("\n🔎 Coincidencias:\n")
+
         print("─" * 50)
         print(f"📄 Archivo : {r['file']}")
         print(f"📍 Línea   : {r['line']}")
         print(f"🧠 Tipo    : {r['type']}")
-        print(f"💬 Código  : {r['content']}")
\ No newline at end of file
+        print(f"💬 Código  : {r['content']}")
+
+        count += 1
+        if limit is not None and count >= limit:
+            print(f"\n✂️ Se muestran solo las primeras {limit} coincidencias")
+            break
+
+    if not count:
+        print("❌ No se encontraron coincidencias")
+        return
+
+    print(f"\n🔎 Coincidencias encontradas: {count}")
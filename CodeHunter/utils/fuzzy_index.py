@@ -0,0 +1,386 @@
+"""
+CodeHunter - Índice de búsqueda aproximada de nombres
+Busca nombres de símbolos aunque la consulta esté incompleta, con erratas,
+abreviada (usrmngr -> user_manager) o en otro estilo (getUserName /
+get_user_name / gun). Todo lo costoso se precalcula al construir el
+índice; cada consulta solo puntúa unos pocos cientos de candidatos y solo
+busca erratas si hacen falta para completar los resultados, así que sirve
+para buscar mientras se escribe.
+"""
+
+import heapq
+from bisect import bisect_left
+from collections import Counter
+from itertools import islice
+
+
+# Candidatos máximos que aporta cada estrategia antes de puntuar
+MAX_PREFIX_CANDIDATES = 200
+MAX_GRAM_CANDIDATES = 300
+MAX_ABBREVIATION_CANDIDATES = 300
+# Candidatos a los que se calcula la distancia de edición (lo más costoso)
+MAX_TYPO_CANDIDATES = 40
+
+# Longitud mínima de consulta para buscar por trigramas y erratas
+MIN_FUZZY_LENGTH = 4
+# Longitud mínima de consulta para buscar abreviaturas (subsecuencias)
+MIN_ABBREVIATION_LENGTH = 3
+
+# Erratas toleradas: una cada tantos caracteres de la consulta, hasta MAX_TYPOS
+CHARS_PER_TYPO = 4
+MAX_TYPOS = 2
+
+# Trigramas de la consulta usados además de los que pueden romper las erratas
+GRAM_MARGIN = 2
+
+# Puntuaciones base (mayor = mejor)
+SCORE_EXACT = 1000
+SCORE_PREFIX = 900
+SCORE_INITIALS = 800
+SCORE_SUBSTRING = 700
+SCORE_SUBSEQUENCE = 500
+SCORE_TYPO = 300
+
+
+def split_words(name):
+    """Palabras de un nombre en snake_case, camelCase o PascalCase."""
+    words = []
+
+    for part in name.split("_"):
+        start = 0
+        for i in range(1, len(part)):
+            if _is_word_boundary(part, i):
+                words.append(part[start:i].lower())
+                start = i
+        if part:
+            words.append(part[start:].lower())
+
+    return words
+
+
+def _is_word_boundary(text, i):
+    previous, char = text[i - 1], text[i]
+
+    if char.isdigit() != previous.isdigit():
+        return True
+    if char.isupper() and previous.islower():
+        return True
+    # fin de un acrónimo: HTTPServer -> http | server
+    return char.isupper() and previous.isupper() and i + 1 < len(text) and text[i + 1].islower()
+
+
+def compact(text):
+    """Forma comparable: minúsculas y sin guiones bajos."""
+    return text.replace("_", "").lower()
+
+
+class FuzzyIndex:
+    """
+    Índice de nombres para búsqueda aproximada y ordenada por relevancia.
+
+    Estrategias de candidatos: prefijo (bisección sobre la forma compacta),
+    iniciales de las palabras (bisección), trigramas compartidos con la
+    consulta (listas invertidas) y abreviaturas (listas por las iniciales de
+    las dos primeras palabras, filtradas por las letras del nombre: una
+    abreviatura comparte pocos trigramas con su nombre). Los candidatos se
+    puntúan con coincidencia
+    exacta, prefijo, iniciales, subcadena, subsecuencia y distancia de
+    edición acotada, en ese orden.
+    """
+
+    def __init__(self, names=()):
+        self._names = []
+        self._compact = []
+        self._initials = []
+        self._starts = []
+        self._masks = []
+        self._grams = {}
+        self._by_leading_initials = {}
+        self._by_compact = []
+        self._by_initials = []
+
+        for name in dict.fromkeys(names):
+            self._add(name)
+
+        self._by_compact.sort()
+        self._by_initials.sort()
+
+    def _add(self, name):
+        name_id = len(self._names)
+        words = split_words(name)
+        form = "".join(words)
+        initials = "".join(word[0] for word in words)
+
+        # posiciones de inicio de palabra dentro de la forma compacta
+        starts = set()
+        position = 0
+        for word in words:
+            starts.add(position)
+            position += len(word)
+
+        self._names.append(name)
+        self._compact.append(form)
+        self._initials.append(initials)
+        self._starts.append(starts)
+        self._masks.append(_char_mask(form))
+        self._by_leading_initials.setdefault(initials[:2], []).append(name_id)
+        self._by_compact.append((form, name_id))
+        self._by_initials.append((initials, name_id))
+
+        for gram in _padded_trigrams(form):
+            self._grams.setdefault(gram, []).append(name_id)
+
+    def __len__(self):
+        return len(self._names)
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Consultas
+    # ──────────────────────────────────────────────────────────────────────
+
+    def search(self, query, limit=20):
+        """Lista de (puntuación, nombre) de mayor a menor relevancia."""
+        form = compact(query)
+        if not form:
+            return []
+
+        candidates = set(_prefix_ids(self._by_compact, form))
+        candidates.update(_prefix_ids(self._by_initials, form))
+
+        # con menos caracteres bastan el prefijo y las iniciales
+        if len(form) >= MIN_ABBREVIATION_LENGTH:
+            candidates.update(self._abbreviation_ids(form))
+        if len(form) >= MIN_FUZZY_LENGTH:
+            candidates.update(self._substring_ids(form))
+
+        scored = []
+        for name_id in candidates:
+            score = self._score(form, name_id)
+            if score is not None:
+                scored.append((score, -len(self._names[name_id]), self._names[name_id]))
+
+        # las erratas (lo más costoso) solo si pueden entrar entre los limit mejores
+        if len(form) >= MIN_FUZZY_LENGTH and sum(1 for item in scored if item[0] > SCORE_TYPO) < limit:
+            scored.extend(self._typo_matches(form, candidates))
+
+        best = heapq.nlargest(limit, scored)
+        return [(score, name) for score, _, name in best]
+
+    def _substring_ids(self, form):
+        """
+        Nombres que contienen form (como máximo MAX_GRAM_CANDIDATES): se
+        filtra la lista de su trigrama más raro.
+        """
+        rarest = min(_trigrams(form), key=lambda gram: len(self._grams.get(gram, ())))
+        compact_forms = self._compact
+        matches = (name_id for name_id in self._grams.get(rarest, ()) if form in compact_forms[name_id])
+        return list(islice(matches, MAX_GRAM_CANDIDATES))
+
+    def _typo_matches(self, form, seen):
+        """
+        (puntuación, -longitud, nombre) de los nombres que más trigramas
+        comparten con form y no están en seen: sin erratas si encajan así,
+        o con la distancia de edición para los MAX_TYPO_CANDIDATES mejores.
+        """
+        counts = Counter()
+        grams = self._selected_grams(form)
+        for gram in grams:
+            counts.update(self._grams.get(gram, ()))
+
+        scored = []
+        typo_candidates = []
+
+        for name_id, shared in counts.most_common(MAX_GRAM_CANDIDATES):
+            if name_id in seen:
+                continue
+            score = self._score(form, name_id)
+            if score is None:
+                typo_candidates.append((shared, name_id))
+            else:
+                scored.append((score, -len(self._names[name_id]), self._names[name_id]))
+
+        # los candidatos de seen sin puntuación también pueden ser erratas
+        typo_candidates.extend(
+            (counts[name_id], name_id) for name_id in seen if self._score(form, name_id) is None
+        )
+
+        # la distancia de edición solo para los que más trigramas comparten
+        min_shared = len(grams) - 3 * _max_typos(form) - 2
+        for shared, name_id in heapq.nlargest(MAX_TYPO_CANDIDATES, typo_candidates):
+            if shared < min_shared:
+                break
+            score = self._typo_score(form, name_id)
+            if score is not None:
+                scored.append((score, -len(self._names[name_id]), self._names[name_id]))
+
+        return scored
+
+    def _abbreviation_ids(self, form):
+        """
+        Nombres de los que form puede ser una abreviatura ("usrmngr" ->
+        user_manager): empiezan por su primera letra, la inicial de su
+        segunda palabra está en form y form es subsecuencia de su forma
+        compacta. Como máximo MAX_ABBREVIATION_CANDIDATES, primero los de
+        una sola palabra.
+        """
+        first = form[0]
+        mask = _char_mask(form)
+        keys = [first] + sorted(first + char for char in set(form[1:]))
+        ids = []
+
+        for key in keys:
+            for name_id in self._by_leading_initials.get(key, ()):
+                if (self._masks[name_id] & mask == mask
+                        and _is_subsequence(form, self._compact[name_id])):
+                    ids.append(name_id)
+                    if len(ids) >= MAX_ABBREVIATION_CANDIDATES:
+                        return ids
+
+        return ids
+
+    def _selected_grams(self, form):
+        """
+        Los trigramas más raros de la consulta. Cada errata rompe como mucho
+        tres, así que con 3 * erratas + GRAM_MARGIN siempre quedan trigramas
+        correctos del nombre buscado y se recorren las listas más cortas.
+        """
+        grams = sorted(_padded_trigrams(form), key=lambda gram: len(self._grams.get(gram, ())))
+        return grams[:3 * _max_typos(form) + GRAM_MARGIN]
+
+    def _score(self, form, name_id):
+        """Puntuación sin erratas, o None si la consulta no encaja así."""
+        target = self._compact[name_id]
+        length_penalty = len(target) - len(form)
+
+        if target == form:
+            return SCORE_EXACT
+
+        if target.startswith(form):
+            return SCORE_PREFIX - length_penalty
+
+        initials = self._initials[name_id]
+        if initials.startswith(form):
+            return SCORE_INITIALS - (len(initials) - len(form))
+
+        position = target.find(form)
+        if position >= 0:
+            bonus = 50 if position in self._starts[name_id] else 0
+            return SCORE_SUBSTRING + bonus - position - length_penalty
+
+        subsequence = _subsequence_score(form, target, self._starts[name_id])
+        if subsequence is not None:
+            return SCORE_SUBSEQUENCE + subsequence - length_penalty
+
+        return None
+
+    def _typo_score(self, form, name_id):
+        """Erratas: la consulta contra el texto que empieza en cada palabra."""
+        target = self._compact[name_id]
+        max_typos = _max_typos(form)
+        best = None
+
+        for start in sorted(self._starts[name_id]):
+            distance = _prefix_distance(form, target[start:start + len(form) + max_typos], max_typos)
+            if distance is not None and (best is None or distance < best[0]):
+                best = (distance, start)
+
+        if best is None:
+            return None
+
+        distance, start = best
+        return SCORE_TYPO - 50 * distance - start - max(0, len(target) - len(form))
+
+
+def _max_typos(form):
+    return min(MAX_TYPOS, max(1, len(form) // CHARS_PER_TYPO))
+
+
+def _trigrams(form):
+    return {form[i:i + 3] for i in range(len(form) - 2)}
+
+
+def _padded_trigrams(form):
+    padded = f"^{form}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _char_mask(form):
+    """Bits de los caracteres de form (para descartar sin recorrer el texto)."""
+    mask = 0
+    for char in set(form):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def _is_subsequence(form, target):
+    position = 0
+    for char in form:
+        position = target.find(char, position) + 1
+        if not position:
+            return False
+    return True
+
+
+def _prefix_ids(sorted_pairs, prefix):
+    """Ids cuyo texto empieza por prefix (como máximo MAX_PREFIX_CANDIDATES)."""
+    ids = []
+    position = bisect_left(sorted_pairs, (prefix, -1))
+
+    while position < len(sorted_pairs) and len(ids) < MAX_PREFIX_CANDIDATES:
+        text, name_id = sorted_pairs[position]
+        if not text.startswith(prefix):
+            break
+        ids.append(name_id)
+        position += 1
+
+    return ids
+
+
+def _subsequence_score(form, target, starts):
+    """
+    Bonificación si form es subsecuencia de target (None si no lo es):
+    premia caer en inicios de palabra y penaliza los huecos.
+    """
+    score = 0
+    position = 0
+
+    for char in form:
+        found = target.find(char, position)
+        if found < 0:
+            return None
+        if found in starts:
+            score += 10
+        score -= found - position
+        position = found + 1
+
+    return score
+
+
+def _prefix_distance(a, b, limit):
+    """
+    Menor distancia de Damerau-Levenshtein (OSA) entre a y algún prefijo de
+    b, o None si supera limit. Así "detect_circualr" encaja con
+    "detect_circular_imports" con una sola errata.
+    """
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+
+            if (previous_previous is not None and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous_previous[j - 2] + 1)
+
+            current[j] = value
+
+        if min(current) > limit:
+            return None
+
+        previous_previous, previous = previous, current
+
+    distance = min(previous)
+    return distance if distance <= limit else None
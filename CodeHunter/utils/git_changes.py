@@ -0,0 +1,53 @@
+"""
+CodeHunter - Archivos modificados según git
+Usado por el análisis incremental para saber qué archivos cambiaron
+respecto a una revisión base (p. ej. la rama destino en CI).
+"""
+
+import os
+import logging
+import subprocess
+
+
+logger = logging.getLogger(__name__)
+
+GIT_TIMEOUT_SECONDS = 60
+
+
+def changed_files_since(project_path, revision):
+    """
+    Retorna el set de rutas absolutas (normalizadas) modificadas, añadidas o
+    sin versionar respecto a revision, o None si git no está disponible o la
+    revisión no existe (en ese caso hay que tratar todo como modificado).
+    """
+
+    commands = (
+        ["git", "diff", "--name-only", "-z", "--relative", revision, "--"],
+        ["git", "ls-files", "--others", "--exclude-standard", "-z"],
+    )
+
+    changed = set()
+
+    for command in commands:
+        try:
+            output = subprocess.run(
+                command,
+                cwd=project_path,
+                capture_output=True,
+                check=True,
+                timeout=GIT_TIMEOUT_SECONDS,
+            ).stdout
+
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning(f"[GitChanges] No se pudo consultar git ({' '.join(command[:2])}): {e}")
+            return None
+
+        for name in output.decode("utf-8", errors="surrogateescape").split("\0"):
+            if name:
+                changed.add(normalize_path(os.path.join(project_path, name)))
+
+    return changed
+
+
+def normalize_path(path):
+    return os.path.normcase(os.path.normpath(os.path.abspath(path)))
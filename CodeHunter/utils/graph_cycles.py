@@ -0,0 +1,209 @@
+"""
+CodeHunter - Ciclos en grafos dirigidos
+Componentes fuertemente conexas (Tarjan), un ciclo real por componente
+(BFS) y enumeración acotada de ciclos elementales (Johnson), todos iterativos para no depender del límite de
+recursión en grafos de decenas de miles de nodos.
+
+Los grafos son dicts {nodo: iterable de vecinos}; los nodos que solo
+aparecen como vecinos se tratan como nodos sin aristas de salida.
+"""
+
+from collections import defaultdict, deque
+
+
+def strongly_connected_components(graph):
+    """
+    Retorna la lista de componentes fuertemente conexas (Tarjan, O(V + E)).
+    Cada componente lista sus nodos en orden de descubrimiento del DFS, que
+    en un ciclo simple coincide con el orden del ciclo.
+    """
+
+    index_of = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in graph:
+        if root in index_of:
+            continue
+
+        # Pila de (nodo, iterador de vecinos)
+        work = [(root, iter(_neighbors(graph, root)))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            node, neighbors = work[-1]
+            advanced = False
+
+            for neighbor in neighbors:
+                if neighbor not in index_of:
+                    index_of[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(_neighbors(graph, neighbor))))
+                    advanced = True
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[neighbor])
+
+            if advanced:
+                continue
+
+            work.pop()
+
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                component.reverse()
+                components.append(component)
+
+    return components
+
+
+def cyclic_components(graph):
+    """Componentes que contienen al menos un ciclo (tamaño > 1 o auto-arista)."""
+    return [
+        component for component in strongly_connected_components(graph)
+        if len(component) > 1 or component[0] in _neighbors(graph, component[0])
+    ]
+
+
+def component_cycles(graph):
+    """
+    Un ciclo elemental real por componente cíclica: el más corto que pasa
+    por su primer nodo (BFS dentro de la componente). Cada arista
+    consecutiva del ciclo (y la del último nodo al primero) existe en el
+    grafo, a diferencia de la lista de nodos de la componente.
+    """
+    return [_shortest_cycle(graph, component) for component in cyclic_components(graph)]
+
+
+def _shortest_cycle(graph, component):
+    members = set(component)
+    start = component[0]
+    parent = {start: None}
+    queue = deque([start])
+
+    while queue:
+        node = queue.popleft()
+        for neighbor in _neighbors(graph, node):
+            if neighbor == start:
+                cycle = []
+                while node is not None:
+                    cycle.append(node)
+                    node = parent[node]
+                cycle.reverse()
+                return cycle
+            if neighbor in members and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+
+    # no se alcanza: en una componente fuertemente conexa siempre hay ciclo
+    return list(component)
+
+
+def elementary_cycles(graph, max_cycles=None):
+    """
+    Enumera ciclos elementales (Johnson, iterativo) hasta max_cycles.
+    Un grafo puede tener una cantidad exponencial de ciclos, por eso el
+    límite: con None se enumeran todos.
+    """
+
+    cycles = []
+
+    if max_cycles is not None and max_cycles <= 0:
+        return cycles
+
+    pending = [_subgraph(graph, component) for component in cyclic_components(graph)]
+
+    while pending:
+        subgraph = pending.pop()
+        start = next(iter(subgraph))
+
+        for cycle in _cycles_through(subgraph, start):
+            cycles.append(cycle)
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                return cycles
+
+        # quitar el nodo inicial y seguir con lo que queda de la componente
+        remaining = [node for node in subgraph if node != start]
+        reduced = _subgraph(subgraph, remaining)
+        pending.extend(
+            _subgraph(reduced, component) for component in cyclic_components(reduced)
+        )
+
+    return cycles
+
+
+def _cycles_through(subgraph, start):
+    """Ciclos elementales que pasan por start dentro de una componente."""
+
+    path = [start]
+    blocked = {start}
+    closed = set()
+    blocked_by = defaultdict(set)
+    work = [(start, list(subgraph[start]))]
+
+    while work:
+        node, neighbors = work[-1]
+
+        if neighbors:
+            neighbor = neighbors.pop()
+
+            if neighbor == start:
+                yield list(path)
+                closed.update(path)
+
+            elif neighbor not in blocked:
+                path.append(neighbor)
+                work.append((neighbor, list(subgraph[neighbor])))
+                closed.discard(neighbor)
+                blocked.add(neighbor)
+                continue
+
+        if not neighbors:
+            if node in closed:
+                _unblock(node, blocked, blocked_by)
+            else:
+                for neighbor in subgraph[node]:
+                    blocked_by[neighbor].add(node)
+            work.pop()
+            path.pop()
+
+
+def _unblock(node, blocked, blocked_by):
+    pending = {node}
+    while pending:
+        current = pending.pop()
+        if current in blocked:
+            blocked.discard(current)
+            pending.update(blocked_by[current])
+            blocked_by[current].clear()
+
+
+def _subgraph(graph, nodes):
+    """Subgrafo inducido; los vecinos se ordenan al revés para que pop() los recorra en orden."""
+    members = set(nodes)
+    return {
+        node: sorted((n for n in _neighbors(graph, node) if n in members), reverse=True)
+        for node in nodes
+    }
+
+
+def _neighbors(graph, node):
+    return graph.get(node, ())
@@ -0,0 +1,175 @@
+"""
+CodeHunter - Ignore Rules
+Patrones de .gitignore y .codehunterignore compilados a expresiones
+regulares. Cada carpeta con alguno de esos archivos añade un nivel de
+reglas sobre las de su carpeta padre; como en git, las reglas más
+profundas y las últimas líneas de cada archivo tienen prioridad, y "!"
+vuelve a incluir lo que una regla anterior excluía.
+
+No se leen .git/info/exclude ni el excludesfile global de git, solo los
+archivos dentro del proyecto.
+"""
+
+import os
+import re
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+# En este orden: .codehunterignore puede reincluir lo que excluye .gitignore
+IGNORE_FILES = (".gitignore", ".codehunterignore")
+
+
+class IgnoreRules:
+    """Reglas de un archivo de ignorados (más las heredadas de las carpetas superiores)."""
+
+    def __init__(self, base, patterns, parent=None):
+        self.base = base            # carpeta del archivo de reglas
+        self.patterns = patterns    # [(regex, negar, solo_carpetas)] en orden del archivo
+        self.parent = parent
+        self._prefix_len = len(base) + 1
+
+        # una sola regex por tipo de entrada para descartar rápido lo que no coincide
+        self._any_dir = _combine(regex for regex, _, _ in patterns)
+        self._any_file = _combine(regex for regex, _, dir_only in patterns if not dir_only)
+
+    @classmethod
+    def load(cls, directory, names, parent=None):
+        """
+        Reglas para directory: las de parent más las de sus archivos de
+        ignorados (names: nombres de la carpeta, para no comprobar su
+        existencia en disco). Retorna parent si la carpeta no añade reglas.
+        """
+        patterns = []
+        for ignore_file in IGNORE_FILES:
+            if ignore_file in names:
+                patterns += _read_patterns(os.path.join(directory, ignore_file))
+
+        if not patterns:
+            return parent
+        return cls(directory, patterns, parent)
+
+    def ignored(self, path, is_dir):
+        """True si la ruta (dentro de la carpeta de estas reglas) está excluida."""
+        rules = self
+        while rules is not None:
+            decision = rules._match(path, is_dir)
+            if decision is not None:
+                return decision
+            rules = rules.parent
+        return False
+
+    def _match(self, path, is_dir):
+        relative = path[self._prefix_len:]
+        if os.sep != "/":
+            relative = relative.replace(os.sep, "/")
+
+        combined = self._any_dir if is_dir else self._any_file
+        if combined is None or not combined.fullmatch(relative):
+            return None
+
+        # la última regla que coincide decide
+        for regex, negate, dir_only in reversed(self.patterns):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(relative):
+                return not negate
+        return None
+
+
+def _read_patterns(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.read().splitlines()
+    except OSError as e:
+        logger.warning(f"[IgnoreRules] No se pudo leer {path}: {e}")
+        return []
+
+    patterns = []
+    for line in lines:
+        pattern = compile_pattern(line)
+        if pattern is not None:
+            patterns.append(pattern)
+    return patterns
+
+
+def compile_pattern(line):
+    """(regex, negar, solo_carpetas) de una línea de .gitignore, o None si no aporta regla."""
+    line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        # \# y \! escapan el primer carácter
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # con "/" al inicio o en medio el patrón es relativo a la carpeta del archivo;
+    # si no, coincide con el nombre en cualquier nivel
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate(line)
+    if not anchored and not body.startswith("(?:.*/)?"):
+        body = "(?:.*/)?" + body
+
+    try:
+        return re.compile(body, re.DOTALL), negate, dir_only
+    except re.error:
+        return None
+
+
+def _translate(pattern):
+    """Glob de gitignore a regex (*, ?, [..] y ** para cualquier número de carpetas)."""
+    parts = []
+    i = 0
+    n = len(pattern)
+
+    while i < n:
+        char = pattern[i]
+
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i) and (i + 2 == n):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+                continue
+            content = pattern[i + 1:end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            parts.append("[" + content.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif char == "\\" and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+
+    return "".join(parts)
+
+
+def _combine(regexes):
+    sources = [regex.pattern for regex in regexes]
+    if not sources:
+        return None
+    return re.compile("|".join(f"(?:{source})" for source in sources), re.DOTALL)
@@ -0,0 +1,124 @@
+"""
+CodeHunter - Índice de módulos del proyecto
+Mapea nombres de módulo con puntos ("pkg.sub.mod") a la ruta relativa de su
+archivo. Se construye una vez a partir de la lista de archivos ya recorrida
+y resuelve imports sin llamadas al sistema de archivos.
+
+get_module_index() comparte el índice de cada proyecto entre los
+analizadores de una ejecución (y entre ejecuciones de la GUI): solo se
+reconstruye si el manifiesto del proyecto relistó alguna carpeta.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+from .project_walker import walk_project, get_manifest
+
+
+class ModuleIndex:
+    """
+    Índice nombre de módulo -> Path relativo a la raíz del proyecto.
+    Los paquetes se resuelven a su __init__.py y, como en Python, tienen
+    prioridad sobre un módulo .py con el mismo nombre.
+    """
+
+    def __init__(self, relative_paths=()):
+        self._modules = {}
+        self._packages = {}
+        self._top_level = set()
+
+        for rel_path in relative_paths:
+            self.add(rel_path)
+
+    @classmethod
+    def from_project(cls, project_path):
+        """Construye el índice recorriendo el proyecto con walk_project()."""
+        index = cls()
+
+        for root, files in walk_project(project_path):
+            for file in files:
+                if file.endswith(".py"):
+                    index.add(os.path.relpath(os.path.join(root, file), project_path))
+
+        return index
+
+    def add(self, rel_path):
+        rel_path = Path(rel_path)
+        parts = rel_path.with_suffix("").parts
+
+        if not parts or rel_path.suffix != ".py":
+            return
+
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+            if not parts:
+                return
+            self._packages[".".join(parts)] = rel_path
+        else:
+            self._modules[".".join(parts)] = rel_path
+
+        self._top_level.add(parts[0])
+
+    def __len__(self):
+        return len(self._modules) + len(self._packages)
+
+    def resolve(self, module):
+        """Path relativo del módulo o paquete, o None si no es del proyecto."""
+        return self._packages.get(module) or self._modules.get(module)
+
+    def resolve_import(self, module, level, importer):
+        """
+        Resuelve un import [módulo, nivel] hecho desde el archivo importer
+        (Path relativo). Los imports relativos suben level - 1 carpetas.
+        """
+        if level <= 0:
+            return self.resolve(module)
+
+        base = Path(importer).parent.parts
+        up = level - 1
+
+        if up > len(base):
+            return None
+
+        prefix = base[:len(base) - up]
+        return self.resolve(".".join(prefix + tuple(module.split("."))))
+
+    def is_first_party(self, name):
+        """True si el primer segmento del nombre es un módulo o paquete del proyecto."""
+        return name.split(".")[0] in self._top_level
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Índices compartidos por el proceso
+# ──────────────────────────────────────────────────────────────────────────
+
+_INDEXES = {}   # ProjectManifest -> ([ManifestDirectory], ModuleIndex)
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_module_index(project_path):
+    """
+    ModuleIndex del proyecto (los .py de walk_project()) compartido por
+    todo el proceso. No se debe modificar con add().
+    """
+    manifest = get_manifest(project_path)
+    listing = list(manifest.directories().values())
+
+    with _INDEXES_LOCK:
+        cached = _INDEXES.get(manifest)
+
+        # el manifiesto reemplaza las carpetas que cambian: si son las mismas, el índice vale
+        if (cached is not None and len(cached[0]) == len(listing)
+                and all(a is b for a, b in zip(cached[0], listing))):
+            return cached[1]
+
+        index = ModuleIndex()
+        for directory in listing:
+            rel_root = os.path.relpath(directory.path, project_path)
+            for entry in directory.files:
+                if entry.name.endswith(".py"):
+                    index.add(os.path.join(rel_root, entry.name))
+
+        _INDEXES[manifest] = (listing, index)
+        return index
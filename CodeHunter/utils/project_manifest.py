@@ -0,0 +1,197 @@
+"""
+CodeHunter - Project Manifest
+Inventario de las carpetas y archivos del proyecto que se recorre una
+sola vez por sesión. Es la fuente de
+walk_project() / walk_python_files(), del árbol del proyecto y de las
+vistas de la GUI, así que todos ven los mismos archivos con las mismas
+exclusiones.
+
+Antes de cada uso se revalida con el mtime de cada carpeta (y de sus
+.gitignore / .codehunterignore): solo se vuelven a listar las carpetas
+que cambiaron. Editar un archivo no cambia el mtime de su carpeta, así
+que el manifiesto no guarda datos del contenido de los archivos: la
+caché de resultados, los índices y ParsedProject comprueban cada
+archivo con su propio stat.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .ignore_rules import IGNORE_FILES
+from .project_walker import list_directory
+
+
+class FileEntry:
+    """Un archivo del manifiesto (ruta y nombre)."""
+
+    __slots__ = ("path", "name")
+
+    def __init__(self, dir_entry):
+        self.path = dir_entry.path
+        self.name = dir_entry.name
+
+    def __repr__(self):
+        return f"FileEntry({self.path!r})"
+
+
+class ManifestDirectory:
+    """Una carpeta del manifiesto. No se modifica: al cambiar se reemplaza."""
+
+    __slots__ = ("path", "mtime_ns", "files", "subdirs", "rules", "ignore_stats", "entry_count")
+
+    def __init__(self, path, mtime_ns, files, subdirs, rules, ignore_stats, entry_count):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.files = files            # [FileEntry] en el orden del listado
+        self.subdirs = subdirs        # rutas de las subcarpetas no excluidas
+        self.rules = rules            # IgnoreRules vigentes en la carpeta (o None)
+        self.ignore_stats = ignore_stats
+        self.entry_count = entry_count  # entradas en disco, también las de .gitignore
+
+
+class ProjectManifest:
+    """
+    Carpetas y archivos de un proyecto, revalidados por mtime en cada
+    consulta. Es seguro usarlo desde varios hilos.
+
+    threads: hilos para listar carpetas (sistemas de archivos de red)
+    ignore_files: respetar .gitignore / .codehunterignore
+    """
+
+    def __init__(self, project_path, threads=0, ignore_files=True):
+        self.project_path = project_path
+        self.threads = threads
+        self.ignore_files = ignore_files
+
+        self._dirs = {}      # ruta -> ManifestDirectory, en orden de recorrido
+        self._lock = threading.Lock()
+
+        # carpetas listadas desde el disco (el resto se validó solo con stat)
+        self.listings = 0
+
+    def directories(self):
+        """{ruta: ManifestDirectory} revalidado, en el orden de os.walk."""
+        with self._lock:
+            self._dirs = self._sync()
+            return dict(self._dirs)
+
+    def walk(self):
+        """Hace yield de (root, [FileEntry]) como walk_entries()."""
+        for directory in self.directories().values():
+            yield directory.path, directory.files
+
+    # ──────────────────────────────────────────────────────────────────────
+    # Revalidación
+    # ──────────────────────────────────────────────────────────────────────
+
+    def _sync(self):
+        """Recorre las carpetas conocidas y relista las nuevas o modificadas."""
+        previous = self._dirs
+        current = {}
+
+        pool = None
+        submit = _run_now
+        if self.threads and self.threads > 1:
+            pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="manifest")
+            submit = pool.submit
+
+        try:
+            root = self.project_path
+            stack = [submit(self._check, root, None, previous.get(root), False)]
+
+            while stack:
+                directory, force = stack.pop().result()
+                if directory is None:
+                    continue
+
+                current[directory.path] = directory
+                stack.extend(
+                    submit(self._check, subdir, directory.rules, previous.get(subdir), force)
+                    for subdir in reversed(directory.subdirs)
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+        return current
+
+    def _check(self, path, parent_rules, known, force):
+        """
+        (ManifestDirectory vigente, forzar el relistado de las subcarpetas).
+        force: las reglas heredadas cambiaron; hay que relistar aunque el
+        mtime sea el mismo.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, False
+
+        if (known is not None and not force and known.mtime_ns == mtime_ns
+                and _ignore_stats(path, known.ignore_stats) == known.ignore_stats):
+            return known, False
+
+        listing = list_directory(path, parent_rules, self.ignore_files)
+        if listing is None:
+            return None, False
+
+        _, entries, subdirs, rules, entry_count = listing
+        self.listings += 1
+
+        files = [FileEntry(entry) for entry in entries]
+        ignore_stats = ()
+        if self.ignore_files:
+            ignore_stats = _ignore_stats(path, (
+                (entry.name, None, None) for entry in files if entry.name in IGNORE_FILES
+            ))
+
+        directory = ManifestDirectory(path, mtime_ns, files, subdirs, rules, ignore_stats, entry_count)
+        rules_changed = known is not None and known.ignore_stats != ignore_stats
+        return directory, force or rules_changed
+
+
+class _Done:
+    """Resultado ya calculado con la interfaz de un Future (recorrido secuencial)."""
+
+    __slots__ = ("_value",)
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+
+def _run_now(function, *args):
+    return _Done(function(*args))
+
+
+def _ignore_stats(path, known_stats):
+    """(nombre, mtime, tamaño) actuales de los archivos de reglas conocidos de la carpeta."""
+    stats = []
+    for name, _, _ in known_stats:
+        try:
+            stat = os.stat(os.path.join(path, name))
+        except OSError:
+            continue
+        stats.append((name, stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Manifiestos compartidos por el proceso
+# ──────────────────────────────────────────────────────────────────────────
+
+_MANIFESTS = {}
+_MANIFESTS_LOCK = threading.Lock()
+
+
+def get_project_manifest(project_path, threads=0, ignore_files=True):
+    """Manifiesto del proyecto compartido por todo el proceso (CLI y GUI)."""
+    # la ruta tal cual: las rutas del manifiesto se construyen a partir de ella
+    key = (os.path.abspath(project_path), project_path, threads, ignore_files)
+
+    with _MANIFESTS_LOCK:
+        if key not in _MANIFESTS:
+            _MANIFESTS[key] = ProjectManifest(project_path, threads, ignore_files)
+        return _MANIFESTS[key]
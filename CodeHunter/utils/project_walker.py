@@ -2,10 +2,24 @@
 CodeHunter - Project Walker
 Fuente única de verdad para recorrer el proyecto.
 Todos los analizadores deben usar walk_project() o walk_python_files().
+
+Los recorridos se leen del ProjectManifest del proyecto (ver
+project_manifest): el disco se lista una vez por sesión y después solo
+se relistan las carpetas cuyo mtime cambió. Cada carpeta se lista con
+os.scandir (el tipo de cada entrada viene del listado), se podan las
+carpetas de IGNORE_DIRS y se respetan los .gitignore / .codehunterignore
+del proyecto (ver ignore_rules). En sistemas de archivos de red, varios
+hilos pueden listar carpetas a la vez:
+
+    walker:
+      threads: 8          # 0 = secuencial
+      ignore_files: true  # respetar .gitignore / .codehunterignore
 """
 
 import os
-from pathlib import Path
+
+from .ignore_rules import IgnoreRules
+from ..core.config_loader import load_config
 
 
 IGNORE_DIRS = {
@@ -24,41 +38,27 @@ IGNORE_FILE_PATTERNS = (
 IGNORED_DIRS = IGNORE_DIRS
 
 
-def _should_ignore(path: str) -> bool:
-    """Retorna True si cualquier parte de la ruta es ignorada."""
-    return any(
-        part in IGNORE_DIRS or part.endswith(".egg-info")
-        for part in Path(path).parts
-    )
-
-
-def walk_project(project_path: str):
+def walk_project(project_path: str, threads: int = None, ignore_files: bool = None):
     """
     Recorre el proyecto haciendo yield de (root, files).
     Nunca entra en entornos virtuales, cachés ni carpetas de build.
-    """
-    for root, dirs, files in os.walk(project_path):
-
-        dirs[:] = [
-            d for d in dirs
-            if d not in IGNORE_DIRS
-            and not d.endswith(".egg-info")
-            and not d.startswith(".")
-        ]
-
-        if _should_ignore(root):
-            continue
 
-        yield root, files
+    threads / ignore_files: por defecto, los de la sección walker de la
+    configuración del proyecto.
+    """
+    for root, entries in walk_entries(project_path, threads, ignore_files):
+        yield root, [entry.name for entry in entries]
 
 
-def walk_python_files(project_path: str):
+def walk_python_files(project_path: str, threads: int = None, ignore_files: bool = None):
     """
     Hace yield de la ruta absoluta de cada archivo .py válido.
     """
-    for root, files in walk_project(project_path):
+    for root, entries in walk_entries(project_path, threads, ignore_files):
+
+        for entry in entries:
 
-        for fname in files:
+            fname = entry.name
 
             if not fname.endswith(".py"):
                 continue
@@ -68,4 +68,77 @@ def walk_python_files(project_path: str):
             if any(pattern in lower for pattern in IGNORE_FILE_PATTERNS):
                 continue
 
-            yield os.path.join(root, fname)
\ No newline at end of file
+            yield entry.path
+
+
+def walk_entries(project_path: str, threads: int = None, ignore_files: bool = None):
+    """
+    Como walk_project(), pero con las FileEntry del manifiesto (ruta y
+    nombre) en lugar de los nombres.
+
+    El orden es el de os.walk: cada carpeta antes que sus subcarpetas, en
+    el orden del listado, también con varios hilos.
+    """
+    return get_manifest(project_path, threads, ignore_files).walk()
+
+
+def get_manifest(project_path: str, threads: int = None, ignore_files: bool = None):
+    """ProjectManifest compartido del proyecto con la configuración walker indicada o la del proyecto."""
+    # importación diferida: project_manifest usa list_directory() de este módulo
+    from .project_manifest import get_project_manifest
+
+    config = load_config(project_path).get("walker", {})
+    if threads is None:
+        threads = config.get("threads", 0)
+    if ignore_files is None:
+        ignore_files = config.get("ignore_files", True)
+
+    return get_project_manifest(project_path, threads or 0, bool(ignore_files))
+
+
+def list_directory(path, parent_rules, ignore_files):
+    """
+    (path, archivos, subcarpetas, reglas, entradas) de una carpeta tras
+    aplicar las exclusiones: os.DirEntry de los archivos, rutas de las
+    subcarpetas, las IgnoreRules vigentes en ella y el número de entradas
+    sin contar las carpetas de IGNORE_DIRS (los archivos y carpetas de
+    .gitignore sí cuentan). None si no se puede leer.
+    """
+    try:
+        with os.scandir(path) as iterator:
+            entries = list(iterator)
+    except OSError:
+        # como os.walk: una carpeta ilegible se omite
+        return None
+
+    rules = parent_rules
+    if ignore_files:
+        rules = IgnoreRules.load(path, {entry.name for entry in entries}, parent_rules)
+
+    files = []
+    subdirs = []
+    count = 0
+
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if is_dir:
+            name = entry.name
+            if name in IGNORE_DIRS or name.endswith(".egg-info"):
+                continue
+            count += 1
+            if name.startswith(".") or entry.is_symlink():
+                continue
+            if rules is not None and rules.ignored(entry.path, True):
+                continue
+            subdirs.append(entry.path)
+
+        else:
+            count += 1
+            if rules is None or not rules.ignored(entry.path, False):
+                files.append(entry)
+
+    return path, files, subdirs, rules, count
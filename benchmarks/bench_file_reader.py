@@ -0,0 +1,92 @@
+"""
+Benchmark - Lectura de archivos grandes
+Compara la memoria máxima de leer un archivo generado grande en modo texto
+y dividirlo con split("\\n") (como hacían los analizadores) contra
+read_parsed_file(), que decodifica desde un mmap y guarda una tabla de
+offsets en lugar de la lista de líneas.
+
+Uso: python benchmarks/bench_file_reader.py [líneas]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.core.parsed_project import read_parsed_file
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_LINES = 500000
+# Líneas pedidas una a una, como los snippets de los detectores
+SNIPPETS = 1000
+
+
+def generated_module(path, line_count):
+    """Un módulo como los generados (tablas de datos, protobuf...)."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("DATA = [\n")
+        for i in range(line_count - 2):
+            f.write(f"    {{'id': {i}, 'name': 'item_{i}', 'value': {i * 31 % 977}}},\n")
+        f.write("]\n")
+
+
+def read_split(path):
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        source = f.read()
+    lines = source.split("\n")
+    return source, lines
+
+
+def read_table(path):
+    parsed_file = read_parsed_file(path)
+    return parsed_file.source, parsed_file.lines
+
+
+def read_with_snippets(reader, path):
+    source, lines = reader(path)
+    step = max(1, len(lines) // SNIPPETS)
+    snippets = [lines[i].strip() for i in range(0, len(lines), step)]
+    return source, lines, snippets
+
+
+def measure(reader, path):
+    # el tiempo se mide sin tracemalloc, que ralentiza cada asignación
+    start = time.perf_counter()
+    read_with_snippets(reader, path)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = read_with_snippets(reader, path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+    return elapsed, current, peak
+
+
+def main(line_count):
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - LECTURA DE ARCHIVOS GRANDES")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "generated.py")
+        generated_module(path, line_count)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"\nArchivo: {line_count} líneas, {size_mb:.1f} MB\n")
+
+        for label, reader in (("open().read() + split", read_split),
+                              ("mmap + LineTable", read_table)):
+            elapsed, current, peak = measure(reader, path)
+            print(f"  {label:<24} {elapsed:6.2f}s   "
+                  f"retenida {current / 1024 / 1024:7.1f} MB   pico {peak / 1024 / 1024:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES)
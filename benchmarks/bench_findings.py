@@ -0,0 +1,118 @@
+"""
+Benchmark - Memoria y tiempo de creación de hallazgos
+Crea muchos AdvancedFinding sobre unos pocos miles de archivos (como un
+análisis grande) y mide el tiempo de creación, la memoria retenida por
+hallazgo, la conversión a to_dict() y las métricas / top de archivos /
+filtros recorriendo la lista frente a hacerlo sobre el FindingsStore.
+
+Uso: python benchmarks/bench_findings.py [hallazgos]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.core.models import AdvancedFinding, Severity, Category
+from CodeHunter.core.findings_store import FindingsStore
+from CodeHunter.analyzers.advanced_diagnostics import (
+    calculate_advanced_metrics, get_files_with_most_issues, get_findings_by_severity,
+)
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_FINDINGS = 500000
+FILES = 2000
+SNIPPET = "    result = compute_total(items, discount=0.1)  # TODO revisar"
+
+
+def make_findings(count, paths):
+    severities = list(Severity)
+    categories = list(Category)
+
+    return [
+        AdvancedFinding(
+            severities[i % len(severities)],
+            categories[i % len(categories)],
+            f"Función 'handler_{i}' demasiado larga",
+            paths[i % len(paths)],
+            i % 900 + 1,
+            "Dividir la función en funciones más pequeñas",
+            SNIPPET[:20 + i % 40],
+        )
+        for i in range(count)
+    ]
+
+
+def aggregate_with_loops(findings):
+    """Métricas, top de archivos y filtro recorriendo la lista (como antes)."""
+    severities = {}
+    categories = {}
+    files = {}
+    for finding in findings:
+        severities[finding.severity] = severities.get(finding.severity, 0) + 1
+        categories[finding.category] = categories.get(finding.category, 0) + 1
+        files[finding.file] = files.get(finding.file, 0) + 1
+    top = sorted(files.items(), key=lambda item: item[1], reverse=True)[:10]
+    majors = [finding for finding in findings if finding.severity == Severity.MAJOR]
+    return severities, categories, top, majors
+
+
+def aggregate_with_store(store):
+    return (
+        calculate_advanced_metrics(store),
+        get_files_with_most_issues(store),
+        get_findings_by_severity(store, Severity.MAJOR),
+    )
+
+
+def main(count):
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - HALLAZGOS")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    paths = [os.path.join(ROOT, f"pkg{i % 40}", f"module_{i}.py") for i in range(FILES)]
+
+    start = time.perf_counter()
+    findings = make_findings(count, paths)
+    elapsed = time.perf_counter() - start
+    print(f"\n  Creación de {count} hallazgos   {elapsed:6.2f}s")
+    del findings
+
+    tracemalloc.start()
+    findings = make_findings(count, paths)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  Memoria retenida             {current / 1024 / 1024:6.1f} MB "
+          f"({current / count:.0f} B por hallazgo)")
+
+    start = time.perf_counter()
+    dicts = [finding.to_dict() for finding in findings]
+    print(f"  to_dict()                    {time.perf_counter() - start:6.2f}s")
+
+    start = time.perf_counter()
+    restored = [AdvancedFinding.from_dict(data) for data in dicts]
+    print(f"  from_dict()                  {time.perf_counter() - start:6.2f}s")
+
+    assert restored == findings, "to_dict() / from_dict() no conserva los hallazgos"
+    del dicts, restored
+
+    start = time.perf_counter()
+    aggregate_with_loops(findings)
+    print(f"\n  Agregación recorriendo la lista {time.perf_counter() - start:6.2f}s")
+
+    start = time.perf_counter()
+    store = FindingsStore(findings)
+    print(f"  Construcción del store       {time.perf_counter() - start:6.2f}s")
+
+    start = time.perf_counter()
+    aggregate_with_store(store)
+    print(f"  Agregación sobre el store    {time.perf_counter() - start:6.2f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FINDINGS)
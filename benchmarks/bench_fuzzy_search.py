@@ -0,0 +1,126 @@
+"""
+Benchmark - Búsqueda aproximada de símbolos
+Construye un FuzzyIndex con nombres sintéticos (snake_case, camelCase y
+PascalCase) y mide la latencia por consulta simulando cada pulsación de
+teclado de varias búsquedas (prefijos, iniciales, subsecuencias y erratas).
+Comprueba además que las abreviaturas conocidas encuentran su nombre (sale
+con código 1 si alguna no lo hace).
+
+Uso: python benchmarks/bench_fuzzy_search.py [símbolos]
+"""
+
+import os
+import sys
+import time
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.utils.fuzzy_index import FuzzyIndex
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_SYMBOLS = 500000
+SEED = 42
+RESULT_LIMIT = 20
+
+WORDS = (
+    "get set build parse load save read write run check detect find search "
+    "analyze scan resolve merge update create delete handle process compute "
+    "file path project module function class import config cache index node "
+    "tree token line block report finding result error value item list name "
+    "user data request response session manager handler service client server"
+).split()
+
+QUERIES = (
+    "build_function_index",
+    "bfi",
+    "usrmngr",
+    "analize_projct",
+    "detect_circualr",
+    "ResultCache",
+    "cachidx",
+)
+
+# (abreviatura, nombre que debe estar entre los resultados); los nombres se añaden al índice
+ABBREVIATIONS = (
+    ("usrmngr", "user_manager"),
+    ("usrmngr", "userManager"),
+    ("usrmngr", "UserManager"),
+    ("cachidx", "cache_index"),
+    ("rsltcch", "ResultCache"),
+    ("anlzprj", "analyzeProject"),
+    ("bfi", "build_file_index"),
+    ("prsrqst", "parse_request"),
+)
+
+
+def synthetic_names(count, rng):
+    names = set()
+
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(1, 4))
+        style = rng.random()
+
+        if style < 0.6:
+            name = "_".join(words)
+        elif style < 0.8:
+            name = words[0] + "".join(word.title() for word in words[1:])
+        else:
+            name = "".join(word.title() for word in words)
+
+        if rng.random() < 0.3:
+            name += str(rng.randint(0, 99))
+
+        names.add(name)
+
+    return sorted(names)
+
+
+def main(count):
+    rng = random.Random(SEED)
+
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - BÚSQUEDA APROXIMADA DE SÍMBOLOS")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    names = synthetic_names(count, rng) + [target for _, target in ABBREVIATIONS]
+
+    start = time.perf_counter()
+    index = FuzzyIndex(names)
+    print(f"\nÍndice: {len(index)} nombres construidos en {time.perf_counter() - start:.2f}s\n")
+
+    latencies = []
+
+    for query in QUERIES:
+        per_query = []
+
+        # una consulta por pulsación, como al buscar mientras se escribe
+        for length in range(1, len(query) + 1):
+            start = time.perf_counter()
+            results = index.search(query[:length], RESULT_LIMIT)
+            per_query.append((time.perf_counter() - start) * 1000)
+
+        latencies.extend(per_query)
+        best = results[0][1] if results else "-"
+        print(f"  {query:<22} máx {max(per_query):7.1f} ms   → {best}")
+
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"\nPor pulsación: p50 {p50:.1f} ms · p95 {p95:.1f} ms · máx {latencies[-1]:.1f} ms")
+
+    print("\nAbreviaturas:")
+    missing = 0
+    for query, target in ABBREVIATIONS:
+        found = target in [name for _, name in index.search(query, RESULT_LIMIT)]
+        missing += not found
+        print(f"  {'✅' if found else '❌'} {query:<10} → {target}")
+
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SYMBOLS))
@@ -0,0 +1,133 @@
+"""
+Benchmark - Detección de ciclos en grafos de imports sintéticos
+Compara el DFS anterior (copia del camino en cada push) con el motor de
+componentes fuertemente conexas (Tarjan) y la enumeración acotada de
+ciclos elementales (Johnson).
+
+Uso: python benchmarks/bench_import_cycles.py [módulos] [límite_dfs_anterior]
+"""
+
+import os
+import sys
+import time
+import random
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.utils.graph_cycles import cyclic_components, elementary_cycles
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_MODULES = 50000
+# El DFS anterior es cúbico en cadenas profundas: por encima de este tamaño no se ejecuta
+DEFAULT_LEGACY_LIMIT = 1000
+MAX_CYCLES = 1000
+SEED = 42
+
+
+def layered_graph(modules, rng):
+    """Paquetes en capas con imports hacia capas inferiores y algunos ciclos."""
+    graph = {}
+    layer_size = max(1, modules // 50)
+
+    for node in range(modules):
+        layer = node // layer_size
+        lower = range(0, layer * layer_size)
+        targets = set(rng.sample(lower, min(4, len(lower)))) if lower else set()
+        # ~1% de los módulos importan "hacia arriba" dentro de su capa
+        if rng.random() < 0.01:
+            targets.add(min(modules - 1, node + rng.randint(1, layer_size)))
+            targets.discard(node)
+        graph[node] = targets
+
+    # cerrar algunos ciclos entre capas
+    for _ in range(modules // 1000):
+        a = rng.randrange(modules)
+        b = rng.randrange(modules)
+        if a != b:
+            graph[a].add(b)
+            graph[b].add(a)
+
+    return {node: sorted(targets) for node, targets in graph.items()}
+
+
+def chain_graph(modules):
+    """Cadena profunda a -> b -> ... -> z con una arista de vuelta al inicio."""
+    graph = {node: [node + 1] for node in range(modules - 1)}
+    graph[modules - 1] = [0]
+    return graph
+
+
+def legacy_find_cycles(graph):
+    """DFS del detector anterior (referencia para la comparación)."""
+    visited = set()
+    cycles = []
+    reported = set()
+
+    for start_node in graph:
+        if start_node in visited:
+            continue
+
+        stack = [(start_node, [start_node])]
+
+        while stack:
+            node, path = stack.pop()
+
+            if node in visited and node not in path:
+                continue
+
+            for neighbor in graph.get(node, []):
+                if neighbor in path:
+                    idx = path.index(neighbor)
+                    cycle = path[idx:]
+                    key = tuple(sorted(cycle))
+                    if key not in reported:
+                        reported.add(key)
+                        cycles.append(cycle)
+                elif neighbor not in visited:
+                    stack.append((neighbor, path + [neighbor]))
+
+        visited.add(start_node)
+
+    return cycles
+
+
+def measure(label, function, graph):
+    start = time.perf_counter()
+    result = function(graph)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<34} {len(result):>7} ciclos   {elapsed:>8.3f}s")
+
+
+def run_case(name, graph, legacy_limit):
+    edges = sum(len(targets) for targets in graph.values())
+    print(f"\n{name}: {len(graph)} módulos, {edges} imports")
+
+    measure("Tarjan (componentes)", cyclic_components, graph)
+    measure(f"Johnson (máx. {MAX_CYCLES} ciclos)",
+            lambda g: elementary_cycles(g, MAX_CYCLES), graph)
+
+    if len(graph) <= legacy_limit:
+        measure("DFS anterior", legacy_find_cycles, graph)
+    else:
+        print(f"  {'DFS anterior':<34} omitido (> {legacy_limit} módulos)")
+
+
+def main(modules, legacy_limit):
+    rng = random.Random(SEED)
+
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - CICLOS DE IMPORTS")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    run_case("Capas", layered_graph(modules, rng), legacy_limit)
+    run_case("Cadena profunda", chain_graph(modules), legacy_limit)
+    run_case("Cadena profunda (pequeña)", chain_graph(min(modules, legacy_limit)), legacy_limit)
+
+
+if __name__ == "__main__":
+    modules = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MODULES
+    legacy_limit = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LEGACY_LIMIT
+    main(modules, legacy_limit)
@@ -0,0 +1,79 @@
+"""
+Benchmark - Exportación del informe PDF
+Genera informes con muchos hallazgos sintéticos (repartidos en unos miles
+de archivos y unas decenas de reglas) y mide el tiempo, la memoria máxima
+y el tamaño del PDF.
+
+Uso: python benchmarks/bench_pdf_report.py [hallazgos ...]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.core.models import Finding, Level
+from CodeHunter.infrastructure.pdf_exporter import export_report_to_pdf
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_SIZES = (10000, 100000)
+FILES = 2000
+MESSAGES = (
+    "👃 Número mágico {i}",
+    "👃 Función 'handler_{i}' muy larga ({n} líneas)",
+    "👃 Variable 'tmp_{i}' asignada pero nunca usada",
+    "🐛 Excepción capturada pero ignorada con 'pass'",
+    "👃 Anidamiento muy profundo (nivel {n})",
+    "🔒 Posible inyección SQL por concatenación de strings",
+)
+LEVELS = (Level.INFO, Level.WARNING, Level.WARNING, Level.CRITICAL, Level.INFO, Level.CRITICAL)
+
+
+def make_findings(count):
+    return [
+        Finding(
+            LEVELS[i % len(LEVELS)],
+            MESSAGES[i % len(MESSAGES)].format(i=i, n=i % 90 + 10),
+            os.path.join("pkg", f"mod{i % 40}", f"module_{i % FILES}.py"),
+            i % 900 + 1,
+            "Revisar el código señalado",
+        )
+        for i in range(count)
+    ]
+
+
+def measure(exporter, findings, output):
+    data = {"score": 42, "critical": 1, "warnings": 2, "findings": findings}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    exporter(ROOT, "Proyecto sintético\nBenchmark", data, output)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, os.path.getsize(output)
+
+
+def main(sizes):
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - INFORME PDF")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            findings = make_findings(count)
+            output = os.path.join(tmp, f"report_{count}.pdf")
+            elapsed, peak, size = measure(export_report_to_pdf, findings, output)
+            print(f"\n  {count:>7} hallazgos   {elapsed:6.2f}s   "
+                  f"pico {peak / 1024 / 1024:6.1f} MB   PDF {size / 1024:7.0f} KB")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
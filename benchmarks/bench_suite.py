@@ -0,0 +1,320 @@
+"""
+Benchmark - Suite completa sobre un proyecto sintético
+Genera un proyecto con synthetic_project.py (o usa uno existente con
+--project) y mide cada etapa en un proceso nuevo: tiempo, rendimiento
+(archivos/s, líneas/s) y pico de memoria (RSS). Cada ejecución se agrega
+a un historial JSON y se compara con la última ejecución con los mismos
+parámetros, para detectar regresiones entre commits.
+
+Etapas: doctor (run_code_doctor), search (search_code con varias
+consultas), cycles (detect_circular_imports), profile
+(build_project_profile) y pdf (export_report_to_pdf; el diagnóstico
+previo no cuenta en el tiempo, pero sí en el pico de memoria).
+
+Uso: python benchmarks/bench_suite.py [--files N] [--functions N]
+     [--duplication R] [--imports N] [--depth N] [--jobs N]
+     [--stages doctor,search,...] [--repeat N] [--project RUTA]
+     [--history ARCHIVO]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_project import (
+    generate_project, DEFAULT_FILES, DEFAULT_FUNCTIONS, DEFAULT_DUPLICATION,
+    DEFAULT_IMPORTS, DEFAULT_DEPTH, DEFAULT_SEED,
+)
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, el pico de memoria queda en None
+    resource = None
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+DEFAULT_HISTORY = os.path.join(ROOT, "benchmarks", "history.json")
+STAGES = ("doctor", "search", "cycles", "profile", "pdf")
+SEARCH_QUERIES = ("module_1_func_3", "total", "call:transform", "def:params>2", "re:SELECT \\*")
+
+# Diferencia de tiempo (respecto a la ejecución anterior) marcada como regresión
+REGRESSION_THRESHOLD = 0.10
+
+CACHE_DIR = ".codehunter_cache"
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Etapas (se ejecutan en un proceso nuevo cada una)
+# ──────────────────────────────────────────────────────────────────────────
+
+def stage_doctor(project, jobs):
+    from CodeHunter.analyzers.system_doctor import run_code_doctor
+
+    start = time.perf_counter()
+    result = run_code_doctor(project, jobs=jobs, use_cache=False)
+    return time.perf_counter() - start, {"findings": len(result["advanced_findings"])}
+
+
+def stage_search(project, jobs):
+    from CodeHunter.analyzers.smart_code_searcher import search_code
+
+    start = time.perf_counter()
+    counts = {query: len(search_code(project, query)) for query in SEARCH_QUERIES}
+    return time.perf_counter() - start, {"results": counts}
+
+
+def stage_cycles(project, jobs):
+    from CodeHunter.analyzers.circular_imports import detect_circular_imports
+
+    start = time.perf_counter()
+    cycles = detect_circular_imports(project)
+    return time.perf_counter() - start, {"cycles": len(cycles)}
+
+
+def stage_profile(project, jobs):
+    from CodeHunter.analyzers.project_profiler import build_project_profile
+
+    start = time.perf_counter()
+    build_project_profile(project)
+    return time.perf_counter() - start, {}
+
+
+def stage_pdf(project, jobs):
+    from CodeHunter.analyzers.system_doctor import run_code_doctor
+    from CodeHunter.analyzers.full_report import build_full_diagnosis_data
+    from CodeHunter.infrastructure.pdf_exporter import export_report_to_pdf
+
+    result = run_code_doctor(project, jobs=jobs, use_cache=False)
+    report = build_full_diagnosis_data(project, result)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "report.pdf")
+        start = time.perf_counter()
+        export_report_to_pdf(project, "Proyecto sintético", report, output)
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(output)
+
+    return elapsed, {"findings": len(report["findings"]), "pdf_bytes": size}
+
+
+STAGE_FUNCTIONS = {
+    "doctor": stage_doctor,
+    "search": stage_search,
+    "cycles": stage_cycles,
+    "profile": stage_profile,
+    "pdf": stage_pdf,
+}
+
+
+def _measure(stage, project, jobs):
+    """Dentro del proceso de la etapa: tiempo, detalles y pico de RSS."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+        elapsed, details = STAGE_FUNCTIONS[stage](project, jobs)
+    return elapsed, details, _peak_rss()
+
+
+def _peak_rss():
+    """Pico de RSS en bytes de este proceso y de sus workers (el mayor)."""
+    if resource is None:
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return scale * max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                       resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def run_stage(stage, project, jobs):
+    # la caché de resultados / símbolos de otra etapa no debe influir
+    shutil.rmtree(os.path.join(project, CACHE_DIR), ignore_errors=True)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(_measure, stage, project, jobs).result()
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Historial
+# ──────────────────────────────────────────────────────────────────────────
+
+def git_revision():
+    """(commit corto, hay cambios sin confirmar) o (None, None) fuera de git."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(status)
+
+
+def load_history(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_history(path, history):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(history, f, ensure_ascii=False, indent=2)
+
+
+def previous_run(history, params):
+    """Última ejecución con los mismos parámetros (las etapas pueden variar), o None."""
+    for entry in reversed(history):
+        if entry.get("params") == params:
+            return entry
+    return None
+
+
+# ──────────────────────────────────────────────────────────────────────────
+# Ejecución
+# ──────────────────────────────────────────────────────────────────────────
+
+def count_lines(project):
+    files = 0
+    loc = 0
+    for root, dirs, names in os.walk(project):
+        dirs[:] = [d for d in dirs if d != CACHE_DIR and not d.startswith(".")]
+        for name in names:
+            if name.endswith(".py"):
+                files += 1
+                with open(os.path.join(root, name), "rb") as f:
+                    loc += sum(1 for _ in f)
+    return {"files": files, "loc": loc}
+
+
+def run_suite(project, stages, jobs, repeat):
+    size = count_lines(project)
+    results = {}
+
+    for stage in stages:
+        runs = [run_stage(stage, project, jobs) for _ in range(repeat)]
+        elapsed = min(run[0] for run in runs)
+        peaks = [run[2] for run in runs if run[2] is not None]
+
+        results[stage] = {
+            "seconds": elapsed,
+            "files_per_second": size["files"] / elapsed if elapsed else None,
+            "loc_per_second": size["loc"] / elapsed if elapsed else None,
+            "peak_rss_mb": max(peaks) / 1024 / 1024 if peaks else None,
+            "details": runs[0][1],
+        }
+
+    return size, results
+
+
+def print_results(size, results, previous):
+    print(f"\nProyecto: {size['files']} archivos, {size['loc']} líneas\n")
+    print(f"  {'Etapa':<10} {'Tiempo':>9} {'Archivos/s':>11} {'Líneas/s':>11} {'Pico RSS':>10}  Anterior")
+
+    for stage, result in results.items():
+        rss = f"{result['peak_rss_mb']:.0f} MB" if result["peak_rss_mb"] is not None else "-"
+        line = (f"  {stage:<10} {result['seconds']:>8.2f}s {result['files_per_second']:>11.0f} "
+                f"{result['loc_per_second']:>11.0f} {rss:>10}")
+
+        before = (previous or {}).get("stages", {}).get(stage)
+        if before:
+            change = (result["seconds"] - before["seconds"]) / before["seconds"]
+            marker = "⚠️ " if change > REGRESSION_THRESHOLD else ""
+            line += f"  {marker}{change:+.0%} ({before['seconds']:.2f}s)"
+        print(line)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de CodeHunter")
+    parser.add_argument("--files", type=int, default=DEFAULT_FILES)
+    parser.add_argument("--functions", type=int, default=DEFAULT_FUNCTIONS)
+    parser.add_argument("--duplication", type=float, default=DEFAULT_DUPLICATION)
+    parser.add_argument("--imports", type=float, default=DEFAULT_IMPORTS)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--jobs", type=int, default=1, help="workers de run_code_doctor")
+    parser.add_argument("--stages", default=",".join(STAGES),
+                        help=f"etapas separadas por comas ({', '.join(STAGES)})")
+    parser.add_argument("--repeat", type=int, default=1, help="repeticiones (se guarda la mejor)")
+    parser.add_argument("--project", default=None, help="medir este proyecto en lugar del sintético")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--no-history", action="store_true", help="no guardar la ejecución")
+
+    args = parser.parse_args(argv)
+    args.stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        parser.error(f"etapas desconocidas: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - SUITE COMPLETA")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+
+    if args.project:
+        params = {"project": os.path.abspath(args.project)}
+    else:
+        params = {
+            "files": args.files, "functions": args.functions,
+            "duplication": args.duplication, "imports": args.imports,
+            "depth": args.depth, "seed": args.seed,
+        }
+    params["jobs"] = args.jobs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        project = args.project
+        if project is None:
+            project = os.path.join(tmp, "synthetic")
+            generate_project(project, args.files, args.functions, args.duplication,
+                             args.imports, args.depth, args.seed)
+
+        size, results = run_suite(project, args.stages, args.jobs, args.repeat)
+
+    history = load_history(args.history)
+    previous = previous_run(history, params)
+    print_results(size, results, previous)
+
+    commit, dirty = git_revision()
+    entry = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "params": params,
+        "project": size,
+        "stages": results,
+    }
+
+    if not args.no_history:
+        history.append(entry)
+        save_history(args.history, history)
+        print(f"\n📁 Historial: {args.history} ({len(history)} ejecuciones)")
+
+
+if __name__ == "__main__":
+    main()
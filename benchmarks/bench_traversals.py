@@ -0,0 +1,161 @@
+"""
+Benchmark - Recorridos del AST por archivo
+Compara ejecutar cada detector por separado (un recorrido por detector,
+como hacía el motor anterior) contra el recorrido único de analyze_file().
+
+Uso: python benchmarks/bench_traversals.py <ruta_proyecto>
+"""
+
+import os
+import sys
+import ast
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from CodeHunter.core.config_loader import load_config
+from CodeHunter.utils.project_walker import walk_python_files
+from CodeHunter.analyzers import ast_dispatch
+from CodeHunter.analyzers.ast_fingerprint import Fingerprinter
+from CodeHunter.analyzers import bug_detector, vulnerability_scanner, code_smell_detector
+from CodeHunter.analyzers import security_hotspots, duplicate_code_detector, duplicate_block_detector
+
+SEPARATOR_WIDTH = 60
+SEPARATOR_CHAR = "="
+
+
+class TraversalCounter:
+    """
+    Cuenta los recorridos completos del árbol del archivo analizado.
+    No cuenta los árboles auxiliares que pudiera crear un detector.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.target = None
+        self._patched = []
+
+    def __enter__(self):
+        self._wrap(ast, "walk")
+        self._wrap(ast.NodeVisitor, "visit")
+        self._wrap(ast_dispatch, "dispatch")
+        # Los módulos de detectores importan dispatch por nombre
+        for module in (bug_detector, vulnerability_scanner, code_smell_detector,
+                       security_hotspots, duplicate_code_detector, duplicate_block_detector):
+            if hasattr(module, "dispatch"):
+                self._wrap(module, "dispatch")
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._patched):
+            setattr(owner, name, original)
+
+    def _wrap(self, owner, name):
+        original = getattr(owner, name)
+        counter = self
+
+        def wrapper(*args, **kwargs):
+            # NodeVisitor.visit recibe self como primer argumento
+            node = args[1] if owner is ast.NodeVisitor else args[0]
+            if node is counter.target:
+                counter.count += 1
+            return original(*args, **kwargs)
+
+        self._patched.append((owner, name, original))
+        setattr(owner, name, wrapper)
+
+
+def run_detectors_separately(tree, file_path, lines, config):
+    """Un recorrido por detector (equivalente al motor anterior)."""
+    detectors = [
+        bug_detector.detect_except_pass,
+        bug_detector.detect_unused_variables,
+        bug_detector.detect_constant_conditions,
+        bug_detector.detect_unreachable_code,
+        bug_detector.detect_missing_return,
+        bug_detector.detect_mutable_default_args,
+        vulnerability_scanner.detect_eval_exec,
+        vulnerability_scanner.detect_pickle_usage,
+        vulnerability_scanner.detect_shell_injection,
+        vulnerability_scanner.detect_sql_injection,
+        vulnerability_scanner.detect_path_traversal,
+        vulnerability_scanner.detect_unsafe_deserialization,
+        vulnerability_scanner.detect_weak_crypto,
+        lambda t, f, l: ast_dispatch.run_plugin(t, code_smell_detector.GlobalAnalyzer(f, l, config)),
+        code_smell_detector.detect_deep_nesting,
+        code_smell_detector.detect_poor_naming,
+        code_smell_detector.detect_long_parameter_list,
+        lambda t, f, l: security_hotspots.run_hotspot_detectors(t, f, l, config),
+        duplicate_code_detector.collect_function_hashes,
+        duplicate_block_detector.collect_block_hashes,
+    ]
+
+    for detector in detectors:
+        detector(tree, file_path, lines)
+
+
+def run_single_pass(tree, file_path, lines, config):
+    """Mismo trabajo que analyze_file() pero con el árbol ya parseado."""
+    fingerprinter = Fingerprinter()
+    plugins = (
+        bug_detector.build_bug_plugins(file_path, lines, config)
+        + vulnerability_scanner.build_vulnerability_plugins(file_path, lines, config)
+        + code_smell_detector.build_smell_plugins(file_path, lines, config, fingerprinter)
+        + security_hotspots.build_hotspot_plugins(file_path, lines, config)
+        + [duplicate_code_detector.FunctionHashCollector(file_path, lines, fingerprinter),
+           duplicate_block_detector.BlockHashCollector(file_path, lines, fingerprinter)]
+    )
+    ast_dispatch.dispatch(tree, plugins)
+
+
+def load_files(project_path):
+    parsed = []
+
+    for file_path in sorted(walk_python_files(project_path)):
+        try:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                source = f.read()
+            parsed.append((ast.parse(source), file_path, source.split("\n")))
+        except Exception:
+            continue
+
+    return parsed
+
+
+def measure(label, runner, parsed, config):
+    with TraversalCounter() as counter:
+        start = time.perf_counter()
+        for tree, file_path, lines in parsed:
+            counter.target = tree
+            runner(tree, file_path, lines, config)
+        elapsed = time.perf_counter() - start
+
+    per_file = counter.count / len(parsed) if parsed else 0
+    print(f"  {label:<24} {per_file:>5.1f} recorridos/archivo   {elapsed:>7.2f}s")
+
+    return per_file, elapsed
+
+
+def main(project_path):
+    config = load_config(project_path)
+    parsed = load_files(project_path)
+
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print("⏱  BENCHMARK - RECORRIDOS DEL AST")
+    print(SEPARATOR_CHAR * SEPARATOR_WIDTH)
+    print(f"Proyecto: {project_path} ({len(parsed)} archivos)\n")
+
+    _, before = measure("Detectores por separado", run_detectors_separately, parsed, config)
+    _, after = measure("Recorrido único", run_single_pass, parsed, config)
+
+    if after:
+        print(f"\n  Speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python benchmarks/bench_traversals.py <ruta_proyecto>")
+        sys.exit(1)
+
+    main(sys.argv[1])
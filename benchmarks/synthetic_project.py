@@ -0,0 +1,144 @@
+"""
+Benchmark - Generador de proyectos sintéticos
+Crea un proyecto Python de tamaño configurable para los benchmarks:
+paquetes con módulos, funciones con anidamiento a una profundidad dada,
+una fracción de funciones duplicadas entre archivos y un grafo de imports
+internos con la densidad pedida (con algunos ciclos). Con la misma
+semilla el proyecto generado es siempre el mismo.
+
+Uso: python benchmarks/synthetic_project.py <destino> [archivos]
+"""
+
+import os
+import sys
+import random
+
+
+DEFAULT_FILES = 200
+DEFAULT_FUNCTIONS = 10
+DEFAULT_DUPLICATION = 0.1      # fracción de funciones copiadas de otro archivo
+DEFAULT_IMPORTS = 3.0          # imports internos medios por módulo
+DEFAULT_DEPTH = 3              # bloques anidados dentro de cada función
+DEFAULT_SEED = 42
+
+MODULES_PER_PACKAGE = 20
+# Fracción de imports que apuntan "hacia adelante" y pueden cerrar ciclos
+BACK_EDGE_RATIO = 0.05
+
+# Sentencias de relleno: dan variedad a los detectores (números mágicos,
+# variables sin usar, llamadas con muchos argumentos, SQL concatenado...)
+FILLER = (
+    "total = total + value * {n}",
+    "unused_{i} = len(items) + {n}",
+    "result.append(transform(value, {n}, key, reverse, default, strict, extra))",
+    "query = \"SELECT * FROM items WHERE id = \" + str(value)",
+    "if value is None:\n{pad}    continue",
+    "try:\n{pad}    total += int(value)\n{pad}except ValueError:\n{pad}    pass",
+)
+
+
+def generate_project(root, files=DEFAULT_FILES, functions=DEFAULT_FUNCTIONS,
+                     duplication=DEFAULT_DUPLICATION, imports=DEFAULT_IMPORTS,
+                     depth=DEFAULT_DEPTH, seed=DEFAULT_SEED):
+    """
+    Escribe el proyecto en root y retorna {"files": n, "loc": líneas}.
+
+    files: módulos .py (sin contar los __init__.py)
+    functions: funciones por módulo
+    duplication: fracción de funciones que repiten el cuerpo de otra
+    imports: imports internos medios por módulo
+    depth: niveles de bloques anidados en cada función
+    """
+    rng = random.Random(seed)
+    modules = [_module_name(i) for i in range(files)]
+
+    os.makedirs(root, exist_ok=True)
+    loc = 0
+
+    for package in sorted({module.split(".")[0] for module in modules}):
+        os.makedirs(os.path.join(root, package), exist_ok=True)
+        loc += _write(os.path.join(root, package, "__init__.py"), "")
+
+    # cuerpos ya generados, para copiar en las funciones duplicadas
+    bodies = []
+
+    for index, module in enumerate(modules):
+        lines = [f'"""Módulo sintético {module}."""', ""]
+        lines += [f"import {target}" for target in _imports(index, modules, imports, rng)]
+        lines += ["", ""]
+
+        for function in range(functions):
+            name = f"{module.split('.')[-1]}_func_{function}"
+
+            if bodies and rng.random() < duplication:
+                body = rng.choice(bodies)
+            else:
+                body = _function_body(depth, rng)
+                bodies.append(body)
+
+            lines.append(f"def {name}(items, key=None, reverse=False):")
+            lines += body
+            lines += ["", ""]
+
+        path = os.path.join(root, *module.split(".")) + ".py"
+        loc += _write(path, "\n".join(lines))
+
+    return {"files": files, "loc": loc}
+
+
+def _module_name(index):
+    return f"pkg_{index // MODULES_PER_PACKAGE}.module_{index}"
+
+
+def _imports(index, modules, density, rng):
+    """Módulos anteriores (y algún posterior, que puede cerrar un ciclo)."""
+    count = min(len(modules) - 1, int(density) + (rng.random() < density % 1))
+    targets = set()
+
+    while len(targets) < count:
+        if index and rng.random() >= BACK_EDGE_RATIO:
+            target = rng.randrange(index)
+        else:
+            target = rng.randrange(len(modules))
+        if target != index:
+            targets.add(target)
+
+    return [modules[target] for target in sorted(targets)]
+
+
+def _function_body(depth, rng):
+    # al menos un bucle: el relleno usa value y continue
+    depth = max(1, depth)
+    lines = ["    total = 0", "    result = []"]
+    pad = "    "
+
+    for level in range(depth):
+        variable = "value" if level == 0 else f"value_{level}"
+        source = "items" if level == 0 else ("value" if level == 1 else f"value_{level - 1}")
+        lines.append(f"{pad}for {variable} in {source}:")
+        pad += "    "
+        if level + 1 < depth:
+            lines.append(f"{pad}if {variable}:")
+            pad += "    "
+
+    for i in range(rng.randint(2, 5)):
+        statement = rng.choice(FILLER).format(i=i, n=rng.randint(2, 999), pad=pad)
+        lines += [pad + line if not line.startswith(pad) else line for line in statement.split("\n")]
+
+    lines.append("    return result if key is None else sorted(result, reverse=reverse)")
+    return lines
+
+
+def _write(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    return len(text.splitlines())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python benchmarks/synthetic_project.py <destino> [archivos]")
+        sys.exit(1)
+
+    stats = generate_project(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_FILES)
+    print(f"✅ {stats['files']} archivos, {stats['loc']} líneas en {sys.argv[1]}")
@@ -5,6 +5,7 @@ Script de diagnóstico - Ver dónde se cuelga el análisis
 import sys
 import time
 from CodeHunter.analyzers.advanced_diagnostics import run_advanced_analysis
+from CodeHunter.analyzers.detector_profiler import AnalysisProfiler
 
 SEPARATOR_WIDTH = 60
 SEPARATOR_CHAR = "="
@@ -19,9 +20,11 @@ def test_analysis(project_path: str):
     print(f"Proyecto: {project_path}\n")
     
     start_total = time.time()
+    # tiempos por detector y por archivo (también si se interrumpe)
+    profiler = AnalysisProfiler()
     
     try:
-        result = run_advanced_analysis(project_path)
+        result = run_advanced_analysis(project_path, jobs=1, profiler=profiler)
         
         elapsed = time.time() - start_total
         print(f"\n✅ ANÁLISIS COMPLETADO en {elapsed:.2f}s")
@@ -34,11 +37,15 @@ def test_analysis(project_path: str):
         print(f"  - Major: {metrics.get('major', 0)}")
         print(f"  - Minor: {metrics.get('minor', 0)}")
         print(f"  - Score: {metrics.get('quality_score', 0)}/100")
+        print()
+        print(profiler.format_table())
         
     except KeyboardInterrupt:
         elapsed = time.time() - start_total
         print(f"\n\n⚠️  INTERRUMPIDO por usuario después de {elapsed:.2f}s")
         print("El análisis se colgó en algún detector.")
+        print("Archivos y detectores terminados hasta ahora:\n")
+        print(profiler.format_table())
         
     except Exception as e:
         elapsed = time.time() - start_total